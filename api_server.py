@@ -2,18 +2,37 @@
 Flask API for Automated Bet Finder
 Connects the automated scraper to the HTML interface
 FIXED: Updated to work with new OddsScraper structure
+
+Scraper-bound routes are async views (Flask 3 / asgiref) that push the
+blocking scrape work onto threads, so concurrent requests overlap their
+I/O instead of serializing behind one long scan
 """
 
-from flask import Flask, jsonify, request
+import asyncio
+
+import requests
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 from automated_bet_finder import AutomatedBetFinder
 from defense_stats_scraper import DefenseStatsScraper
 from weather_venue_scraper import WeatherVenueScraper
 import json
 
+# orjson serializes the large scan payloads faster than Flask's default
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
 
+# Prop types offered per player (module-level tuple: built once, shared by reference)
+ALL_PROP_TYPES = ('player_pass_yds', 'player_pass_tds', 'player_rush_yds',
+                  'player_rush_tds', 'player_receptions', 'player_reception_yds',
+                  'player_rec_tds')
+
 # Initialize the bet finder
 # TODO: Replace with your actual API key
 API_KEY = "6ae9b6fd8e38e1c74d1b93cc0b22b867"
@@ -26,8 +45,42 @@ defense_scraper = DefenseStatsScraper()
 weather_scraper = WeatherVenueScraper()
 
 
+def json_response(payload):
+    """Serialize with orjson when available (big payloads), else jsonify"""
+    if orjson is not None:
+        return Response(orjson.dumps(payload), mimetype='application/json')
+    return jsonify(payload)
+
+
+def bad_request(message):
+    """400 for requests that fail input validation"""
+    return jsonify({'success': False, 'error': message}), 400
+
+
+def get_json_body():
+    """Parse the JSON body, or None if missing/malformed"""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+
+@app.errorhandler(requests.exceptions.RequestException)
+def handle_upstream_error(e):
+    """Upstream odds/stats fetch failed - that's a gateway problem, not ours"""
+    print(f"❌ Upstream request failed: {e}")
+    return jsonify({'success': False, 'error': f'Upstream request failed: {e}'}), 502
+
+
+@app.errorhandler(Exception)
+def handle_unexpected_error(e):
+    """Last-resort JSON error so clients never see an HTML traceback page"""
+    if isinstance(e, HTTPException):
+        return jsonify({'success': False, 'error': e.description}), e.code
+    print(f"❌ Unhandled error: {e}")
+    return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/scan-best-bets', methods=['POST'])
-def scan_best_bets():
+async def scan_best_bets():
     """
     Scan for best bets automatically
     Body: {
@@ -38,98 +91,85 @@ def scan_best_bets():
         "min_edge": 3.0
     }
     """
-    try:
-        data = request.json
-        players = data.get('players', [])
-        min_edge = data.get('min_edge', 3.0)
-        
-        # Find best bets
-        best_bets = finder.find_best_bets(players, min_edge=min_edge)
-        
-        return jsonify({
-            'success': True,
-            'bets': best_bets,
-            'count': len(best_bets)
-        })
-    
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = get_json_body()
+    if data is None:
+        return bad_request('Request body must be a JSON object')
+
+    players = data.get('players', [])
+    min_edge = data.get('min_edge', 3.0)
+
+    if not isinstance(players, list) or not all(
+            isinstance(p, dict) and p.get('name') for p in players):
+        return bad_request('players must be a list of {"name", "props"} objects')
+    if not isinstance(min_edge, (int, float)):
+        return bad_request('min_edge must be a number')
+
+    # Find best bets (runs in a thread so other requests aren't blocked)
+    best_bets = await asyncio.to_thread(finder.find_best_bets, players, min_edge=min_edge)
+
+    return jsonify({
+        'success': True,
+        'bets': best_bets,
+        'count': len(best_bets)
+    })
 
 
 @app.route('/api/quick-scan', methods=['GET'])
-def quick_scan():
+async def quick_scan():
     """
     Quick scan - automatically finds ALL players with props in today's games
     """
-    try:
-        print("\n" + "="*80)
-        print("🚀 QUICK SCAN - Finding all available props for today's games")
-        print("="*80)
-        
-        # Get all player props from today's games
-        all_props = finder.odds_scraper.get_all_player_props()
-        
-        if not all_props:
-            return jsonify({
-                'success': False,
-                'error': 'No games or props found for today'
-            }), 404
-        
-        # Extract all unique players across all games and markets
-        all_players = []
-        players_seen = set()
-        
-        for event_id, event_data in all_props.items():
-            print(f"\n📊 Scanning: {event_data['event_name']}")
-            
-            for prop_type, prop_data in event_data['props'].items():
-                if not prop_data or 'bookmakers' not in prop_data:
-                    continue
-                
-                # Extract players from this market
-                for bookmaker in prop_data['bookmakers']:
-                    for market in bookmaker.get('markets', []):
-                        for outcome in market.get('outcomes', []):
-                            player_name = outcome.get('description', '')
-                            
-                            if player_name and player_name not in players_seen:
-                                players_seen.add(player_name)
-                                
-                                # Add player with this prop type
-                                # Check if player already in list
-                                player_entry = next((p for p in all_players if p['name'] == player_name), None)
-                                
-                                if player_entry:
-                                    # Add this prop type if not already there
-                                    if prop_type not in player_entry['props']:
-                                        player_entry['props'].append(prop_type)
-                                else:
-                                    # New player
-                                    all_players.append({
-                                        'name': player_name,
-                                        'props': [prop_type]
-                                    })
-        
-        print(f"\n✅ Found {len(all_players)} unique players with props")
-        
-        # Now analyze all these players
-        best_bets = finder.find_best_bets(all_players, min_edge=3.0)
-        
-        return jsonify({
-            'success': True,
-            'bets': best_bets[:20],  # Top 20 best bets
-            'total_analyzed': len(all_players)
-        })
-    
-    except Exception as e:
-        print(f"❌ Quick scan error: {e}")
+    print("\n" + "="*80)
+    print("🚀 QUICK SCAN - Finding all available props for today's games")
+    print("="*80)
+
+    # Get all player props from today's games
+    all_props = await asyncio.to_thread(finder.odds_scraper.get_all_player_props)
+
+    if not all_props:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'No games or props found for today'
+        }), 404
+
+    for event_data in all_props.values():
+        print(f"\n📊 Scanning: {event_data['event_name']}")
+
+    # Extract all unique players across all games and markets
+    # The scraper's flat outcome stream replaces the nested walk;
+    # dedup is a dict lookup instead of a list scan
+    players_by_name = {}
+
+    for outcome in finder.odds_scraper.iter_outcomes(all_props):
+        if not outcome.player:
+            continue
+        players_by_name.setdefault(outcome.player, set()).add(outcome.prop_type)
+
+    # Flatten to a deduped set of (player, prop) work items - a pair that
+    # shows up in several games is analyzed exactly once
+    work_pairs = {
+        (name, prop)
+        for name, props in players_by_name.items()
+        for prop in props
+    }
+
+    total_analyzed = len(players_by_name)
+    print(f"\n✅ Found {total_analyzed} unique players with props")
+
+    # Now analyze all these pairs
+    best_bets = await asyncio.to_thread(finder.find_best_bets_flat, work_pairs, 3.0)
+
+    top_bets = best_bets[:20]  # Top 20 best bets
+
+    # Free the props tree and player maps before serializing - the
+    # response only needs the 20 sliced bets, not the full scan state
+    del all_props, players_by_name, work_pairs, best_bets
+
+    return json_response({
+        'success': True,
+        'bets': top_bets,
+        'total_analyzed': total_analyzed
+    })
 
 
 @app.route('/api/build-parlay', methods=['POST'])
@@ -142,28 +182,31 @@ def build_parlay():
         "risk_level": "conservative"  // or "balanced" or "aggressive"
     }
     """
-    try:
-        data = request.json
-        bets = data.get('bets', [])
-        num_legs = data.get('num_legs', 3)
-        risk_level = data.get('risk_level', 'conservative')
-        
-        parlay = finder.build_optimal_parlay(bets, num_legs=num_legs, risk_level=risk_level)
-        
-        return jsonify({
-            'success': True,
-            'parlay': parlay
-        })
-    
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = get_json_body()
+    if data is None:
+        return bad_request('Request body must be a JSON object')
+
+    bets = data.get('bets', [])
+    num_legs = data.get('num_legs', 3)
+    risk_level = data.get('risk_level', 'conservative')
+
+    if not isinstance(bets, list) or not bets:
+        return bad_request('bets must be a non-empty list')
+    if not isinstance(num_legs, int) or num_legs < 2:
+        return bad_request('num_legs must be an integer >= 2')
+    if risk_level not in ('conservative', 'balanced', 'aggressive'):
+        return bad_request('risk_level must be conservative, balanced, or aggressive')
+
+    parlay = finder.build_optimal_parlay(bets, num_legs=num_legs, risk_level=risk_level)
+
+    return jsonify({
+        'success': True,
+        'parlay': parlay
+    })
 
 
 @app.route('/api/get-player-stats', methods=['POST'])
-def get_player_stats():
+async def get_player_stats():
     """
     Get recent stats for a specific player
     Body: {
@@ -172,68 +215,65 @@ def get_player_stats():
         "num_games": 7
     }
     """
-    try:
-        data = request.json
-        player_name = data.get('player_name')
-        stat_type = data.get('stat_type')
-        num_games = data.get('num_games', 7)
-        
-        stats = finder.stats_scraper.get_player_recent_games(
-            player_name, 
-            stat_type, 
-            num_games
-        )
-        
-        return jsonify({
-            'success': True,
-            'player': player_name,
-            'stat_type': stat_type,
-            'games': stats,
-            'average': sum(stats) / len(stats) if stats else 0
-        })
-    
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = get_json_body()
+    if data is None:
+        return bad_request('Request body must be a JSON object')
+
+    player_name = data.get('player_name')
+    stat_type = data.get('stat_type')
+    num_games = data.get('num_games', 7)
+
+    if not player_name or not isinstance(player_name, str):
+        return bad_request('player_name is required')
+    if not stat_type or not isinstance(stat_type, str):
+        return bad_request('stat_type is required')
+    if not isinstance(num_games, int) or num_games < 1:
+        return bad_request('num_games must be a positive integer')
+
+    stats = await asyncio.to_thread(
+        finder.stats_scraper.get_player_recent_games,
+        player_name,
+        stat_type,
+        num_games
+    )
+
+    return jsonify({
+        'success': True,
+        'player': player_name,
+        'stat_type': stat_type,
+        'games': stats,
+        'average': sum(stats) / len(stats) if stats else 0
+    })
 
 
 @app.route('/api/get-live-props', methods=['GET'])
-def get_live_props():
+async def get_live_props():
     """
     Get all available live props for today's games
     """
-    try:
-        all_props = finder.odds_scraper.get_all_player_props()
-        
-        # Format for easier reading
-        formatted_props = {}
-        for event_id, event_data in all_props.items():
-            formatted_props[event_data['event_name']] = {
-                'commence_time': event_data['commence_time'],
-                'available_markets': list(event_data['props'].keys()),
-                'player_count': sum(
-                    finder.odds_scraper._count_players_in_market(prop_data) 
-                    for prop_data in event_data['props'].values()
-                )
-            }
-        
-        return jsonify({
-            'success': True,
-            'games': formatted_props,
-            'total_games': len(formatted_props)
-        })
-    
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    all_props = await asyncio.to_thread(finder.odds_scraper.get_all_player_props)
+
+    # Format for easier reading
+    formatted_props = {}
+    for event_id, event_data in all_props.items():
+        formatted_props[event_data['event_name']] = {
+            'commence_time': event_data['commence_time'],
+            'available_markets': list(event_data['props'].keys()),
+            'player_count': sum(
+                finder.odds_scraper._count_players_in_market(prop_data)
+                for prop_data in event_data['props'].values()
+            )
+        }
+
+    return json_response({
+        'success': True,
+        'games': formatted_props,
+        'total_games': len(formatted_props)
+    })
 
 
 @app.route('/api/get-game-players', methods=['POST'])
-def get_game_players():
+async def get_game_players():
     """
     Get players available for a specific game by extracting from live odds
     Body: {
@@ -241,71 +281,53 @@ def get_game_players():
         "team2": "49ers"
     }
     """
-    try:
-        data = request.json
-        team1 = data.get('team1', '').lower()
-        team2 = data.get('team2', '').lower()
-        
-        # Get all live props
-        all_props = finder.odds_scraper.get_all_player_props()
-        
-        # Find the matching game and extract player names
-        game_players = []
-        
-        for event_id, event_data in all_props.items():
-            event_name = event_data['event_name'].lower()
-            home_team = event_data['home_team'].lower()
-            away_team = event_data['away_team'].lower()
-            
-            # Check if this is the game we're looking for
-            if (team1 in event_name or team1 in home_team or team1 in away_team) and \
-               (team2 in event_name or team2 in home_team or team2 in away_team):
-                
-                # Extract all players from this game's props
-                players_found = set()
-                
-                for prop_type, prop_data in event_data['props'].items():
-                    if prop_data and 'bookmakers' in prop_data:
-                        for bookmaker in prop_data['bookmakers']:
-                            for market in bookmaker.get('markets', []):
-                                for outcome in market.get('outcomes', []):
-                                    player_name = outcome.get('description', '')
-                                    if player_name:
-                                        players_found.add(player_name)
-                
-                # Convert to list with all prop types
-                all_prop_types = ['player_pass_yds', 'player_pass_tds', 'player_rush_yds', 
-                                  'player_rush_tds', 'player_receptions', 'player_reception_yds',
-                                  'player_rec_tds']
-                
-                game_players = [
-                    {'name': player, 'props': all_prop_types} 
-                    for player in sorted(players_found)
-                ]
-                
-                return jsonify({
-                    'success': True,
-                    'game': event_data['event_name'],
-                    'players': game_players,
-                    'total_players': len(game_players)
-                })
-        
-        return jsonify({
-            'success': False,
-            'error': f'No game found matching {team1} vs {team2}'
-        }), 404
-    
-    except Exception as e:
+    data = get_json_body()
+    if data is None:
+        return bad_request('Request body must be a JSON object')
+
+    team1 = data.get('team1', '')
+    team2 = data.get('team2', '')
+
+    if not team1 or not isinstance(team1, str) or not team2 or not isinstance(team2, str):
+        return bad_request('team1 and team2 are required')
+
+    team1 = team1.lower()
+    team2 = team2.lower()
+
+    # Get all live props
+    all_props = await asyncio.to_thread(finder.odds_scraper.get_all_player_props)
+
+    # The scraper indexes events by team pair and precomputes each
+    # event's player list at fetch time, so this is a direct lookup
+    event_id = finder.odds_scraper.find_event_for_teams(team1, team2, all_props)
+
+    if event_id:
+        event_data = all_props[event_id]
+
+        # Every entry shares the same ALL_PROP_TYPES tuple instead of
+        # allocating a fresh list per player
+        game_players = [
+            {'name': player, 'props': ALL_PROP_TYPES}
+            for player in event_data.get('players', [])
+        ]
+
         return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+            'success': True,
+            'game': event_data['event_name'],
+            'players': game_players,
+            'total_players': len(game_players)
+        })
+
+    return jsonify({
+        'success': False,
+        'error': f'No game found matching {team1} vs {team2}'
+    }), 404
 
 
 
 
 @app.route('/api/get-matchup-adjustment', methods=['POST'])
-def get_matchup_adjustment():
+async def get_matchup_adjustment():
     """
     Get defensive matchup adjustment for a player
     Body: {
@@ -313,37 +335,30 @@ def get_matchup_adjustment():
         "stat_type": "pass_yds"
     }
     """
-    try:
-        data = request.json
-        opponent = data.get('opponent', '')
-        stat_type = data.get('stat_type', '')
-        
-        if not opponent or not stat_type:
-            return jsonify({
-                'success': False,
-                'error': 'Missing opponent or stat_type'
-            }), 400
-        
-        adjustment = defense_scraper.get_matchup_adjustment(opponent, stat_type)
-        
-        return jsonify({
-            'success': True,
-            'opponent': opponent.upper(),
-            'stat_type': stat_type,
-            'adjustment': adjustment
-        })
-    
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = get_json_body()
+    if data is None:
+        return bad_request('Request body must be a JSON object')
+
+    opponent = data.get('opponent', '')
+    stat_type = data.get('stat_type', '')
+
+    if not opponent or not stat_type:
+        return bad_request('Missing opponent or stat_type')
+
+    adjustment = await asyncio.to_thread(defense_scraper.get_matchup_adjustment, opponent, stat_type)
+
+    return jsonify({
+        'success': True,
+        'opponent': opponent.upper(),
+        'stat_type': stat_type,
+        'adjustment': adjustment
+    })
 
 
 
 
 @app.route('/api/get-condition-adjustment', methods=['POST'])
-def get_condition_adjustment():
+async def get_condition_adjustment():
     """
     Get weather/venue adjustment for a game
     Body: {
@@ -351,35 +366,30 @@ def get_condition_adjustment():
         "stat_type": "pass_yds"
     }
     """
-    try:
-        data = request.json
-        home_team = data.get('home_team', '')
-        stat_type = data.get('stat_type', '')
-        
-        if not home_team or not stat_type:
-            return jsonify({
-                'success': False,
-                'error': 'Missing home_team or stat_type'
-            }), 400
-        
-        adjustment, factors, condition = weather_scraper.get_condition_adjustment(home_team, stat_type)
-        summary = weather_scraper.get_game_condition_summary(home_team)
-        
-        return jsonify({
-            'success': True,
-            'home_team': home_team,
-            'stat_type': stat_type,
-            'adjustment': adjustment,
-            'factors': factors,
-            'condition': condition,
-            'summary': summary
-        })
-    
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    data = get_json_body()
+    if data is None:
+        return bad_request('Request body must be a JSON object')
+
+    home_team = data.get('home_team', '')
+    stat_type = data.get('stat_type', '')
+
+    if not home_team or not stat_type:
+        return bad_request('Missing home_team or stat_type')
+
+    adjustment, factors, condition = await asyncio.to_thread(
+        weather_scraper.get_condition_adjustment, home_team, stat_type
+    )
+    summary = weather_scraper.get_game_condition_summary(home_team)
+
+    return jsonify({
+        'success': True,
+        'home_team': home_team,
+        'stat_type': stat_type,
+        'adjustment': adjustment,
+        'factors': factors,
+        'condition': condition,
+        'summary': summary
+    })
 
 
 @app.route('/api/health', methods=['GET'])
@@ -10,17 +10,58 @@ FIXED: Now uses correct /events/{event_id}/odds endpoint for player props
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import asyncio
 import json
+import logging
+import numpy as np
 import statistics
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from dataclasses import dataclass, field
+from functools import lru_cache
+import heapq
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
+import re
+import threading
 import time
 import sqlite3
 from pfr_stats_scraper import PFRStatsScraper
 import os
 import sys
 
+# aiohttp lets us fire all event/market odds requests concurrently
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    print("⚠️  aiohttp not available - odds fetching will run sequentially")
+    AIOHTTP_AVAILABLE = False
+
+# Redis caches odds responses so repeated endpoint hits don't burn API quota
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# orjson decodes the large odds payloads 2-3x faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# pandas lets us flatten the nested props tree once and scan lines vectorized
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
 # Import enhanced bet analysis
 try:
     from enhanced_bet_analysis import EnhancedBetAnalyzer
@@ -30,6 +71,11 @@ except ImportError:
     ENHANCED_ANALYSIS_AVAILABLE = False
 
 
+# Per-bet progress goes through the logger: %-style args are only
+# formatted when DEBUG is enabled, and nothing flushes stdout per bet
+log = logging.getLogger(__name__)
+
+
 # ============================================================================
 # NFL STATS SCRAPER - USING PRO FOOTBALL REFERENCE WITH RATE LIMITING
 # ============================================================================
@@ -42,13 +88,219 @@ NFLStatsScraper = PFRStatsScraper
 # ODDS SCRAPER (The Odds API)
 # ============================================================================
 
+# Flat view of one priced outcome from the nested odds tree
+Outcome = namedtuple('Outcome', 'event_id event_name prop_type bookmaker player point price side')
+
+def _implied_from_american(odds: int) -> float:
+    """American odds -> implied win probability as a percentage"""
+    if odds > 0:
+        return (100 / (odds + 100)) * 100
+    return (abs(odds) / (abs(odds) + 100)) * 100
+
+
+# American odds are small integers, so the whole practical range fits in a
+# lookup table built once at import - the hot paths do a dict get instead
+# of re-running the sign branch per bet
+_IMPLIED = {p: _implied_from_american(p) for p in range(-2000, 2001) if p != 0}
+
+
+def implied_probability(odds: int) -> float:
+    """Implied win probability (0-100) for American odds, table-backed"""
+    prob = _IMPLIED.get(odds)
+    return prob if prob is not None else _implied_from_american(odds)
+
+
+@lru_cache(maxsize=512)
+def american_to_decimal(odds: int) -> float:
+    """American odds -> decimal payout multiplier, memoized - the books
+    only quote a few dozen distinct prices"""
+    return (odds / 100) + 1 if odds > 0 else (100 / abs(odds)) + 1
+
+
+def implied_probability_batch(prices: 'np.ndarray') -> 'np.ndarray':
+    """Vectorized implied probability for an array of American odds"""
+    prices = np.asarray(prices, dtype=float)
+    return np.where(
+        prices > 0,
+        100 / (prices + 100) * 100,
+        np.abs(prices) / (np.abs(prices) + 100) * 100
+    )
+
+
+# Team nicknames compiled into one regex union, so matching a free-form
+# team string is a single C-level scan instead of 32 substring checks
+NFL_TEAM_NAMES = ('49ers', 'bears', 'bengals', 'bills', 'broncos', 'browns',
+                  'buccaneers', 'cardinals', 'chargers', 'chiefs', 'colts',
+                  'commanders', 'cowboys', 'dolphins', 'eagles', 'falcons',
+                  'giants', 'jaguars', 'jets', 'lions', 'packers', 'panthers',
+                  'patriots', 'raiders', 'rams', 'ravens', 'saints', 'seahawks',
+                  'steelers', 'texans', 'titans', 'vikings')
+TEAM_NAME_REGEX = re.compile('|'.join(re.escape(t) for t in NFL_TEAM_NAMES))
+
+# Prop markets requested from The Odds API (tuple: shared, hashable, no per-call rebuild)
+NFL_PROP_MARKETS = (
+    'player_pass_yds',
+    'player_pass_tds',
+    'player_rush_yds',
+    'player_rush_tds',
+    'player_receptions',
+    'player_reception_yds',
+    'player_anytime_td'
+)
+
+
 class OddsScraper:
     """Fetch live betting odds from The Odds API"""
     
+    # Odds move on the order of seconds-to-minutes, so short TTLs are safe
+    ODDS_CACHE_TTL = 45    # Redis TTL per (sport, event, market) response
+    PROPS_MEMO_TTL = 10    # In-process TTL for a full get_all_player_props result
+
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.the-odds-api.com/v4"
-    
+
+        # Pooled session so repeated API calls reuse one keep-alive TLS
+        # connection instead of paying a fresh handshake per request
+        self.session = self._build_session()
+
+        # Layer 1: in-process memo so same-request bursts skip Redis entirely
+        self._props_memo = None       # (timestamp, all_props)
+
+        # team-pair -> event_id indexes, rebuilt whenever props are fetched
+        self._team_index = {}
+        self._nickname_index = {}
+
+        # Layer 2: Redis cache-aside shared across processes
+        self.redis = None
+        if REDIS_AVAILABLE:
+            try:
+                client = redis.Redis(decode_responses=True)
+                client.ping()
+                self.redis = client
+                print("✅ Redis odds cache connected")
+            except Exception:
+                print("⚠️  Redis not reachable - odds responses won't be cached")
+
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """
+        Build the pooled, retrying HTTP session
+        Also called from the gunicorn post_fork hook, since pooled sockets
+        must not be shared across forked workers
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        session.mount('https://', adapter)
+        return session
+
+    @staticmethod
+    def _collect_event_players(event_props: Dict) -> List[str]:
+        """
+        Gather every player with a prop in this event (computed once at fetch)
+        Also tags each outcome with its lowercase description so later line
+        lookups don't re-lower the same strings in their inner loops
+        """
+        players = set()
+        for market_data in event_props.values():
+            if not market_data or 'bookmakers' not in market_data:
+                continue
+            for bookmaker in market_data.get('bookmakers', []):
+                for market in bookmaker.get('markets', []):
+                    for outcome in market.get('outcomes', []):
+                        player_name = outcome.get('description', '')
+                        outcome['_desc_lc'] = player_name.lower()
+                        if player_name:
+                            players.add(player_name)
+        return sorted(players)
+
+    def _build_event_entry(self, event: Dict, event_props: Dict) -> Dict:
+        """Assemble the per-event record, precomputing players and team names"""
+        return {
+            'event_name': f"{event['home_team']} vs {event['away_team']}",
+            'home_team': event['home_team'],
+            'away_team': event['away_team'],
+            'commence_time': event['commence_time'],
+            'props': event_props,
+            'players': self._collect_event_players(event_props),
+            'teams': (event['home_team'].lower(), event['away_team'].lower())
+        }
+
+    def _rebuild_team_index(self, all_props: Dict):
+        """Map each event's team pair to its id for O(1) game lookups"""
+        self._team_index = {
+            frozenset(event_data['teams']): event_id
+            for event_id, event_data in all_props.items()
+        }
+
+        # Canonical nickname pairs, extracted with the compiled regex once
+        # at index-build time so lookups never scan team strings again
+        self._nickname_index = {}
+        for event_id, event_data in all_props.items():
+            nicknames = frozenset(TEAM_NAME_REGEX.findall(' '.join(event_data['teams'])))
+            if len(nicknames) == 2:
+                self._nickname_index[nicknames] = event_id
+
+    def find_event_for_teams(self, team1: str, team2: str, all_props: Dict) -> Optional[str]:
+        """
+        Find the event matching two (possibly partial) team names
+        Uses the precomputed team indexes instead of re-walking every prop
+        """
+        requested = (team1.lower(), team2.lower())
+
+        # Fast path: canonicalize both names via the team regex and hit
+        # the nickname index directly
+        nicknames = frozenset(
+            match for name in requested for match in TEAM_NAME_REGEX.findall(name)
+        )
+        if len(nicknames) == 2:
+            event_id = self._nickname_index.get(nicknames)
+            if event_id in all_props:
+                return event_id
+
+        # Fallback: substring scan for names the regex doesn't recognize
+        for teams, event_id in self._team_index.items():
+            if event_id not in all_props:
+                continue
+            if all(any(req in team for team in teams) for req in requested):
+                return event_id
+
+        return None
+
+    def _cache_key(self, sport: str, event_id: str, market: str) -> str:
+        return f"odds:{sport}:{event_id}:{market}"
+
+    def _cache_get(self, sport: str, event_id: str, market: str) -> Optional[Dict]:
+        """Look up a cached odds response (None on miss or Redis trouble)"""
+        if not self.redis:
+            return None
+        try:
+            cached = self.redis.get(self._cache_key(sport, event_id, market))
+            return json.loads(cached) if cached else None
+        except Exception:
+            return None
+
+    def _cache_set(self, sport: str, event_id: str, market: str, data: Dict):
+        """Store an odds response with a short TTL"""
+        if not self.redis:
+            return
+        try:
+            self.redis.setex(
+                self._cache_key(sport, event_id, market),
+                self.ODDS_CACHE_TTL,
+                json.dumps(data)
+            )
+        except Exception:
+            pass
+
     def get_all_events(self, sport: str = 'americanfootball_nfl') -> List[Dict]:
         """Get all upcoming events/games"""
         endpoint = f"{self.base_url}/sports/{sport}/events"
@@ -56,9 +308,9 @@ class OddsScraper:
         params = {'apiKey': self.api_key}
         
         try:
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = self.session.get(endpoint, params=params, timeout=10)
             response.raise_for_status()
-            events = response.json()
+            events = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
             print(f"✅ Found {len(events)} upcoming games")
             return events
         except requests.exceptions.RequestException as e:
@@ -70,33 +322,50 @@ class OddsScraper:
         Fetch all player prop markets from multiple sportsbooks
         Returns organized data by event and market
         """
+        # Serve same-request bursts from the in-process memo
+        if self._props_memo:
+            memo_time, memo_props = self._props_memo
+            if time.time() - memo_time < self.PROPS_MEMO_TTL:
+                return memo_props
+
         # First get all events
         events = self.get_all_events(sport)
-        
+
         if not events:
             print("No events found")
             return {}
         
-        markets = [
-            'player_pass_yds',
-            'player_pass_tds', 
-            'player_rush_yds',
-            'player_rush_tds',
-            'player_receptions',
-            'player_reception_yds',
-            'player_anytime_td'
-        ]
-        
+        markets = NFL_PROP_MARKETS
+
+        # Limit to games kicking off within 24 hours - same API-call savings
+        # as the old events[:3] hack, but it can't skip today's games.
+        # ISO-8601 Zulu timestamps sort lexicographically, so a string
+        # bisect slices the window without parsing dates
+        events.sort(key=lambda e: e['commence_time'])
+        commence_times = [e['commence_time'] for e in events]
+        now = datetime.utcnow()
+        window_start = now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        window_end = (now + timedelta(hours=24)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        events = events[bisect_left(commence_times, window_start):
+                        bisect_right(commence_times, window_end)]
+        print(f"🗓️  {len(events)} games in the next 24 hours")
+
+        # Fire all event × market requests concurrently when aiohttp is available
+        if AIOHTTP_AVAILABLE:
+            all_props = asyncio.run(self._get_all_player_props_async(sport, events, markets))
+            self._props_memo = (time.time(), all_props)
+            return all_props
+
         all_props = {}
-        
-        # Fetch props for each event (limit to first 3 games to save API calls)
-        for event in events[:3]:
+
+        # Fallback: fetch props for each event sequentially
+        for event in events:
             event_id = event['id']
             event_name = f"{event['home_team']} vs {event['away_team']}"
             print(f"\n📊 Fetching props for: {event_name}")
-            
+
             event_props = {}
-            
+
             for market in markets:
                 props = self._fetch_event_market(sport, event_id, market)
                 if props:
@@ -105,21 +374,91 @@ class OddsScraper:
                     player_count = self._count_players_in_market(props)
                     print(f"  ✓ {market}: {player_count} players")
                 time.sleep(0.5)  # Rate limiting
-            
-            all_props[event_id] = {
-                'event_name': event_name,
-                'home_team': event['home_team'],
-                'away_team': event['away_team'],
-                'commence_time': event['commence_time'],
-                'props': event_props
-            }
-        
+
+            all_props[event_id] = self._build_event_entry(event, event_props)
+
+        self._rebuild_team_index(all_props)
+        self._props_memo = (time.time(), all_props)
         return all_props
-    
+
+    async def _get_all_player_props_async(self, sport: str, events: List[Dict],
+                                          markets: List[str]) -> Dict:
+        """
+        Fetch every event × market combination concurrently
+        Concurrency is capped with a semaphore instead of per-call sleeps
+        """
+        semaphore = asyncio.Semaphore(8)  # Respect API rate limits
+
+        async with aiohttp.ClientSession() as session:
+            tasks = [
+                self._fetch_event_market_async(session, semaphore, sport, event['id'], market)
+                for event in events
+                for market in markets
+            ]
+            results = await asyncio.gather(*tasks)
+
+        all_props = {}
+        result_iter = iter(results)
+
+        for event in events:
+            event_id = event['id']
+            event_name = f"{event['home_team']} vs {event['away_team']}"
+            print(f"\n📊 Fetched props for: {event_name}")
+
+            event_props = {}
+
+            for market in markets:
+                props = next(result_iter)
+                if props:
+                    event_props[market] = props
+                    player_count = self._count_players_in_market(props)
+                    print(f"  ✓ {market}: {player_count} players")
+
+            all_props[event_id] = self._build_event_entry(event, event_props)
+
+        self._rebuild_team_index(all_props)
+        return all_props
+
+    async def _fetch_event_market_async(self, session, semaphore, sport: str,
+                                        event_id: str, market: str) -> Optional[Dict]:
+        """Async version of _fetch_event_market (shares one HTTP session)"""
+        cached = self._cache_get(sport, event_id, market)
+        if cached is not None:
+            return cached
+
+        endpoint = f"{self.base_url}/sports/{sport}/events/{event_id}/odds"
+
+        params = {
+            'apiKey': self.api_key,
+            'regions': 'us',
+            'markets': market,
+            'oddsFormat': 'american',
+            'bookmakers': 'fanduel'  # Only FanDuel
+        }
+
+        async with semaphore:
+            try:
+                async with session.get(endpoint, params=params,
+                                       timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    response.raise_for_status()
+                    if ORJSON_AVAILABLE:
+                        data = orjson.loads(await response.read())
+                    else:
+                        data = await response.json()
+                    self._cache_set(sport, event_id, market, data)
+                    return data
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"    ⚠️  Error fetching {market}: {str(e)[:100]}")
+                return None
+
     def _fetch_event_market(self, sport: str, event_id: str, market: str) -> Optional[Dict]:
         """Fetch a specific market for a specific event"""
+        cached = self._cache_get(sport, event_id, market)
+        if cached is not None:
+            return cached
+
         endpoint = f"{self.base_url}/sports/{sport}/events/{event_id}/odds"
-        
+
         params = {
             'apiKey': self.api_key,
             'regions': 'us',
@@ -127,76 +466,197 @@ class OddsScraper:
             'oddsFormat': 'american',
             'bookmakers': 'fanduel'  # Only FanDuel
         }
-        
+
         try:
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = self.session.get(endpoint, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
+            data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+            self._cache_set(sport, event_id, market, data)
+            return data
         except requests.exceptions.RequestException as e:
             print(f"    ⚠️  Error fetching {market}: {str(e)[:100]}")
             return None
     
     def _count_players_in_market(self, market_data: Dict) -> int:
-        """Count unique players in a market"""
-        players = set()
-        
+        """
+        Count unique players in a market
+        Memoized on the market dict - the fetch loop computes it once and
+        the live-props endpoint reads the stored count instead of re-walking
+        """
         if not market_data or 'bookmakers' not in market_data:
             return 0
-        
-        for bookmaker in market_data.get('bookmakers', []):
-            for market in bookmaker.get('markets', []):
-                for outcome in market.get('outcomes', []):
-                    player_name = outcome.get('description', '')
-                    if player_name:
-                        players.add(player_name)
-        
-        return len(players)
+
+        cached = market_data.get('_player_count')
+        if cached is not None:
+            return cached
+
+        count = len({
+            outcome['description']
+            for bookmaker in market_data.get('bookmakers', ())
+            for market in bookmaker.get('markets', ())
+            for outcome in market.get('outcomes', ())
+            if outcome.get('description')
+        })
+        market_data['_player_count'] = count
+        return count
     
+    @staticmethod
+    def iter_outcomes(all_props: Dict):
+        """
+        Walk events -> props -> bookmakers -> markets -> outcomes once,
+        yielding flat Outcome tuples
+
+        Consumers (quick scan, line lookups, the flattened table) filter
+        the flat stream instead of each re-implementing the nested walk
+        """
+        for event_id, event_data in all_props.items():
+            event_name = event_data['event_name']
+            for prop_type, market_data in event_data['props'].items():
+                if not market_data or 'bookmakers' not in market_data:
+                    continue
+                for bookmaker in market_data.get('bookmakers', []):
+                    title = bookmaker.get('title', '')
+                    for market in bookmaker.get('markets', []):
+                        for outcome in market.get('outcomes', []):
+                            yield Outcome(
+                                event_id,
+                                event_name,
+                                prop_type,
+                                title,
+                                outcome.get('description', ''),
+                                outcome.get('point'),
+                                outcome.get('price'),
+                                outcome.get('name')
+                            )
+
+    def _flatten_props(self, all_props: Dict) -> 'pd.DataFrame':
+        """
+        Materialize iter_outcomes into a flat DataFrame with columns
+        (event_id, prop_type, player, outcome, point, price, bookmaker)
+        Cached per props tree so repeated best-line queries skip the walk
+        """
+        # The cache tuple keeps a strong reference to the keyed dict: an
+        # identity check against a dead object's reused address would
+        # otherwise serve a previous slate's frame
+        cached = getattr(self, '_flat_cache', None)
+        if cached and cached[0] is all_props:
+            return cached[1]
+
+        rows = [
+            (o.event_id, o.prop_type, o.player, o.side, o.point, o.price, o.bookmaker)
+            for o in self.iter_outcomes(all_props)
+        ]
+
+        df = pd.DataFrame(rows, columns=[
+            'event_id', 'prop_type', 'player', 'outcome', 'point', 'price', 'bookmaker'
+        ])
+        df['player_lc'] = df['player'].str.lower()
+
+        self._flat_cache = (all_props, df)
+        return df
+
+    def index_props(self, all_props: Dict) -> Dict:
+        """
+        Build {(player_casefold, prop_type): best-lines dict} in one pass
+
+        Replaces calling get_best_lines per (player, prop) pair - that's a
+        scan of the whole tree each time - with a single traversal that
+        tracks the best over/under per key, then O(1) lookups
+        """
+        best = {}
+
+        for o in self.iter_outcomes(all_props):
+            if not o.player or o.point is None:
+                continue
+
+            key = (o.player.casefold(), o.prop_type)
+            entry = best.get(key)
+            if entry is None:
+                entry = best[key] = {
+                    'player': o.player,
+                    'prop_type': o.prop_type,
+                    'best_over': None,
+                    'best_under': None
+                }
+
+            candidate = {'point': o.point, 'price': o.price, 'bookmaker': o.bookmaker}
+
+            if o.side == 'Over':
+                if self._better_over(candidate, entry['best_over']):
+                    entry['best_over'] = candidate
+            elif o.side == 'Under':
+                if self._better_under(candidate, entry['best_under']):
+                    entry['best_under'] = candidate
+
+        # Only keep keys priced on both sides, matching get_best_lines
+        return {
+            key: entry for key, entry in best.items()
+            if entry['best_over'] and entry['best_under']
+        }
+
+    @staticmethod
+    def _better_over(candidate: Dict, current: Optional[Dict]) -> bool:
+        """Lower line is easier to clear; at the same line take the better price"""
+        if not current:
+            return True
+        if candidate['point'] != current['point']:
+            return candidate['point'] < current['point']
+        return candidate['price'] > current['price']
+
+    @staticmethod
+    def _better_under(candidate: Dict, current: Optional[Dict]) -> bool:
+        """Higher line is easier to stay under; at the same line take the better price"""
+        if not current:
+            return True
+        if candidate['point'] != current['point']:
+            return candidate['point'] > current['point']
+        return candidate['price'] > current['price']
+
     def get_best_lines(self, player_name: str, prop_type: str, all_props: Dict) -> Optional[Dict]:
         """
         Find the best available lines for a player across all sportsbooks
         """
+        if PANDAS_AVAILABLE:
+            return self._get_best_lines_df(player_name, prop_type, all_props)
+
         best_over = None
         best_under = None
-        
+        name_lc = player_name.lower()
+
         # Search through all events
         for event_id, event_data in all_props.items():
             if prop_type not in event_data['props']:
                 continue
-            
+
             market_data = event_data['props'][prop_type]
-            
+
             if not market_data or 'bookmakers' not in market_data:
                 continue
-            
+
             for bookmaker in market_data.get('bookmakers', []):
                 for market in bookmaker.get('markets', []):
                     for outcome in market.get('outcomes', []):
-                        outcome_player = outcome.get('description', '').lower()
-                        
-                        if player_name.lower() not in outcome_player:
+                        # _desc_lc is precomputed at fetch time
+                        outcome_player = outcome.get('_desc_lc') or outcome.get('description', '').lower()
+
+                        if name_lc not in outcome_player:
                             continue
-                        
-                        point = outcome.get('point')
-                        price = outcome.get('price')
+
+                        candidate = {
+                            'point': outcome.get('point'),
+                            'price': outcome.get('price'),
+                            'bookmaker': bookmaker['title']
+                        }
                         outcome_name = outcome.get('name')
-                        
+
                         if outcome_name == 'Over':
-                            if not best_over or point < best_over['point']:
-                                best_over = {
-                                    'point': point,
-                                    'price': price,
-                                    'bookmaker': bookmaker['title']
-                                }
-                        
+                            if self._better_over(candidate, best_over):
+                                best_over = candidate
+
                         elif outcome_name == 'Under':
-                            if not best_under or point > best_under['point']:
-                                best_under = {
-                                    'point': point,
-                                    'price': price,
-                                    'bookmaker': bookmaker['title']
-                                }
-        
+                            if self._better_under(candidate, best_under):
+                                best_under = candidate
+
         if best_over and best_under:
             return {
                 'player': player_name,
@@ -204,31 +664,314 @@ class OddsScraper:
                 'best_over': best_over,
                 'best_under': best_under
             }
-        
+
         return None
 
+    def _get_best_lines_df(self, player_name: str, prop_type: str, all_props: Dict) -> Optional[Dict]:
+        """Vectorized best-line lookup over the flattened props table"""
+        df = self._flatten_props(all_props)
+
+        if df.empty:
+            return None
+
+        matches = df[
+            df['player_lc'].str.contains(player_name.lower(), regex=False) &
+            (df['prop_type'] == prop_type)
+        ]
+
+        if matches.empty:
+            return None
+
+        overs = matches[matches['outcome'] == 'Over']
+        unders = matches[matches['outcome'] == 'Under']
+
+        if overs.empty or unders.empty:
+            return None
+
+        # Over: lowest line first, best price as tie-break
+        over_row = overs.sort_values(['point', 'price'], ascending=[True, False]).iloc[0]
+        # Under: highest line first, best price as tie-break
+        under_row = unders.sort_values(['point', 'price'], ascending=[False, False]).iloc[0]
+
+        return {
+            'player': player_name,
+            'prop_type': prop_type,
+            'best_over': {
+                'point': over_row['point'],
+                'price': over_row['price'],
+                'bookmaker': over_row['bookmaker']
+            },
+            'best_under': {
+                'point': under_row['point'],
+                'price': under_row['price'],
+                'bookmaker': under_row['bookmaker']
+            }
+        }
+
 
 # ============================================================================
 # AUTOMATED BET FINDER
 # ============================================================================
 
+# Usage filters hoisted to module scope: built once at import, hashed
+# membership checks instead of per-call set construction
+_BACKUP_PLAYERS = frozenset({
+    # Backup QBs
+    'malik willis', 'sam darnold', 'taylor heinicke', 'mason rudolph',
+    'mitchell trubisky', 'josh dobbs', 'jacoby brissett', 'andy dalton',
+    'jameis winston', 'drew lock', 'trevor siemian', 'jimmy garoppolo',
+
+    # Backup TEs (low snap count)
+    'davis allen', 'foster moreau', 'johnny mundt', 'nick vannett',
+    'john bates', 'tre\' mckitty', 'jordan akins', 'mo alie-cox',
+    'tommy tremble', 'charlie kolar', 'will dissly', 'gerald everett',
+    'zach gentry', 'hunter henry', 'josh oliver', 'luke farrell',
+
+    # Committee/Backup RBs (RB2/RB3)
+    'blake corum', 'royce freeman', 'ty johnson', 'pierre strong',
+    'clyde edwards-helaire', 'elijah mitchell', 'cam akers', 'ronnie rivers',
+    'jashaun corbin', 'malik davis', 'snoop conner', 'patrick taylor',
+    'hassan haskins', 'deon jackson', 'julius chestnut', 'trayveon williams',
+
+    # WR3/WR4 (inconsistent targets)
+    'tutu atwell', 'demarcus robinson', 'tyler boyd', 'van jefferson',
+    'kalif raymond', 'craig reynolds', 'robbie chosen', 'james proche',
+    'tyler johnson', 'jalen nailor', 'trent sherfield', 'kj osborn',
+})
+
+# RB committees - keep only the primary back
+_RB_COMMITTEES = {
+    'rams': {'primary': ['kyren williams'], 'exclude': ['blake corum', 'royce freeman']},
+    'chiefs': {'primary': ['isiah pacheco'], 'exclude': ['clyde edwards-helaire']},
+    '49ers': {'primary': ['christian mccaffrey', 'jordan mason'], 'exclude': ['elijah mitchell']},
+    'dolphins': {'primary': ['de\'von achane', 'raheem mostert'], 'exclude': ['jeff wilson']},
+}
+
+# Rarely-targeted TE surnames, compiled once instead of a per-player substring scan
+_LOW_TARGET_TE_RE = re.compile(r'\b(?:allen|bates|moreau|mundt)\b')
+
+# Backups the parlay builder penalizes/excludes. Kept next to
+# _BACKUP_PLAYERS so the lists are maintained together; the parlay sets
+# are deliberately narrower (a scan-filtered backup never reaches the
+# parlay builder, but bets pasted in from the UI can include anyone)
+_BACKUP_RBS = frozenset({
+    'keaton mitchell', 'kenneth gainwell', 'pierre strong', 'ty johnson',
+    'blake corum', 'royce freeman', 'clyde edwards-helaire', 'elijah mitchell',
+    'cam akers', 'ronnie rivers', 'jashaun corbin', 'malik davis',
+    'brian robinson jr', 'jordan mason', 'rico dowdle', 'tyjae spears'
+})
+
+_BACKUP_TES = frozenset({
+    'aj barner', 'foster moreau', 'tommy tremble', 'charlie kolar',
+    'will dissly', 'gerald everett', 'zach gentry', 'josh oliver',
+    'johnny mundt', 'nick vannett', 'john bates', 'jordan akins'
+})
+
+_ALL_BACKUPS = _BACKUP_RBS | _BACKUP_TES
+
+
+# Recommendation table indexed [edge_percent bin][hit_rate bin], replacing
+# the old if/elif cascade. Edge bins (matching the cascade's equalities):
+#   0: ep <= -8   1: -8 < ep <= -3   2: -3 < ep < 3   3: 3 <= ep < 8   4: ep >= 8
+# Hit-rate bins: 0: hr <= 45, 1: 45 < hr < 55 (always PASS), 2: hr >= 55
+_REC_TABLE = (
+    (('UNDER', 'High'),   ('PASS', 'Low'), ('UNDER', 'Medium')),
+    (('UNDER', 'Medium'), ('PASS', 'Low'), ('UNDER', 'Medium')),
+    (('PASS', 'Low'),     ('PASS', 'Low'), ('PASS', 'Low')),
+    (('OVER', 'Medium'),  ('PASS', 'Low'), ('OVER', 'Medium')),
+    (('OVER', 'Medium'),  ('PASS', 'Low'), ('OVER', 'High')),
+)
+_EP_NEG_BINS = (-8.0, -3.0)
+_EP_POS_BINS = (3.0, 8.0)
+
+# Same table as parallel string arrays for the vectorized classifier
+_REC_ARR = np.array([[rec for rec, _ in row] for row in _REC_TABLE])
+_CONF_ARR = np.array([[conf for _, conf in row] for row in _REC_TABLE])
+
+
+def _classify(edge_percent: float, hit_rate: float):
+    """(recommendation, confidence) via table lookup instead of branching"""
+    if edge_percent < 0:
+        ep_bin = bisect_left(_EP_NEG_BINS, edge_percent)
+    else:
+        ep_bin = 2 + bisect_right(_EP_POS_BINS, edge_percent)
+    hr_bin = 0 if hit_rate <= 45 else (1 if hit_rate < 55 else 2)
+    return _REC_TABLE[ep_bin][hr_bin]
+
+
+@lru_cache(maxsize=32)
+def _weights_for(n: int):
+    """Recency weights 1..n and their sum - they only depend on length"""
+    weights = tuple(range(1, n + 1))
+    return weights, sum(weights)
+
+
+@lru_cache(maxsize=32)
+def _np_weights_for(n: int) -> np.ndarray:
+    """Read-only NumPy weights 1..n, shared across batch calls"""
+    weights = np.arange(1, n + 1, dtype=float)
+    weights.setflags(write=False)
+    return weights
+
+
+@dataclass(slots=True)
+class Bet:
+    """
+    One recommended bet
+
+    Slotted, so the sort and persistence steps use direct attribute access
+    instead of hashing ~15 dict keys per record; converted to a plain dict
+    only at the API boundary via to_dict()
+    """
+    player: str
+    prop_type: str
+    bet: str
+    line: float
+    odds: int
+    bookmaker: str
+    weighted_avg: float
+    hit_rate: float
+    edge: float
+    edge_percent: float
+    recommendation: str
+    confidence: str
+    games: List[float] = field(default_factory=list)
+    reliability: Optional[Dict] = None
+
+    def to_dict(self) -> Dict:
+        """
+        Plain dict in the shape the API and parlay builder expect
+        Built field by field rather than via dataclasses.asdict, which
+        would deep-copy the games list and reliability tree per bet
+        """
+        record = {
+            'player': self.player,
+            'prop_type': self.prop_type,
+            'bet': self.bet,
+            'line': self.line,
+            'odds': self.odds,
+            'bookmaker': self.bookmaker,
+            'weighted_avg': self.weighted_avg,
+            'hit_rate': self.hit_rate,
+            'edge': self.edge,
+            'edge_percent': self.edge_percent,
+            'recommendation': self.recommendation,
+            'confidence': self.confidence,
+            'games': self.games,
+        }
+        if self.reliability is not None:
+            record['reliability'] = self.reliability
+        return record
+
+
+def calculate_projection(game_history: List[float], sportsbook_line: float,
+                         player_name: str = None, prop_type: str = None,
+                         odds: int = None) -> Dict:
+    """
+    Calculate projection from game history with reliability scoring
+
+    Module-level and free of instance state, so batch analysis across many
+    slates can fan it out over a ProcessPoolExecutor (everything it takes
+    and returns is picklable). The live scan path doesn't need that: it
+    projects whole slates through calculate_projections_batch in NumPy.
+    """
+    if not game_history:
+        return None
+
+    # Weighted average (recent games weighted more); weights are cached
+    # by history length since they never change otherwise
+    weights, weight_sum = _weights_for(len(game_history))
+    weighted_avg = sum(g * w for g, w in zip(game_history, weights)) / weight_sum
+
+    # Hit rate
+    hits_over = sum(1 for g in game_history if g > sportsbook_line)
+    hit_rate = (hits_over / len(game_history)) * 100
+
+    # Edge calculation
+    edge = weighted_avg - sportsbook_line
+    edge_percent = (edge / sportsbook_line) * 100 if sportsbook_line != 0 else 0
+
+    # Recommendation (shared table lookup)
+    recommendation, confidence = _classify(edge_percent, hit_rate)
+
+    result = {
+        'weighted_avg': round(weighted_avg, 1),
+        'hit_rate': round(hit_rate, 1),
+        'edge': round(edge, 1),
+        'edge_percent': round(edge_percent, 1),
+        'recommendation': recommendation,
+        'confidence': confidence,
+        'games': game_history  # Include games for reliability calculation
+    }
+
+    # Calculate reliability if enhanced analysis is available
+    if ENHANCED_ANALYSIS_AVAILABLE and player_name and prop_type and odds:
+        try:
+            reliability = EnhancedBetAnalyzer.calculate_reliability_score(
+                player_name=player_name,
+                prop_type=prop_type,
+                recent_games=game_history,
+                line=sportsbook_line,
+                edge_percent=edge_percent
+            )
+            result['reliability'] = reliability
+        except Exception as e:
+            print(f"  ⚠️  Could not calculate reliability: {e}")
+
+    return result
+
+
 class AutomatedBetFinder:
     """
     Main class that combines stats scraping, odds scraping, and edge finding
     """
     
+    # Game histories are stable within a slate window; refetch after 6 hours
+    STATS_CACHE_TTL = 6 * 3600
+
     def __init__(self, odds_api_key: str, db_path: str = 'nfl_props.db'):
         self.stats_scraper = NFLStatsScraper()
         self.odds_scraper = OddsScraper(odds_api_key)
         self.db_path = db_path
+
+        # One long-lived connection (WAL, relaxed sync) so cache writes
+        # don't stall the scan loop; the lock covers cross-thread access
+        self._db_lock = threading.Lock()
+        self._conn = self._connect()
         self._init_database()
-    
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the props database with the WAL/relaxed-sync pragmas"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def reconnect(self):
+        """Replace the long-lived connection with a process-local one
+
+        SQLite handles must not be shared across a fork; gunicorn's
+        post_fork calls this so each preloaded worker writes through its
+        own connection instead of the one inherited from the master.
+        """
+        self._conn = self._connect()
+        self._db_lock = threading.Lock()
+
+    def close(self):
+        """Close the long-lived database connection"""
+        with self._db_lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _init_database(self):
         """Initialize database for caching"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
+        self._conn.execute('''
             CREATE TABLE IF NOT EXISTS best_bets (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 player_name TEXT,
@@ -245,136 +988,145 @@ class AutomatedBetFinder:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
-        conn.commit()
-        conn.close()
+
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS stats_cache (
+                player TEXT,
+                stat TEXT,
+                fetched_at REAL,
+                games_json TEXT,
+                PRIMARY KEY (player, stat)
+            )
+        ''')
+
+        self._conn.commit()
+
+    def _get_cached_histories(self, pairs: List) -> Dict:
+        """Load still-fresh game histories for (player, stat) pairs"""
+        cutoff = time.time() - self.STATS_CACHE_TTL
+        found = {}
+
+        with self._db_lock:
+            for player, stat in pairs:
+                row = self._conn.execute(
+                    'SELECT games_json, fetched_at FROM stats_cache WHERE player = ? AND stat = ?',
+                    (player.lower(), stat)
+                ).fetchone()
+                if row and row[1] >= cutoff:
+                    found[(player, stat)] = json.loads(row[0])
+
+        return found
+
+    def _store_histories(self, results: Dict):
+        """Persist freshly fetched game histories (empty results are skipped)"""
+        now = time.time()
+        rows = [
+            (player.lower(), stat, now, json.dumps(games))
+            for (player, stat), games in results.items() if games
+        ]
+        if not rows:
+            return
+
+        # `with conn` wraps the batch in one BEGIN/COMMIT
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO stats_cache (player, stat, fetched_at, games_json) '
+                'VALUES (?, ?, ?, ?)',
+                rows
+            )
     
-    def calculate_projection(self, game_history: List[float], sportsbook_line: float, 
-                           player_name: str = None, prop_type: str = None, odds: int = None) -> Dict:
-        """Calculate projection from game history with reliability scoring"""
-        if not game_history:
-            return None
-        
-        # Weighted average (recent games weighted more)
-        weights = list(range(1, len(game_history) + 1))
-        weighted_avg = sum(g * w for g, w in zip(game_history, weights)) / sum(weights)
-        
-        # Hit rate
-        hits_over = sum(1 for g in game_history if g > sportsbook_line)
-        hit_rate = (hits_over / len(game_history)) * 100
-        
-        # Edge calculation
-        edge = weighted_avg - sportsbook_line
-        edge_percent = (edge / sportsbook_line) * 100 if sportsbook_line != 0 else 0
-        
-        # Recommendation
-        if abs(edge_percent) < 3 or (45 < hit_rate < 55):
-            recommendation = 'PASS'
-            confidence = 'Low'
-        elif edge > 0 and edge_percent >= 8 and hit_rate >= 55:
-            recommendation = 'OVER'
-            confidence = 'High'
-        elif edge > 0 and edge_percent >= 3:
-            recommendation = 'OVER'
-            confidence = 'Medium'
-        elif edge < 0 and edge_percent <= -8 and hit_rate <= 45:
-            recommendation = 'UNDER'
-            confidence = 'High'
-        elif edge < 0 and edge_percent <= -3:
-            recommendation = 'UNDER'
-            confidence = 'Medium'
-        else:
-            recommendation = 'PASS'
-            confidence = 'Low'
-        
-        result = {
-            'weighted_avg': round(weighted_avg, 1),
-            'hit_rate': round(hit_rate, 1),
-            'edge': round(edge, 1),
-            'edge_percent': round(edge_percent, 1),
+    # Kept as a method for existing callers; the logic lives at module
+    # level so it can be mapped across processes
+    calculate_projection = staticmethod(calculate_projection)
+
+
+    @staticmethod
+    def _build_stats_matrix(game_histories: List[List[float]]) -> np.ndarray:
+        """Stack ragged game histories into a NaN-padded (players, games) matrix"""
+        num_rows = len(game_histories)
+        max_games = max((len(h) for h in game_histories), default=0)
+
+        matrix = np.full((num_rows, max_games), np.nan)
+        for i, history in enumerate(game_histories):
+            matrix[i, :len(history)] = history
+
+        return matrix
+
+    @staticmethod
+    def _classify_batch(edge_percent: np.ndarray, hit_rate: np.ndarray):
+        """Vectorized classifier - digitizes into the shared _REC_TABLE bins"""
+        ep_bin = np.where(
+            edge_percent < 0,
+            np.digitize(edge_percent, _EP_NEG_BINS, right=True),
+            2 + np.digitize(edge_percent, _EP_POS_BINS)
+        )
+        hr_bin = np.where(hit_rate <= 45, 0, 1 + np.digitize(hit_rate, [55.0]))
+
+        return _REC_ARR[ep_bin, hr_bin], _CONF_ARR[ep_bin, hr_bin]
+
+    def calculate_projections_batch(self, game_histories: List[List[float]],
+                                    lines: List[float]) -> Dict[str, np.ndarray]:
+        """
+        Vectorized calculate_projection over many (game_history, line) pairs
+
+        Computes weighted averages, hit rates, edges, and recommendations for
+        the whole batch in a handful of NumPy passes instead of per-prop
+        Python loops. Rows with no games are flagged False in 'valid'.
+        """
+        games = self._build_stats_matrix(game_histories)
+        lines = np.asarray(lines, dtype=float)
+
+        valid = ~np.isnan(games)
+        counts = valid.sum(axis=1)
+        counts_safe = np.maximum(counts, 1)
+
+        # Same weighting as the scalar path: weight i+1 for the i-th game
+        position_weights = _np_weights_for(games.shape[1])
+        weights = np.where(valid, position_weights[None, :], 0.0)
+        weight_sums = np.maximum(weights.sum(axis=1), 1.0)
+        weighted_avg = (np.where(valid, games, 0.0) * weights).sum(axis=1) / weight_sums
+
+        hits_over = np.where(valid, games > lines[:, None], False).sum(axis=1)
+        hit_rate = hits_over / counts_safe * 100
+
+        edge = weighted_avg - lines
+        edge_percent = np.where(lines != 0, edge / np.where(lines != 0, lines, 1) * 100, 0.0)
+
+        recommendation, confidence = self._classify_batch(edge_percent, hit_rate)
+
+        return {
+            'weighted_avg': np.round(weighted_avg, 1),
+            'hit_rate': np.round(hit_rate, 1),
+            'edge': np.round(edge, 1),
+            'edge_percent': np.round(edge_percent, 1),
             'recommendation': recommendation,
             'confidence': confidence,
-            'games': game_history  # Include games for reliability calculation
+            'valid': counts > 0
         }
-        
-        # Calculate reliability if enhanced analysis is available
-        if ENHANCED_ANALYSIS_AVAILABLE and player_name and prop_type and odds:
-            try:
-                reliability = EnhancedBetAnalyzer.calculate_reliability_score(
-                    player_name=player_name,
-                    prop_type=prop_type,
-                    recent_games=game_history,
-                    line=sportsbook_line,
-                    edge_percent=edge_percent
-                )
-                result['reliability'] = reliability
-            except Exception as e:
-                print(f"  ⚠️  Could not calculate reliability: {e}")
-        
-        return result
-    
-    
+
+    @staticmethod
+    def _keep_player(player_info: Dict) -> bool:
+        """Usage filter for one player (module-level constants do the work)"""
+        player_name = player_info['name'].casefold()
+
+        # Check if player is in backup list
+        if player_name in _BACKUP_PLAYERS:
+            log.debug("Filtered out: %s (backup/low usage)", player_info['name'])
+            return False
+
+        # If a TE only has reception props but not many, likely backup
+        props = player_info.get('props', [])
+        if any('reception' in p for p in props) and _LOW_TARGET_TE_RE.search(player_name):
+            log.debug("Filtered out: %s (low-target TE)", player_info['name'])
+            return False
+
+        return True
+
     def _filter_low_usage_players(self, players: List[Dict]) -> List[Dict]:
         """
         Filter out low-usage players (backups, low-snap TEs, committee RBs)
         """
-        # Known backup QBs, TEs, and low-usage players to exclude
-        backup_players = {
-            # Backup QBs
-            'malik willis', 'sam darnold', 'taylor heinicke', 'mason rudolph',
-            'mitchell trubisky', 'josh dobbs', 'jacoby brissett', 'andy dalton',
-            'jameis winston', 'drew lock', 'trevor siemian', 'jimmy garoppolo',
-            
-            # Backup TEs (low snap count)
-            'davis allen', 'foster moreau', 'johnny mundt', 'nick vannett',
-            'john bates', 'tre\' mckitty', 'jordan akins', 'mo alie-cox',
-            'tommy tremble', 'charlie kolar', 'will dissly', 'gerald everett',
-            'zach gentry', 'hunter henry', 'josh oliver', 'luke farrell',
-            
-            # Committee/Backup RBs (RB2/RB3)
-            'blake corum', 'royce freeman', 'ty johnson', 'pierre strong',
-            'clyde edwards-helaire', 'elijah mitchell', 'cam akers', 'ronnie rivers',
-            'jashaun corbin', 'malik davis', 'snoop conner', 'patrick taylor',
-            'hassan haskins', 'deon jackson', 'julius chestnut', 'trayveon williams',
-            
-            # WR3/WR4 (inconsistent targets)
-            'tutu atwell', 'demarcus robinson', 'tyler boyd', 'van jefferson',
-            'kalif raymond', 'craig reynolds', 'robbie chosen', 'james proche',
-            'tyler johnson', 'jalen nailor', 'trent sherfield', 'kj osborn',
-        }
-        
-        # RB committees - keep only the primary back
-        rb_committees = {
-            'rams': {'primary': ['kyren williams'], 'exclude': ['blake corum', 'royce freeman']},
-            'chiefs': {'primary': ['isiah pacheco'], 'exclude': ['clyde edwards-helaire']},
-            '49ers': {'primary': ['christian mccaffrey', 'jordan mason'], 'exclude': ['elijah mitchell']},
-            'dolphins': {'primary': ['de\'von achane', 'raheem mostert'], 'exclude': ['jeff wilson']},
-        }
-        
-        filtered = []
-        
-        for player_info in players:
-            player_name = player_info['name'].lower()
-            
-            # Check if player is in backup list
-            if player_name in backup_players:
-                print(f"  ⚠️  Filtered out: {player_info['name']} (backup/low usage)")
-                continue
-            
-            # Additional filters based on prop types
-            props = player_info.get('props', [])
-            
-            # If a TE only has reception props but not many, likely backup
-            if any('reception' in p for p in props):
-                # Check if it's a rarely-targeted player
-                if any(backup in player_name for backup in ['allen', 'bates', 'moreau', 'mundt']):
-                    print(f"  ⚠️  Filtered out: {player_info['name']} (low-target TE)")
-                    continue
-            
-            # Passed all filters
-            filtered.append(player_info)
-        
-        return filtered
+        return [p for p in players if self._keep_player(p)]
     
     def find_best_bets(self, players: List[Dict], min_edge: float = 5.0) -> List[Dict]:
         """
@@ -398,152 +1150,196 @@ class AutomatedBetFinder:
         print(f"  ✅ {len(filtered_players)} of {len(players)} players passed usage filter")
         
         best_bets = []
-        
+
+        # Resolve odds first so we only scrape stats for props that have lines,
+        # then batch-fetch every unique (player, stat) history concurrently.
+        # One pass over the props tree builds an O(1) per-pair line index;
+        # partial names that miss it fall back to the substring search
+        props_index = self.odds_scraper.index_props(all_props)
+
+        lines_by_pair = {}
+        stat_pairs = []
+
+        for player_info in filtered_players:
+            player_name = player_info['name']
+            for prop_type in player_info['props']:
+                lines = (props_index.get((player_name.casefold(), prop_type))
+                         or self.odds_scraper.get_best_lines(player_name, prop_type, all_props))
+                if lines:
+                    lines_by_pair[(player_name, prop_type)] = lines
+                    stat_pairs.append((player_name, prop_type.replace('player_', '')))
+
+        # Serve what we can from the local stats cache, then batch-fetch
+        # only the misses and store them for the next run
+        unique_pairs = list(dict.fromkeys(stat_pairs))
+        stats_by_pair = self._get_cached_histories(unique_pairs)
+        missing = [pair for pair in unique_pairs if pair not in stats_by_pair]
+
+        print(f"\n📡 {len(stats_by_pair)} histories cached, batch-fetching {len(missing)}...")
+        if missing:
+            fetched = self.stats_scraper.get_many_recent_games(missing, num_games=7)
+            self._store_histories(fetched)
+            stats_by_pair.update(fetched)
+
         print("\n" + "="*80)
         print("🎯 ANALYZING PLAYER PROPS")
         print("="*80)
-        
+
+        # Assemble one row per unique line and project the whole slate in a
+        # single vectorized pass. Over and under almost always share the
+        # same point, so most props collapse to one projection; when the
+        # books split the lines, each distinct point gets its own row
+        rows = []
         for player_info in filtered_players:
             player_name = player_info['name']
-            prop_types = player_info['props']
-            
-            print(f"\n👤 {player_name}")
-            
-            for prop_type in prop_types:
-                # Get best lines from odds
-                lines = self.odds_scraper.get_best_lines(player_name, prop_type, all_props)
-                
+            for prop_type in player_info['props']:
+                lines = lines_by_pair.get((player_name, prop_type))
                 if not lines:
-                    print(f"  ⚠️  No odds for {prop_type}")
+                    log.debug("No odds for %s %s", player_name, prop_type)
                     continue
-                
-                # Get stats history (with delay to avoid rate limiting)
+
                 stat_type = prop_type.replace('player_', '')
-                game_history = self.stats_scraper.get_player_recent_games(
-                    player_name, 
-                    stat_type,
-                    num_games=7
-                )
-                
-                # Add 2-second delay after each stat fetch to avoid PFR rate limiting
-                time.sleep(2)
-                
-                # Analyze over bet
-                over_line = lines['best_over']['point']
-                over_odds = lines['best_over']['price']
-                over_bookmaker = lines['best_over']['bookmaker']
-                
-                over_projection = self.calculate_projection(
-                    game_history, 
-                    over_line,
-                    player_name=player_name,
-                    prop_type=prop_type,
-                    odds=over_odds
-                )
-                
-                if over_projection and abs(over_projection['edge_percent']) >= min_edge:
-                    if over_projection['recommendation'] == 'OVER':
-                        bet = {
-                            'player': player_name,
-                            'prop_type': prop_type,
-                            'bet': 'OVER',
-                            'line': over_line,
-                            'odds': over_odds,
-                            'bookmaker': over_bookmaker,
-                            **over_projection
-                        }
-                        best_bets.append(bet)
-                        
-                        # Show reliability in output if available
-                        reliability_str = ""
-                        if 'reliability' in over_projection:
-                            rel_score = over_projection['reliability']['reliability_score']
-                            reliability_str = f" | Reliability: {rel_score}/100"
-                        
-                        print(f"  ✅ OVER {over_line} ({over_odds}) - Edge: {over_projection['edge_percent']:+.1f}%{reliability_str}")
-                
-                # Analyze under bet
-                under_line = lines['best_under']['point']
-                under_odds = lines['best_under']['price']
-                under_bookmaker = lines['best_under']['bookmaker']
-                
-                under_projection = self.calculate_projection(
-                    game_history, 
-                    under_line,
-                    player_name=player_name,
+                game_history = stats_by_pair.get((player_name, stat_type), [])
+                if not game_history:
+                    continue
+
+                sides_by_point = {}
+                for side, key in (('OVER', 'best_over'), ('UNDER', 'best_under')):
+                    sides_by_point.setdefault(lines[key]['point'], {})[side] = lines[key]
+
+                for point, sides in sides_by_point.items():
+                    rows.append((player_name, prop_type, point, sides, game_history))
+
+        if rows:
+            batch = self.calculate_projections_batch(
+                [row[4] for row in rows],
+                [row[2] for row in rows]
+            )
+
+            for i, (player_name, prop_type, point, sides, game_history) in enumerate(rows):
+                if not batch['valid'][i]:
+                    continue
+
+                edge_percent = float(batch['edge_percent'][i])
+                recommendation = str(batch['recommendation'][i])
+
+                # The projection picks the side; only emit if we actually
+                # have a priced line on that side of this point
+                line_info = sides.get(recommendation)
+                if line_info is None or abs(edge_percent) < min_edge:
+                    continue
+                side = recommendation
+
+                # Reliability only for bets that actually make the cut
+                reliability = None
+                if ENHANCED_ANALYSIS_AVAILABLE:
+                    try:
+                        reliability = EnhancedBetAnalyzer.calculate_reliability_score(
+                            player_name=player_name,
+                            prop_type=prop_type,
+                            recent_games=game_history,
+                            line=line_info['point'],
+                            edge_percent=edge_percent
+                        )
+                    except Exception as e:
+                        log.warning("Could not calculate reliability for %s: %s",
+                                    player_name, e)
+
+                best_bets.append(Bet(
+                    player=player_name,
                     prop_type=prop_type,
-                    odds=under_odds
-                )
-                
-                if under_projection and abs(under_projection['edge_percent']) >= min_edge:
-                    if under_projection['recommendation'] == 'UNDER':
-                        bet = {
-                            'player': player_name,
-                            'prop_type': prop_type,
-                            'bet': 'UNDER',
-                            'line': under_line,
-                            'odds': under_odds,
-                            'bookmaker': under_bookmaker,
-                            **under_projection
-                        }
-                        best_bets.append(bet)
-                        
-                        # Show reliability in output if available
-                        reliability_str = ""
-                        if 'reliability' in under_projection:
-                            rel_score = under_projection['reliability']['reliability_score']
-                            reliability_str = f" | Reliability: {rel_score}/100"
-                        
-                        print(f"  ✅ UNDER {under_line} ({under_odds}) - Edge: {under_projection['edge_percent']:+.1f}%{reliability_str}")
-        
-        # Sort by edge percentage
-        best_bets.sort(key=lambda x: abs(x['edge_percent']), reverse=True)
-        
+                    bet=side,
+                    line=line_info['point'],
+                    odds=line_info['price'],
+                    bookmaker=line_info['bookmaker'],
+                    weighted_avg=float(batch['weighted_avg'][i]),
+                    hit_rate=float(batch['hit_rate'][i]),
+                    edge=float(batch['edge'][i]),
+                    edge_percent=edge_percent,
+                    recommendation=recommendation,
+                    confidence=str(batch['confidence'][i]),
+                    games=game_history,
+                    reliability=reliability
+                ))
+
+                log.debug("%s: %s %s (%s) edge=%+.1f%% reliability=%s",
+                          player_name, side, line_info['point'], line_info['price'],
+                          edge_percent,
+                          reliability['reliability_score'] if reliability else '-')
+
+
+        # Sort by edge percentage (attribute access - no dict hashing)
+        best_bets.sort(key=lambda b: abs(b.edge_percent), reverse=True)
+
         # Save to database
         if best_bets:
             self._save_best_bets(best_bets)
-        
+
         print("\n" + "="*80)
         print(f"✅ Found {len(best_bets)} bets with {min_edge}%+ edge")
         print("="*80)
-        
-        return best_bets
+
+        # Dict shape only at the boundary
+        return [bet.to_dict() for bet in best_bets]
     
-    def _save_best_bets(self, bets: List[Dict]):
+    def find_best_bets_flat(self, work_pairs, min_edge: float = 5.0) -> List[Dict]:
+        """
+        find_best_bets for a pre-deduped set of (player_name, prop_type) pairs
+
+        Callers that discover props across overlapping games (quick scan)
+        hand over a flat set, so each pair is analyzed exactly once no
+        matter how many games it appeared in. Pairs are regrouped into the
+        per-player shape the scan pipeline expects.
+        """
+        grouped = {}
+        for player_name, prop_type in work_pairs:
+            grouped.setdefault(player_name, set()).add(prop_type)
+
+        players = [
+            {'name': name, 'props': sorted(props)}
+            for name, props in sorted(grouped.items())
+        ]
+        return self.find_best_bets(players, min_edge=min_edge)
+
+    def _save_best_bets(self, bets: List[Bet]):
         """Save best bets to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        for bet in bets:
-            cursor.execute('''
-                INSERT INTO best_bets 
+        rows = [
+            (
+                bet.player,
+                bet.prop_type,
+                bet.line,
+                bet.weighted_avg,
+                bet.edge,
+                bet.edge_percent,
+                bet.hit_rate,
+                bet.bet,
+                bet.confidence,
+                bet.bookmaker,
+                bet.odds
+            )
+            for bet in bets
+        ]
+
+        # One statement, one transaction: N parse/flush cycles become one
+        with self._db_lock, self._conn:
+            self._conn.executemany('''
+                INSERT INTO best_bets
                 (player_name, prop_type, line, projection, edge, edge_percent,
                  hit_rate, recommendation, confidence, bookmaker, odds)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                bet['player'],
-                bet['prop_type'],
-                bet['line'],
-                bet['weighted_avg'],
-                bet['edge'],
-                bet['edge_percent'],
-                bet['hit_rate'],
-                bet['bet'],
-                bet['confidence'],
-                bet['bookmaker'],
-                bet['odds']
-            ))
-        
-        conn.commit()
-        conn.close()
+            ''', rows)
     
     def print_best_bets(self, bets: List[Dict], top_n: int = 10):
         """Print the top N best bets in a nice format"""
         print("\n" + "="*80)
         print(f"🔥 TOP {min(top_n, len(bets))} BEST BETS (Sorted by Edge)")
         print("="*80)
-        
-        for i, bet in enumerate(bets[:top_n], 1):
+
+        # O(N log k) top-k selection; works whether or not the caller's
+        # list is already sorted
+        top_bets = heapq.nlargest(top_n, bets, key=lambda b: abs(b['edge_percent']))
+
+        for i, bet in enumerate(top_bets, 1):
             confidence_emoji = '🔥' if bet['confidence'] == 'High' else '⚡'
             
             print(f"\n{i}. {confidence_emoji} {bet['player']} - {bet['prop_type'].replace('player_', '').upper()}")
@@ -567,111 +1363,74 @@ class AutomatedBetFinder:
         Returns:
             Dictionary with parlay details and recommendation
         """
-        # Define backup players to filter out
-        BACKUP_RBS = {
-            'keaton mitchell', 'kenneth gainwell', 'pierre strong', 'ty johnson',
-            'blake corum', 'royce freeman', 'clyde edwards-helaire', 'elijah mitchell',
-            'cam akers', 'ronnie rivers', 'jashaun corbin', 'malik davis',
-            'brian robinson jr', 'jordan mason', 'rico dowdle', 'tyjae spears'
-        }
-        
-        BACKUP_TES = {
-            'aj barner', 'foster moreau', 'tommy tremble', 'charlie kolar',
-            'will dissly', 'gerald everett', 'zach gentry', 'josh oliver',
-            'johnny mundt', 'nick vannett', 'john bates', 'jordan akins'
-        }
-        
-        # Filter and score bets based on risk level
-        scored_bets = []
-        
-        for bet in bets:
-            player_lower = bet['player'].lower()
-            
-            # Calculate true edge (hit rate vs implied probability)
-            hit_rate = bet.get('hit_rate', 50)
-            odds = bet['odds']
-            
-            if odds < 0:
-                implied_prob = (abs(odds) / (abs(odds) + 100)) * 100
-            else:
-                implied_prob = (100 / (odds + 100)) * 100
-            
-            true_edge = hit_rate - implied_prob
-            
-            # Get reliability if available
-            reliability_score = 50  # default
-            consistency_score = 50  # default
-            cv = 50  # default
-            
-            if 'reliability' in bet:
-                reliability_score = bet['reliability'].get('reliability_score', 50)
-                if 'consistency' in bet['reliability']:
-                    consistency_score = bet['reliability']['consistency'].get('consistency_score', 50)
-                    cv = bet['reliability']['consistency'].get('coefficient_variation', 50)
-            
-            # Check if backup player
-            is_backup = player_lower in BACKUP_RBS or player_lower in BACKUP_TES
-            
-            # Check prop type for volatility (receiving yards for RBs is volatile)
+        # Score and filter all candidate bets as column arrays - one pass of
+        # string/dict extraction, then the float math and risk masks run
+        # vectorized instead of per-bet Python branches
+        n = len(bets)
+        odds_arr = np.empty(n)
+        hit_rate_arr = np.empty(n)
+        reliability_arr = np.empty(n)
+        consistency_arr = np.empty(n)
+        cv_arr = np.empty(n)
+        is_backup = np.empty(n, dtype=bool)
+        volatile_yds_prop = np.empty(n, dtype=bool)
+        rb_receiving_prop = np.empty(n, dtype=bool)
+
+        for i, bet in enumerate(bets):
+            odds_arr[i] = bet['odds']
+            hit_rate_arr[i] = bet.get('hit_rate', 50)
+
+            reliability = bet.get('reliability') or {}
+            reliability_arr[i] = reliability.get('reliability_score', 50)
+            consistency = reliability.get('consistency') or {}
+            consistency_arr[i] = consistency.get('consistency_score', 50)
+            cv_arr[i] = consistency.get('coefficient_variation', 50)
+
+            is_backup[i] = bet['player'].lower() in _ALL_BACKUPS
+
+            # Receiving yards for RBs / high-variance yardage props are volatile
             prop_type = bet.get('prop_type', '')
-            is_volatile_prop = (
-                ('rush_yds' in prop_type or 'reception_yds' in prop_type) and
-                cv > 40
-            ) or (
-                'reception_yds' in prop_type and 'rb' in bet.get('position', '').lower()
-            )
-            
-            # Apply filters based on risk level
-            if risk_level == 'conservative':
-                # Conservative: High reliability, no backups, low volatility
-                if is_backup:
-                    continue  # Skip backups entirely
-                if reliability_score < 70:
-                    continue  # Need high reliability
-                if cv > 25:
-                    continue  # Too volatile
-                if true_edge < 5:
-                    continue  # Need decent edge
-                if hit_rate < 60:
-                    continue  # Need high hit rate
-                    
-            elif risk_level == 'balanced':
-                # Balanced: Medium reliability, max one backup, medium volatility
-                if reliability_score < 55:
-                    continue
-                if true_edge < 3:
-                    continue
-                if hit_rate < 50:
-                    continue
-                    
-            # For aggressive, take all bets with positive edge
-            elif risk_level == 'aggressive':
-                if true_edge < 1:
-                    continue
-            
-            # Calculate composite score for ranking
-            # Prioritize: true edge, reliability, hit rate
-            composite_score = (
-                true_edge * 2.0 +  # True edge is most important
-                (reliability_score / 10) +
-                (hit_rate / 10) +
-                (-10 if is_backup else 0) +  # Penalty for backups
-                (-5 if is_volatile_prop else 0)  # Penalty for volatile props
-            )
-            
-            scored_bets.append({
-                **bet,
-                'true_edge': true_edge,
-                'reliability_score': reliability_score,
-                'consistency_score': consistency_score,
-                'cv': cv,
-                'is_backup': is_backup,
-                'is_volatile': is_volatile_prop,
-                'composite_score': composite_score
-            })
-        
-        # Sort by composite score
-        scored_bets.sort(key=lambda x: x['composite_score'], reverse=True)
+            volatile_yds_prop[i] = 'rush_yds' in prop_type or 'reception_yds' in prop_type
+            rb_receiving_prop[i] = ('reception_yds' in prop_type
+                                    and 'rb' in bet.get('position', '').lower())
+
+        true_edge = hit_rate_arr - implied_probability_batch(odds_arr)
+        is_volatile = (volatile_yds_prop & (cv_arr > 40)) | rb_receiving_prop
+
+        # Apply filters based on risk level
+        if risk_level == 'conservative':
+            # Conservative: high reliability, no backups, low volatility
+            mask = (~is_backup & (reliability_arr >= 70) & (cv_arr <= 25)
+                    & (true_edge >= 5) & (hit_rate_arr >= 60))
+        elif risk_level == 'balanced':
+            # Balanced: medium reliability, max one backup (enforced below)
+            mask = (reliability_arr >= 55) & (true_edge >= 3) & (hit_rate_arr >= 50)
+        else:
+            # Aggressive: anything with positive edge
+            mask = true_edge >= 1
+
+        # Composite score: true edge dominates, reliability and hit rate
+        # contribute, backups and volatile props are penalized
+        composite = (true_edge * 2.0 + reliability_arr / 10 + hit_rate_arr / 10
+                     - 10 * is_backup - 5 * is_volatile)
+
+        # Survivors in composite order (stable, like the old list sort)
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(-composite[idx], kind='stable')]
+
+        scored_bets = [
+            {
+                **bets[i],
+                'true_edge': float(true_edge[i]),
+                'reliability_score': float(reliability_arr[i]),
+                'consistency_score': float(consistency_arr[i]),
+                'cv': float(cv_arr[i]),
+                'is_backup': bool(is_backup[i]),
+                'is_volatile': bool(is_volatile[i]),
+                'composite_score': float(composite[i])
+            }
+            for i in idx
+        ]
         
         # For conservative, limit to one backup max
         if risk_level == 'balanced':
@@ -697,29 +1456,17 @@ class AutomatedBetFinder:
         
         parlay_legs = scored_bets[:num_legs]
         
-        # Calculate parlay odds and probabilities
-        combined_decimal = 1
-        combined_prob = 1
-        total_true_edge = 0
-        
-        for leg in parlay_legs:
-            # Convert American to decimal
-            odds = leg['odds']
-            if odds > 0:
-                decimal = (odds / 100) + 1
-            else:
-                decimal = (100 / abs(odds)) + 1
-            
-            combined_decimal *= decimal
-            
-            # Use hit rate for probability
-            prob = leg['hit_rate'] / 100
-            combined_prob *= prob
-            
-            # Sum true edges
-            total_true_edge += leg['true_edge']
-        
-        avg_true_edge = total_true_edge / len(parlay_legs)
+        # Calculate parlay odds and probabilities in log-space: sum the
+        # logs and exponentiate once, instead of a running product whose
+        # tail loses precision on long parlays (6+ legs push the combined
+        # probability below 1e-6)
+        decimals = np.array([american_to_decimal(leg['odds']) for leg in parlay_legs])
+        probs = np.array([leg['hit_rate'] / 100 for leg in parlay_legs])
+
+        combined_decimal = float(np.exp(np.log(decimals).sum()))
+        combined_prob = float(np.exp(np.log(probs).sum()))
+
+        avg_true_edge = sum(leg['true_edge'] for leg in parlay_legs) / len(parlay_legs)
         
         # Convert to American odds
         if combined_decimal >= 2:
@@ -728,7 +1475,7 @@ class AutomatedBetFinder:
             american_odds = int(-100 / (combined_decimal - 1))
         
         # Calculate parlay true edge
-        parlay_implied_prob = implied_prob = (abs(american_odds) / (abs(american_odds) + 100)) * 100 if american_odds < 0 else (100 / (american_odds + 100)) * 100
+        parlay_implied_prob = implied_probability(american_odds)
         parlay_true_edge = (combined_prob * 100) - parlay_implied_prob
         
         payout = combined_decimal * 100
@@ -787,7 +1534,10 @@ class AutomatedBetFinder:
 # ============================================================================
 
 if __name__ == "__main__":
-    
+
+    # Show per-bet detail when run directly; servers leave DEBUG off
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
+
     # Initialize with your API key
     API_KEY = "your_api_key_here"  # Replace with your actual key
     
@@ -4,23 +4,249 @@ Scrapes defensive rankings from Pro Football Reference
 Used to adjust player projections based on opponent strength
 """
 
+import json
+import os
+
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from typing import Dict, List, Optional
 import time
 
+# selectolax's lexbor engine walks the stats table roughly 10x faster than
+# BeautifulSoup's per-cell attribute scans; BS4+lxml remains the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+
+# Full team name -> PFR abbreviation, for rows whose team cell has no link
+# (module-level so the per-row loop doesn't rebuild 32 entries per pass)
+_NAME_TO_ABBR = {
+    'arizona cardinals': 'ARI',
+    'atlanta falcons': 'ATL',
+    'baltimore ravens': 'BAL',
+    'buffalo bills': 'BUF',
+    'carolina panthers': 'CAR',
+    'chicago bears': 'CHI',
+    'cincinnati bengals': 'CIN',
+    'cleveland browns': 'CLE',
+    'dallas cowboys': 'DAL',
+    'denver broncos': 'DEN',
+    'detroit lions': 'DET',
+    'green bay packers': 'GB',
+    'houston texans': 'HOU',
+    'indianapolis colts': 'IND',
+    'jacksonville jaguars': 'JAX',
+    'kansas city chiefs': 'KC',
+    'las vegas raiders': 'LV',
+    'los angeles chargers': 'LAC',
+    'los angeles rams': 'LAR',
+    'miami dolphins': 'MIA',
+    'minnesota vikings': 'MIN',
+    'new england patriots': 'NE',
+    'new orleans saints': 'NO',
+    'new york giants': 'NYG',
+    'new york jets': 'NYJ',
+    'philadelphia eagles': 'PHI',
+    'pittsburgh steelers': 'PIT',
+    'san francisco 49ers': 'SF',
+    'seattle seahawks': 'SEA',
+    'tampa bay buccaneers': 'TB',
+    'tennessee titans': 'TEN',
+    'washington commanders': 'WAS',
+}
+
 
 class DefenseStatsScraper:
     """Scrape NFL defensive rankings from Pro Football Reference"""
-    
+
+    CACHE_TTL = 3600       # Seconds a scraped ranking set stays fresh
+    _CACHE_VERSION = 1     # Bump to invalidate disk caches on schema change
+
     def __init__(self):
         self.base_url = "https://www.pro-football-reference.com"
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            # Advertise brotli: PFR serves it and it roughly halves the
+            # bytes on the wire versus gzip (decoded by urllib3 + brotli)
+            'Accept-Encoding': 'gzip, deflate, br',
         }
         self.defense_cache = {}
         self.cache_timestamp = 0
-    
+
+        # Elite/poor tier membership, rebuilt whenever rankings load
+        self._elite_defenses = frozenset()
+        self._poor_defenses = frozenset()
+
+        # Pooled session: keep-alive reuses the PFR TLS connection across
+        # refreshes instead of re-handshaking, with retries on 429/5xx
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+
+    def _index_tiers(self, rankings: Dict) -> None:
+        """Precompute tier membership so matchup lookups are two set probes"""
+        total_teams = len(rankings)
+        self._elite_defenses = frozenset(
+            abbr for abbr, d in rankings.items() if d['rank'] <= 10)
+        self._poor_defenses = frozenset(
+            abbr for abbr, d in rankings.items() if d['rank'] >= total_teams - 9)
+
+    @staticmethod
+    def _cache_path(season: int) -> str:
+        return os.path.join('.cache', f'defense_rankings_{season}.json')
+
+    def _load_disk_cache(self, season: int, now: float) -> Optional[Dict]:
+        """Load still-fresh rankings written by a previous process, if any"""
+        try:
+            with open(self._cache_path(season)) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if payload.get('version') != self._CACHE_VERSION:
+            return None
+        if now - payload.get('ts', 0) >= self.CACHE_TTL:
+            return None
+        return payload['rankings']
+
+    def _store_disk_cache(self, season: int, now: float, rankings: Dict) -> None:
+        """Persist rankings so fresh processes skip the PFR scrape entirely"""
+        try:
+            os.makedirs('.cache', exist_ok=True)
+            with open(self._cache_path(season), 'w') as f:
+                json.dump({'version': self._CACHE_VERSION, 'ts': now,
+                           'rankings': rankings}, f)
+        except OSError:
+            pass  # Cache is best-effort; the scrape already succeeded
+
+    def _extract_team_rows(self, html: bytes) -> List[Dict]:
+        """
+        Normalize the team_stats table into per-row dicts
+        Parser-agnostic: the ranking logic below doesn't care which HTML
+        library produced the rows
+        """
+        if SELECTOLAX_AVAILABLE:
+            return self._extract_team_rows_selectolax(html)
+        return self._extract_team_rows_lxml(html)
+
+    @staticmethod
+    def _extract_team_rows_selectolax(html: bytes) -> List[Dict]:
+        """Fast path: CSS selectors run inside lexbor's C engine"""
+        tree = LexborHTMLParser(html)
+        rows = []
+        for row in tree.css('table#team_stats tbody tr'):
+            if row.css_first('th.over_header'):
+                continue
+
+            # One walk over the row's cells builds the whole stat map; the
+            # old form re-scanned the row once per extracted field
+            cells = {}
+            team_cell = None
+            for cell in row.css('th[data-stat], td[data-stat]'):
+                stat = cell.attributes.get('data-stat')
+                if stat == 'team':
+                    team_cell = cell
+                else:
+                    cells[stat] = cell.text(strip=True)
+
+            if team_cell is None:
+                continue
+
+            link = team_cell.css_first('a')
+
+            rows.append({
+                'team_name': team_cell.text(strip=True),
+                'team_href': link.attributes.get('href') if link else None,
+                'pass_yds': cells.get('pass_yds', ''),
+                'rush_yds': cells.get('rush_yds', ''),
+                'points': cells.get('points', ''),
+            })
+        return rows
+
+    @staticmethod
+    def _extract_team_rows_lxml(html: bytes) -> List[Dict]:
+        """
+        Fallback path: lxml's pull parser emits <tr> elements as they're
+        tokenized and frees each one, so the 100KB+ page never materializes
+        as a full DOM - and parsing stops as soon as team_stats closes
+        """
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+
+        rows = []
+        in_table = False
+        in_tbody = False
+        done = False
+
+        chunk_size = 16384
+        for offset in range(0, len(html), chunk_size):
+            parser.feed(html[offset:offset + chunk_size])
+
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if elem.tag == 'table' and elem.get('id') == 'team_stats':
+                        in_table = True
+                    elif in_table and elem.tag == 'tbody':
+                        in_tbody = True
+                    continue
+
+                if in_table and elem.tag == 'table':
+                    done = True  # The stats table closed; skip the rest
+                    break
+                if elem.tag == 'tbody':
+                    in_tbody = False
+                    continue
+                if not in_tbody or elem.tag != 'tr':
+                    continue
+
+                team_name = None
+                team_href = None
+                cells = {}
+                is_header = False
+
+                for cell in elem.iter('th', 'td'):
+                    if cell.tag == 'th' and 'over_header' in (cell.get('class') or '').split():
+                        is_header = True
+                        break
+                    stat = cell.get('data-stat')
+                    if not stat:
+                        continue
+                    if stat == 'team':
+                        team_name = ''.join(cell.itertext()).strip()
+                        link = cell.find('.//a')
+                        if link is not None:
+                            team_href = link.get('href')
+                    else:
+                        cells[stat] = ''.join(cell.itertext()).strip()
+
+                if not is_header and team_name is not None:
+                    rows.append({
+                        'team_name': team_name,
+                        'team_href': team_href,
+                        'pass_yds': cells.get('pass_yds', ''),
+                        'rush_yds': cells.get('rush_yds', ''),
+                        'points': cells.get('points', ''),
+                    })
+
+                elem.clear()  # Free the row subtree immediately
+
+            if done:
+                break
+
+        return rows
+
     def get_defensive_rankings(self, season: int = 2025) -> Dict[str, Dict]:
         """
         Get defensive rankings for all teams
@@ -28,104 +254,53 @@ class DefenseStatsScraper:
         """
         # Use cache if less than 1 hour old
         current_time = time.time()
-        if self.defense_cache and (current_time - self.cache_timestamp) < 3600:
+        if self.defense_cache and (current_time - self.cache_timestamp) < self.CACHE_TTL:
             return self.defense_cache
-        
+
+        # Disk cache survives process restarts (CLI runs, server reloads),
+        # so a fresh process within the TTL never re-scrapes PFR
+        cached = self._load_disk_cache(season, current_time)
+        if cached is not None:
+            self.defense_cache = cached
+            self.cache_timestamp = current_time
+            self._index_tiers(cached)
+            return cached
+
         try:
             url = f"{self.base_url}/years/{season}/opp.htm"
             
             print(f"🔍 Fetching defensive rankings from {url}")
             
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find the team defense table
-            table = soup.find('table', {'id': 'team_stats'})
-            if not table:
+            team_rows = self._extract_team_rows(response.content)
+
+            if not team_rows:
                 print("  ⚠️  Could not find defense stats table")
                 return {}
-            
+
             rankings = {}
-            tbody = table.find('tbody')
-            
-            if not tbody:
-                return {}
-            
             rank = 1
-            for row in tbody.find_all('tr'):
-                # Skip header rows
-                if row.find('th', {'class': 'over_header'}):
-                    continue
-                
-                # Get team name/abbreviation - check both th and td
-                team_cell = row.find('th', {'data-stat': 'team'})
-                if not team_cell:
-                    team_cell = row.find('td', {'data-stat': 'team'})
-                
-                if not team_cell:
-                    continue
-                
-                team_name = team_cell.get_text(strip=True)
-                team_link = team_cell.find('a')
+            for row in team_rows:
+                team_name = row['team_name']
                 team_abbr = None
-                
-                if team_link and team_link.get('href'):
+
+                if row['team_href']:
                     # Extract abbreviation from URL like /teams/dal/2025.htm
-                    href = team_link['href']
-                    parts = href.split('/')
+                    parts = row['team_href'].split('/')
                     if len(parts) >= 3:
                         team_abbr = parts[2].upper()
-                
-                # If no link, try to extract abbreviation from team name
+
+                # If no link, map the full team name to its abbreviation
                 if not team_abbr:
-                    # Map full names to abbreviations
-                    name_to_abbr = {
-                        'arizona cardinals': 'ARI',
-                        'atlanta falcons': 'ATL',
-                        'baltimore ravens': 'BAL',
-                        'buffalo bills': 'BUF',
-                        'carolina panthers': 'CAR',
-                        'chicago bears': 'CHI',
-                        'cincinnati bengals': 'CIN',
-                        'cleveland browns': 'CLE',
-                        'dallas cowboys': 'DAL',
-                        'denver broncos': 'DEN',
-                        'detroit lions': 'DET',
-                        'green bay packers': 'GB',
-                        'houston texans': 'HOU',
-                        'indianapolis colts': 'IND',
-                        'jacksonville jaguars': 'JAX',
-                        'kansas city chiefs': 'KC',
-                        'las vegas raiders': 'LV',
-                        'los angeles chargers': 'LAC',
-                        'los angeles rams': 'LAR',
-                        'miami dolphins': 'MIA',
-                        'minnesota vikings': 'MIN',
-                        'new england patriots': 'NE',
-                        'new orleans saints': 'NO',
-                        'new york giants': 'NYG',
-                        'new york jets': 'NYJ',
-                        'philadelphia eagles': 'PHI',
-                        'pittsburgh steelers': 'PIT',
-                        'san francisco 49ers': 'SF',
-                        'seattle seahawks': 'SEA',
-                        'tampa bay buccaneers': 'TB',
-                        'tennessee titans': 'TEN',
-                        'washington commanders': 'WAS',
-                    }
-                    team_abbr = name_to_abbr.get(team_name.lower())
-                
+                    team_abbr = _NAME_TO_ABBR.get(team_name.lower())
+
                 # Get defensive stats
-                pass_yds = row.find('td', {'data-stat': 'pass_yds'})
-                rush_yds = row.find('td', {'data-stat': 'rush_yds'})
-                points = row.find('td', {'data-stat': 'points'})
-                
-                pass_yds_val = float(pass_yds.get_text(strip=True)) if pass_yds else 0
-                rush_yds_val = float(rush_yds.get_text(strip=True)) if rush_yds else 0
-                points_val = float(points.get_text(strip=True)) if points else 0
-                
+                pass_yds_val = float(row['pass_yds'] or 0)
+                rush_yds_val = float(row['rush_yds'] or 0)
+                points_val = float(row['points'] or 0)
+
                 if team_abbr:
                     rankings[team_abbr] = {
                         'team_name': team_name,
@@ -141,7 +316,9 @@ class DefenseStatsScraper:
             # Cache the results
             self.defense_cache = rankings
             self.cache_timestamp = current_time
-            
+            self._index_tiers(rankings)
+            self._store_disk_cache(season, current_time, rankings)
+
             return rankings
             
         except Exception as e:
@@ -168,67 +345,37 @@ class DefenseStatsScraper:
             print(f"  ⚠️  No defensive data for {opponent}, using neutral adjustment")
             return 1.0  # No adjustment
         
-        defense = rankings[opponent]
-        rank = defense['rank']
+        rank = rankings[opponent]['rank']
         total_teams = len(rankings)
-        
-        # Determine if opponent is elite, average, or poor defense
+
+        # Tier comes from the sets precomputed at ranking load: two O(1)
+        # probes instead of re-deriving the rank thresholds per call
+        if opponent in self._elite_defenses:
+            tier = "Elite"
+        elif opponent in self._poor_defenses:
+            tier = "Poor"
+        else:
+            tier = "Average"
+
         if stat_type in ['pass_yds', 'passing_yards', 'pass_tds', 'passing_tds']:
-            # Passing defense
-            stat_value = defense['pass_yds_allowed']
-            
-            # Lower yards allowed = better defense = tougher matchup
-            # Top 10 teams (elite defense)
-            if rank <= 10:
-                adjustment = 0.85  # -15% for elite pass defense
-                tier = "Elite"
-            # Bottom 10 teams (poor defense)
-            elif rank >= total_teams - 9:
-                adjustment = 1.15  # +15% for poor pass defense
-                tier = "Poor"
-            # Middle teams
-            else:
-                adjustment = 1.0  # No adjustment
-                tier = "Average"
-            
+            # Elite pass defense -15%, poor +15%
+            adjustment = 0.85 if tier == "Elite" else 1.15 if tier == "Poor" else 1.0
             print(f"  📊 {opponent} pass defense: Rank {rank}/{total_teams} ({tier}) - {adjustment}x adjustment")
-            
+
         elif stat_type in ['rush_yds', 'rushing_yards', 'rush_tds', 'rushing_tds']:
-            # Rushing defense
-            stat_value = defense['rush_yds_allowed']
-            
-            if rank <= 10:
-                adjustment = 0.85  # -15% for elite run defense
-                tier = "Elite"
-            elif rank >= total_teams - 9:
-                adjustment = 1.15  # +15% for poor run defense
-                tier = "Poor"
-            else:
-                adjustment = 1.0
-                tier = "Average"
-            
+            # Elite run defense -15%, poor +15%
+            adjustment = 0.85 if tier == "Elite" else 1.15 if tier == "Poor" else 1.0
             print(f"  📊 {opponent} run defense: Rank {rank}/{total_teams} ({tier}) - {adjustment}x adjustment")
-            
+
         elif stat_type in ['receptions', 'reception_yds', 'receiving_yards', 'rec_tds', 'receiving_tds']:
-            # Receiving uses pass defense ranking
-            stat_value = defense['pass_yds_allowed']
-            
-            if rank <= 10:
-                adjustment = 0.88  # -12% for elite pass defense (slightly less than QB)
-                tier = "Elite"
-            elif rank >= total_teams - 9:
-                adjustment = 1.12  # +12% for poor pass defense
-                tier = "Poor"
-            else:
-                adjustment = 1.0
-                tier = "Average"
-            
+            # Receiving uses pass defense ranking, slightly softer than QB props
+            adjustment = 0.88 if tier == "Elite" else 1.12 if tier == "Poor" else 1.0
             print(f"  📊 {opponent} pass defense: Rank {rank}/{total_teams} ({tier}) - {adjustment}x adjustment")
-            
+
         else:
             adjustment = 1.0
             print(f"  ⚠️  Unknown stat type: {stat_type}, no adjustment")
-        
+
         return adjustment
 
 
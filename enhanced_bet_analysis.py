@@ -3,112 +3,289 @@ Enhanced Bet Analysis Module
 Adds consistency filtering, reliability scoring, and game script adjustments
 """
 
-import statistics
+import numpy as np
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 
 
+# (spread bucket, prop kind) -> (projection delta, explanation template)
+# One table lookup replaces the 4-tier branch cascade per scored bet
+_GAMESCRIPT_TABLE = {
+    ('heavy_fav', 'rush'): (0.10, "Heavy favorite (+{spread}) → More rushing expected"),
+    ('heavy_fav', 'pass'): (-0.05, "Heavy favorite (+{spread}) → Less passing expected"),
+    ('heavy_dog', 'rush'): (-0.10, "Heavy underdog ({spread}) → Less rushing expected"),
+    ('heavy_dog', 'pass'): (0.10, "Heavy underdog ({spread}) → More passing expected"),
+    ('mod_fav', 'rush'): (0.05, "Moderate favorite (+{spread}) → Slight rushing boost"),
+    ('mod_fav', 'pass'): (-0.02, "Moderate favorite (+{spread}) → Slight passing decrease"),
+    ('mod_dog', 'rush'): (-0.05, "Moderate underdog ({spread}) → Slight rushing decrease"),
+    ('mod_dog', 'pass'): (0.05, "Moderate underdog ({spread}) → Slight passing boost"),
+}
+
+
+# Known backup RBs and their primary backs
+BACKUP_RBS = {
+    # 49ers
+    'brian robinson jr': 'christian mccaffrey',
+    'jordan mason': 'christian mccaffrey',
+
+    # Cowboys
+    'rico dowdle': 'tony pollard',
+
+    # Eagles
+    'kenny gainwell': "d'andre swift",
+
+    # Chiefs
+    'clyde edwards-helaire': 'isiah pacheco',
+
+    # Bengals
+    'chase brown': 'joe mixon',
+
+    # Add more as needed
+}
+
+# Committee backfields (multiple RBs share carries)
+COMMITTEE_BACKFIELDS = {
+    'rams': ['kyren williams', 'royce freeman'],
+    'patriots': ['rhamondre stevenson', 'ezekiel elliott'],
+    'browns': ['jerome ford', 'kareem hunt'],
+}
+
+# Backup/Low-usage TEs
+BACKUP_TES = frozenset({
+    'aj barner',  # backup to noah fant
+    'foster moreau',
+    'johnny mundt',
+    'davis allen',
+    'john bates',
+    'tommy tremble',
+    'charlie kolar',
+    'harrison bryant',
+})
+
+# Flattened committee membership: one O(1) probe instead of scanning
+# every team's list per bet
+_COMMITTEE_MEMBERS = frozenset(
+    player for players in COMMITTEE_BACKFIELDS.values() for player in players
+)
+
+# Risk level -> leg predicate over (reliability score, role label)
+# Resolved once per filtering call, so the per-leg work is one lambda
+# instead of re-branching on the risk string for every bet
+_RISK_PREDICATES = {
+    'conservative': lambda reliability, role: reliability >= 70 and role == 'Starter',
+    'balanced': lambda reliability, role: reliability >= 55 and role != 'Backup TE',
+    'aggressive': lambda reliability, role: True,
+}
+
+# Reliability rating ladder, indexed by tier (score >= 85, 70, 55, 40, rest)
+_RATING_LABELS = (
+    ('🔥 Elite', '#22c55e'),
+    ('✅ High', '#3b82f6'),
+    ('⚡ Medium', '#f59e0b'),
+    ('⚠️ Low', '#f97316'),
+    ('❌ Very Low', '#ef4444'),
+)
+
+
+@lru_cache(maxsize=4096)
+def _classify_player(player_name: str) -> Tuple[str, str, int]:
+    """
+    Classify a player's role in one pass
+    Returns (lowercase name, role label, role points) so reliability
+    scoring and parlay filtering share a single set of lookups instead
+    of each re-lowering the name and re-probing the role sets
+    Memoized: the role tables are fixed at import, and the same players
+    recur across parlays and scans
+    """
+    player_lower = player_name.lower()
+    if player_lower in BACKUP_RBS:
+        return player_lower, 'Backup RB', 5
+    if player_lower in BACKUP_TES:
+        return player_lower, 'Backup TE', 10
+    if player_lower in _COMMITTEE_MEMBERS:
+        return player_lower, 'Committee', 15
+    return player_lower, 'Starter', 25
+
+
+def calculate_consistency_score(recent_games: List[float], line: float) -> Dict:
+    """
+    Calculate consistency metrics for a bet
+    Returns consistency score, std dev, hit rate, and variance
+    """
+    if not recent_games or len(recent_games) < 3:
+        return {
+            'consistency_score': 0,
+            'std_dev': None,
+            'variance': None,
+            'hit_rate': 0,
+            'reliability': 'Unknown'
+        }
+
+    # NumPy's C loops replace statistics' Fraction-based accumulators
+    arr = np.asarray(recent_games, dtype=np.float64)
+    mean_val = float(arr.mean())
+    std_dev = float(arr.std(ddof=1)) if arr.size > 1 else 0.0
+
+    # Calculate coefficient of variation (std dev as % of mean)
+    cv = (std_dev / mean_val * 100) if mean_val > 0 else 999
+
+    # Hit rate (% of games that hit the over)
+    hits_over = int((arr > line).sum())
+    hit_rate = (hits_over / arr.size) * 100
+
+    # Consistency score (0-100, higher is better)
+    # Based on low variance + high hit rate
+    if cv < 15:
+        consistency_score = 90 + min(10, hit_rate - 80)
+    elif cv < 25:
+        consistency_score = 75 + min(15, (hit_rate - 70) / 2)
+    elif cv < 40:
+        consistency_score = 60 + min(15, (hit_rate - 60) / 2)
+    elif cv < 60:
+        consistency_score = 40 + min(20, (hit_rate - 50) / 2)
+    else:
+        consistency_score = max(0, 30 - (cv - 60) / 2)
+
+    # Reliability rating
+    if consistency_score >= 85:
+        reliability = 'Very High'
+    elif consistency_score >= 70:
+        reliability = 'High'
+    elif consistency_score >= 55:
+        reliability = 'Medium'
+    elif consistency_score >= 40:
+        reliability = 'Low'
+    else:
+        reliability = 'Very Low'
+
+    return {
+        'consistency_score': round(consistency_score, 1),
+        'std_dev': round(std_dev, 2),
+        'coefficient_variation': round(cv, 1),
+        'hit_rate': round(hit_rate, 1),
+        'reliability': reliability,
+        'mean': round(mean_val, 1)
+    }
+
+
 class EnhancedBetAnalyzer:
     """Enhanced analysis with consistency metrics and reliability scoring"""
-    
-    # Known backup RBs and their primary backs
-    BACKUP_RBS = {
-        # 49ers
-        'brian robinson jr': 'christian mccaffrey',
-        'jordan mason': 'christian mccaffrey',
-        
-        # Cowboys
-        'rico dowdle': 'tony pollard',
-        
-        # Eagles
-        'kenny gainwell': "d'andre swift",
-        
-        # Chiefs
-        'clyde edwards-helaire': 'isiah pacheco',
-        
-        # Bengals
-        'chase brown': 'joe mixon',
-        
-        # Add more as needed
-    }
-    
-    # Committee backfields (multiple RBs share carries)
-    COMMITTEE_BACKFIELDS = {
-        'rams': ['kyren williams', 'royce freeman'],
-        'patriots': ['rhamondre stevenson', 'ezekiel elliott'],
-        'browns': ['jerome ford', 'kareem hunt'],
-    }
-    
-    # Backup/Low-usage TEs
-    BACKUP_TES = {
-        'aj barner',  # backup to noah fant
-        'foster moreau',
-        'johnny mundt',
-        'davis allen',
-        'john bates',
-        'tommy tremble',
-        'charlie kolar',
-        'harrison bryant',
-    }
-    
+
+    # Role tables live at module level now; class aliases keep the old
+    # EnhancedBetAnalyzer.BACKUP_RBS-style access working
+    BACKUP_RBS = BACKUP_RBS
+    COMMITTEE_BACKFIELDS = COMMITTEE_BACKFIELDS
+    BACKUP_TES = BACKUP_TES
+    _COMMITTEE_MEMBERS = _COMMITTEE_MEMBERS
+
+    # Hot scorers are module-level free functions (plain function calls in
+    # the scan loops, no class attribute dispatch); these shims keep the
+    # class API
+    _classify_player = staticmethod(_classify_player)
+    calculate_consistency_score = staticmethod(calculate_consistency_score)
+
+    @staticmethod
+    def calculate_consistency_scores_batch(games_matrix: 'np.ndarray',
+                                           lines: 'np.ndarray') -> 'np.ndarray':
+        """
+        Consistency scores for a whole portfolio of bets at once
+
+        games_matrix is a (bets x games) float array, NaN-padded where a
+        row has fewer games; lines holds the per-row prop line. The 5-way
+        CV ladder from calculate_consistency_score runs branchless via
+        np.select, so one call scores every row. Rows with fewer than 3
+        games score 0, matching the scalar path.
+        """
+        games_matrix = np.asarray(games_matrix, dtype=np.float64)
+        lines = np.asarray(lines, dtype=np.float64)
+
+        counts = np.sum(~np.isnan(games_matrix), axis=1)
+
+        # Short rows produce NaN means/stds; they're masked out at the end
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.nanmean(games_matrix, axis=1)
+            stds = np.nanstd(games_matrix, axis=1, ddof=1)
+            cv = np.where(means > 0, stds / means * 100, 999.0)
+
+            # NaN > line is False, so padding never counts as a hit
+            hits = (games_matrix > lines[:, None]).sum(axis=1)
+            hit_rate = hits / np.maximum(counts, 1) * 100
+
+            scores = np.select(
+                [cv < 15, cv < 25, cv < 40, cv < 60],
+                [90 + np.minimum(10, hit_rate - 80),
+                 75 + np.minimum(15, (hit_rate - 70) / 2),
+                 60 + np.minimum(15, (hit_rate - 60) / 2),
+                 40 + np.minimum(20, (hit_rate - 50) / 2)],
+                default=np.maximum(0, 30 - (cv - 60) / 2)
+            )
+
+        return np.where(counts >= 3, scores, 0.0)
+
     @staticmethod
-    def calculate_consistency_score(recent_games: List[float], line: float) -> Dict:
+    def score_portfolio(bets: List[Dict]) -> List[Dict]:
         """
-        Calculate consistency metrics for a bet
-        Returns consistency score, std dev, hit rate, and variance
+        Vectorized reliability scoring for a whole list of candidate bets
+
+        Each bet dict needs 'player', 'games', 'line', and 'edge_percent'.
+        Consistency, edge, and sample components all run as array kernels,
+        so scoring hundreds of candidates costs a handful of NumPy calls
+        instead of the full per-bet pipeline in a Python loop. Returns one
+        {'reliability_score', 'rating', 'color'} dict per input bet with
+        the same totals as calculate_reliability_score.
         """
-        if not recent_games or len(recent_games) < 3:
-            return {
-                'consistency_score': 0,
-                'std_dev': None,
-                'variance': None,
-                'hit_rate': 0,
-                'reliability': 'Unknown'
+        if not bets:
+            return []
+
+        width = max((len(b.get('games') or []) for b in bets), default=0)
+        matrix = np.full((len(bets), max(width, 1)), np.nan)
+        lines = np.zeros(len(bets))
+        edges = np.zeros(len(bets))
+        role_points = np.zeros(len(bets))
+
+        for i, bet in enumerate(bets):
+            games = bet.get('games') or []
+            matrix[i, :len(games)] = games
+            lines[i] = bet.get('line') or 0
+            edges[i] = bet.get('edge_percent') or 0
+            role_points[i] = _classify_player(bet.get('player', ''))[2]
+
+        counts = np.sum(~np.isnan(matrix), axis=1)
+
+        # Round to 1 decimal before weighting, like the scalar path does
+        consistency_points = np.round(
+            EnhancedBetAnalyzer.calculate_consistency_scores_batch(matrix, lines), 1
+        ) * 0.4
+
+        edge_points = np.select(
+            [edges >= 50, edges >= 30, edges >= 15, edges >= 8, edges >= 5, edges >= 3],
+            [20, 18, 15, 12, 8, 5],
+            default=2
+        )
+
+        sample_points = np.select(
+            [counts >= 7, counts >= 5, counts >= 3],
+            [15, 12, 8],
+            default=3
+        )
+
+        scores = consistency_points + role_points + edge_points + sample_points
+
+        tier_idx = np.select(
+            [scores >= 85, scores >= 70, scores >= 55, scores >= 40],
+            [0, 1, 2, 3],
+            default=4
+        )
+
+        return [
+            {
+                'reliability_score': round(float(score), 1),
+                'rating': _RATING_LABELS[idx][0],
+                'color': _RATING_LABELS[idx][1],
             }
-        
-        mean_val = statistics.mean(recent_games)
-        std_dev = statistics.stdev(recent_games) if len(recent_games) > 1 else 0
-        
-        # Calculate coefficient of variation (std dev as % of mean)
-        cv = (std_dev / mean_val * 100) if mean_val > 0 else 999
-        
-        # Hit rate (% of games that hit the over)
-        hits_over = sum(1 for g in recent_games if g > line)
-        hit_rate = (hits_over / len(recent_games)) * 100
-        
-        # Consistency score (0-100, higher is better)
-        # Based on low variance + high hit rate
-        if cv < 15:
-            consistency_score = 90 + min(10, hit_rate - 80)
-        elif cv < 25:
-            consistency_score = 75 + min(15, (hit_rate - 70) / 2)
-        elif cv < 40:
-            consistency_score = 60 + min(15, (hit_rate - 60) / 2)
-        elif cv < 60:
-            consistency_score = 40 + min(20, (hit_rate - 50) / 2)
-        else:
-            consistency_score = max(0, 30 - (cv - 60) / 2)
-        
-        # Reliability rating
-        if consistency_score >= 85:
-            reliability = 'Very High'
-        elif consistency_score >= 70:
-            reliability = 'High'
-        elif consistency_score >= 55:
-            reliability = 'Medium'
-        elif consistency_score >= 40:
-            reliability = 'Low'
-        else:
-            reliability = 'Very Low'
-        
-        return {
-            'consistency_score': round(consistency_score, 1),
-            'std_dev': round(std_dev, 2),
-            'coefficient_variation': round(cv, 1),
-            'hit_rate': round(hit_rate, 1),
-            'reliability': reliability,
-            'mean': round(mean_val, 1)
-        }
-    
+            for score, idx in zip(scores, tier_idx)
+        ]
+
     @staticmethod
     def calculate_reliability_score(
         player_name: str,
@@ -121,32 +298,19 @@ class EnhancedBetAnalyzer:
         Calculate comprehensive reliability score (0-100)
         Factors: consistency, player role, edge quality, sample size
         """
-        player_lower = player_name.lower()
         score = 0
         factors = []
-        
+
         # Base score from consistency (0-40 points)
-        consistency = EnhancedBetAnalyzer.calculate_consistency_score(recent_games, line)
+        consistency = calculate_consistency_score(recent_games, line)
         consistency_points = consistency['consistency_score'] * 0.4
         score += consistency_points
         factors.append(f"Consistency: {consistency_points:.1f}/40")
-        
-        # Player role (0-25 points)
-        role_points = 25  # Start at max
-        
-        # Penalize backups
-        if player_lower in EnhancedBetAnalyzer.BACKUP_RBS:
-            role_points = 5
-            factors.append(f"Role: 5/25 (Backup RB)")
-        elif player_lower in EnhancedBetAnalyzer.BACKUP_TES:
-            role_points = 10
-            factors.append(f"Role: 10/25 (Backup TE)")
-        elif any(player_lower in committee for committee in EnhancedBetAnalyzer.COMMITTEE_BACKFIELDS.values()):
-            role_points = 15
-            factors.append(f"Role: 15/25 (Committee)")
-        else:
-            factors.append(f"Role: 25/25 (Starter)")
-        
+
+        # Player role (0-25 points): backups and committee backs score low
+        _, role, role_points = _classify_player(player_name)
+        factors.append(f"Role: {role_points}/25 ({role})")
+
         score += role_points
         
         # Edge quality (0-20 points)
@@ -218,47 +382,30 @@ class EnhancedBetAnalyzer:
         team_spread: positive if favored, negative if underdog
         Returns: (adjusted_projection, explanation)
         """
-        adjustment = 0
-        explanation = ""
-        
-        # Heavy favorite (7+ point favorites)
+        # Bucket the spread, classify the prop, then one table lookup
         if team_spread >= 7:
-            if 'rush' in prop_type:
-                adjustment = 0.10  # 10% boost to rushing
-                explanation = f"Heavy favorite (+{team_spread}) → More rushing expected"
-            elif 'pass' in prop_type or 'reception' in prop_type:
-                adjustment = -0.05  # 5% decrease to passing
-                explanation = f"Heavy favorite (+{team_spread}) → Less passing expected"
-        
-        # Heavy underdog (7+ point underdogs)
+            bucket = 'heavy_fav'
         elif team_spread <= -7:
-            if 'rush' in prop_type:
-                adjustment = -0.10  # 10% decrease to rushing
-                explanation = f"Heavy underdog ({team_spread}) → Less rushing expected"
-            elif 'pass' in prop_type or 'reception' in prop_type:
-                adjustment = 0.10  # 10% boost to passing
-                explanation = f"Heavy underdog ({team_spread}) → More passing expected"
-        
-        # Moderate favorite (3-6 points)
+            bucket = 'heavy_dog'
         elif team_spread >= 3:
-            if 'rush' in prop_type:
-                adjustment = 0.05
-                explanation = f"Moderate favorite (+{team_spread}) → Slight rushing boost"
-            elif 'pass' in prop_type or 'reception' in prop_type:
-                adjustment = -0.02
-                explanation = f"Moderate favorite (+{team_spread}) → Slight passing decrease"
-        
-        # Moderate underdog (3-6 points)
+            bucket = 'mod_fav'
         elif team_spread <= -3:
-            if 'rush' in prop_type:
-                adjustment = -0.05
-                explanation = f"Moderate underdog ({team_spread}) → Slight rushing decrease"
-            elif 'pass' in prop_type or 'reception' in prop_type:
-                adjustment = 0.05
-                explanation = f"Moderate underdog ({team_spread}) → Slight passing boost"
-        
+            bucket = 'mod_dog'
+        else:
+            bucket = None  # Near pick'em: no game-script lean
+
+        if 'rush' in prop_type:
+            prop_kind = 'rush'
+        elif 'pass' in prop_type or 'reception' in prop_type:
+            prop_kind = 'pass'
+        else:
+            prop_kind = None
+
+        adjustment, template = _GAMESCRIPT_TABLE.get((bucket, prop_kind), (0, ""))
+        explanation = template.format(spread=team_spread) if template else ""
+
         adjusted = projection * (1 + adjustment)
-        
+
         return adjusted, explanation
     
     @staticmethod
@@ -268,34 +415,36 @@ class EnhancedBetAnalyzer:
         Returns list of correlation warnings
         """
         warnings = []
-        
-        # Group by game
+
+        # One pass buckets every leg by game, player, and prop kind - the
+        # old version walked the bets three times plus a nested pair scan
         games = {}
+        player_legs = {}
+        pass_td_legs = []
+        reception_legs = []
+
         for i, bet in enumerate(bets):
-            game_key = bet.get('game', 'Unknown')
-            if game_key not in games:
-                games[game_key] = []
-            games[game_key].append((i, bet))
-        
+            games.setdefault(bet.get('game', 'Unknown'), []).append(i)
+            player_legs.setdefault(bet.get('player', ''), []).append(i)
+
+            prop_type = bet.get('prop_type', '')
+            if 'pass_tds' in prop_type:
+                pass_td_legs.append(i)
+            if 'reception' in prop_type:
+                reception_legs.append(i)
+
         # Check for same-game concentration
-        for game, game_bets in games.items():
-            if len(game_bets) >= 3:
+        for game, legs in games.items():
+            if len(legs) >= 3:
                 warnings.append({
                     'type': 'same_game_concentration',
                     'severity': 'high',
-                    'message': f"⚠️ {len(game_bets)} legs from same game ({game}). If game script goes wrong, multiple legs fail.",
-                    'legs': [i for i, _ in game_bets]
+                    'message': f"⚠️ {len(legs)} legs from same game ({game}). If game script goes wrong, multiple legs fail.",
+                    'legs': legs
                 })
-        
+
         # Check for same player multiple props
-        player_counts = {}
-        for i, bet in enumerate(bets):
-            player = bet.get('player', '')
-            if player not in player_counts:
-                player_counts[player] = []
-            player_counts[player].append(i)
-        
-        for player, legs in player_counts.items():
+        for player, legs in player_legs.items():
             if len(legs) >= 2:
                 warnings.append({
                     'type': 'same_player',
@@ -303,55 +452,34 @@ class EnhancedBetAnalyzer:
                     'message': f"💡 {len(legs)} bets on {player}. Correlated - good if player has big game, bad if they don't.",
                     'legs': legs
                 })
-        
-        # Check for passing TD + receiving yard correlation
-        for i, bet1 in enumerate(bets):
-            if 'pass_tds' in bet1.get('prop_type', ''):
-                for j, bet2 in enumerate(bets):
-                    if i != j and 'reception' in bet2.get('prop_type', ''):
-                        warnings.append({
-                            'type': 'qb_receiver_correlation',
-                            'severity': 'low',
-                            'message': f"✅ Positive correlation: QB TDs + Receiver yards from same team tend to hit together.",
-                            'legs': [i, j]
-                        })
-        
+
+        # Check for passing TD + receiving yard correlation: the pairs come
+        # straight from the prop-kind buckets instead of an O(N²) rescan
+        for i in pass_td_legs:
+            for j in reception_legs:
+                if i != j:
+                    warnings.append({
+                        'type': 'qb_receiver_correlation',
+                        'severity': 'low',
+                        'message': f"✅ Positive correlation: QB TDs + Receiver yards from same team tend to hit together.",
+                        'legs': [i, j]
+                    })
+
         return warnings
     
     @staticmethod
     def filter_parlay_legs(bets: List[Dict], risk_level: str = 'conservative') -> List[Dict]:
         """
         Filter parlay legs based on risk level
+
+        Conservative keeps reliable starters only; balanced drops backup
+        TEs and low-reliability legs; aggressive (and any unknown level)
+        allows everything
         """
-        filtered = []
-        
-        for bet in bets:
-            reliability = bet.get('reliability_score', 50)
-            player_lower = bet.get('player', '').lower()
-            
-            if risk_level == 'conservative':
-                # Only very reliable bets
-                if reliability < 70:
-                    continue
-                # No backups
-                if player_lower in EnhancedBetAnalyzer.BACKUP_RBS:
-                    continue
-                if player_lower in EnhancedBetAnalyzer.BACKUP_TES:
-                    continue
-                # No committee backs
-                if any(player_lower in committee for committee in EnhancedBetAnalyzer.COMMITTEE_BACKFIELDS.values()):
-                    continue
-                
-            elif risk_level == 'balanced':
-                # Medium-high reliability
-                if reliability < 55:
-                    continue
-                # No backup TEs (but backup RBs ok if reliability is high)
-                if player_lower in EnhancedBetAnalyzer.BACKUP_TES:
-                    continue
-            
-            # Aggressive allows everything
-            
-            filtered.append(bet)
-        
-        return filtered
+        predicate = _RISK_PREDICATES.get(risk_level, _RISK_PREDICATES['aggressive'])
+
+        return [
+            bet for bet in bets
+            if predicate(bet.get('reliability_score', 50),
+                         _classify_player(bet.get('player', ''))[1])
+        ]
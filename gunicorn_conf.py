@@ -0,0 +1,33 @@
+"""
+Gunicorn config for the Automated Bet Finder API
+
+Run with:
+    gunicorn -c gunicorn_conf.py api_server:app
+
+preload_app imports api_server once in the master process, so the finder
+and scraper singletons (plus their in-memory caches and lookup tables)
+are built a single time and shared copy-on-write across workers instead
+of being rebuilt per worker. Anything holding a socket or file handle
+can't be shared across the fork, so post_fork reopens those per worker.
+"""
+
+workers = 4
+bind = '0.0.0.0:5002'
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Reopen per-worker resources that must not survive the fork"""
+    from api_server import finder
+    from stats_cache import SQLiteHTTPCache, SQLiteStatsCache
+
+    # Fresh HTTP connection pool - pooled keep-alive sockets would be
+    # shared (and corrupted) between workers otherwise
+    finder.odds_scraper.session = finder.odds_scraper._build_session()
+
+    # Fresh SQLite handles for the persistent caches
+    finder.stats_scraper.stats_db = SQLiteStatsCache()
+    finder.stats_scraper.http_cache = SQLiteHTTPCache()
+
+    # Fresh handle for the finder's own props/bets database
+    finder.reconnect()
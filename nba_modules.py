@@ -4,10 +4,55 @@ Works alongside your existing NFL bet finder
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import asyncio
+import math
 import time
-import statistics
-from typing import List, Dict, Optional
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+
+from pfr_stats_scraper import HostRateLimiter
+
+# aiohttp lets us fire all event/market prop requests concurrently
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    print("⚠️  aiohttp not available - NBA props will fetch sequentially")
+    AIOHTTP_AVAILABLE = False
+
+# numba fuses the batch edge math into one compiled pass when available
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _edge_kernel(matrix, lines, odds, counts):
+        """Hit rates and implied probabilities in one pass over the matrix"""
+        n, g = matrix.shape
+        hit_over = np.empty(n)
+        implied = np.empty(n)
+
+        for i in range(n):
+            hits = 0
+            for j in range(g):
+                # NaN padding compares False, so it never counts as a hit
+                if matrix[i, j] > lines[i]:
+                    hits += 1
+            hit_over[i] = hits / (counts[i] if counts[i] > 0 else 1)
+
+            o = odds[i]
+            implied[i] = -o / (-o + 100.0) if o < 0 else 100.0 / (o + 100.0)
+
+        return hit_over, implied
 
 # ============================================================================
 # NBA STATS SCRAPER - Basketball Reference
@@ -19,83 +64,214 @@ class NBAStatsScraper:
     def __init__(self):
         self.base_url = "https://www.basketball-reference.com"
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # Brotli cuts Basketball Reference page weight roughly in half
+            'Accept-Encoding': 'gzip, deflate, br',
         }
-    
+
+        # Pooled session: each player lookup makes two back-to-back requests
+        # to basketball-reference.com, so keep-alive halves the TLS cost
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+
+        # Per-host limiter: each request waits only the unexpired remainder
+        # of the 1.5s spacing instead of a fixed sleep after every call
+        self._rate_limiter = HostRateLimiter(min_interval=1.5)
+
+        # name -> player_id and player_id -> parsed gamelog rows, so
+        # multi-stat callers pay one fetch+parse per player
+        self.player_cache = {}
+        self._gamelog_cache = {}
+
+    def _get(self, url: str) -> requests.Response:
+        """All Basketball Reference traffic claims a rate-limiter slot"""
+        host = 'www.basketball-reference.com'
+        self._rate_limiter.wait(host)
+        response = self.session.get(url, timeout=10)
+        self._rate_limiter.record(host, response)
+        return response
+
+    def get_many_recent_games(self, pairs: List[Tuple[str, str]],
+                              num_games: int = 7,
+                              max_workers: int = 3) -> Dict[Tuple[str, str], List[float]]:
+        """
+        Fetch game histories for several (player_name, stat_type) pairs in parallel
+
+        Each pair needs two sequential round-trips, so serial batch scans
+        spend seconds per player just waiting. A small thread pool overlaps
+        the fetches while the per-host rate limiter keeps the combined
+        request stream politely spaced.
+
+        Returns:
+            Dict mapping each (player_name, stat_type) pair to its game history
+        """
+        unique_pairs = list(dict.fromkeys(pairs))
+
+        if not unique_pairs:
+            return {}
+
+        def fetch(pair):
+            player_name, stat_type = pair
+            return pair, self.get_player_recent_games(player_name, stat_type, num_games)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for pair, games in executor.map(fetch, unique_pairs):
+                results[pair] = games
+
+        return results
+
+    def _find_player_id(self, player_name: str) -> Optional[str]:
+        """Resolve a player's Basketball Reference ID (cached per name)"""
+        name_key = player_name.strip().lower()
+        if name_key in self.player_cache:
+            return self.player_cache[name_key]
+
+        search_url = f"{self.base_url}/search/search.fcgi?search={player_name.replace(' ', '+')}"
+        response = self._get(search_url)
+
+        if response.status_code != 200:
+            return None
+
+        # lxml parses Basketball Reference's pages several times faster
+        # than the pure-Python html.parser
+        soup = BeautifulSoup(response.content, 'lxml')
+        search_results = soup.find('div', {'class': 'search-item-name'})
+        if not search_results:
+            return None
+
+        player_link = search_results.find('a')
+        if not player_link:
+            return None
+
+        player_id = player_link['href'].split('/')[-1].replace('.html', '')
+        self.player_cache[name_key] = player_id
+        return player_id
+
+    def _fetch_gamelog_rows(self, player_id: str) -> List[Dict[str, str]]:
+        """
+        Fetch and parse a player's gamelog once, returning per-row cell dicts
+
+        The page carries every stat column, so the rows are cached by
+        player ID: asking for points, rebounds, and assists costs one
+        fetch and one parse instead of three
+        """
+        if player_id in self._gamelog_cache:
+            return self._gamelog_cache[player_id]
+
+        gamelog_url = f"{self.base_url}/players/{player_id[0]}/{player_id}/gamelog/2025"
+        response = self._get(gamelog_url)
+
+        soup = BeautifulSoup(response.content, 'lxml')
+        gamelog_table = soup.find('table', {'id': 'pgl_basic'})
+
+        rows = []
+        if gamelog_table:
+            # CSS selector runs in soupsieve's compiled matcher; the old
+            # lambda class filter called back into Python for every <tr>
+            for row in gamelog_table.select('tbody tr:not(.thead)'):
+                # One pass over the row's cells instead of a find() per field
+                rows.append({cell.get('data-stat'): cell.get_text(strip=True)
+                             for cell in row.find_all(['th', 'td'])})
+
+        self._gamelog_cache[player_id] = rows
+        return rows
+
+    # Map stat types to table columns
+    STAT_MAPPING = {
+        'points': 'pts',
+        'rebounds': 'trb',
+        'assists': 'ast',
+        'threes': 'fg3',
+        'steals': 'stl',
+        'blocks': 'blk'
+    }
+
+    @classmethod
+    def _slice_stat(cls, rows: List[Dict[str, str]], stat_type: str,
+                    num_games: int) -> List[float]:
+        """Pull one stat's recent values out of already-parsed gamelog rows"""
+        stat_col = cls.STAT_MAPPING.get(stat_type, stat_type)
+
+        recent_stats = []
+        for cells in reversed(rows):
+            if len(recent_stats) >= num_games:
+                break
+
+            if 'ranker' not in cells:
+                continue  # Not a game row
+
+            value = cells.get(stat_col, '')
+            if value:
+                try:
+                    recent_stats.append(float(value))
+                except ValueError:
+                    continue
+
+        return recent_stats
+
     def get_player_recent_games(self, player_name: str, stat_type: str, num_games: int = 7) -> List[float]:
         """Get recent game stats for a player"""
         try:
-            # Search for player
-            search_url = f"{self.base_url}/search/search.fcgi?search={player_name.replace(' ', '+')}"
-            response = requests.get(search_url, headers=self.headers)
-            time.sleep(1)
-            
-            if response.status_code != 200:
-                return []
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            search_results = soup.find('div', {'class': 'search-item-name'})
-            if not search_results:
+            player_id = self._find_player_id(player_name)
+            if not player_id:
                 return []
-            
-            player_link = search_results.find('a')
-            if not player_link:
-                return []
-            
-            # Get player ID and construct gamelog URL
-            player_id = player_link['href'].split('/')[-1].replace('.html', '')
-            gamelog_url = f"{self.base_url}/players/{player_id[0]}/{player_id}/gamelog/2025"
-            
-            response = requests.get(gamelog_url, headers=self.headers)
-            time.sleep(1)
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            gamelog_table = soup.find('table', {'id': 'pgl_basic'})
-            
-            if not gamelog_table:
+
+            rows = self._fetch_gamelog_rows(player_id)
+            if not rows:
                 return []
-            
-            # Map stat types to table columns
-            stat_mapping = {
-                'points': 'pts',
-                'rebounds': 'trb',
-                'assists': 'ast',
-                'threes': 'fg3',
-                'steals': 'stl',
-                'blocks': 'blk'
-            }
-            
-            stat_col = stat_mapping.get(stat_type, stat_type)
-            
-            rows = gamelog_table.find('tbody').find_all('tr', {'class': lambda x: x != 'thead'})
-            
-            recent_stats = []
-            count = 0
-            for row in reversed(rows):
-                if count >= num_games:
-                    break
-                
-                if row.find('th', {'data-stat': 'ranker'}):
-                    stat_cell = row.find('td', {'data-stat': stat_col})
-                    if stat_cell and stat_cell.text.strip():
-                        try:
-                            recent_stats.append(float(stat_cell.text.strip()))
-                            count += 1
-                        except ValueError:
-                            continue
-            
-            return recent_stats
-            
+
+            return self._slice_stat(rows, stat_type, num_games)
+
         except Exception as e:
             print(f"Error scraping NBA stats for {player_name}: {e}")
             return []
+
+    def get_player_recent_games_multi(self, player_name: str, stat_types: List[str],
+                                      num_games: int = 7) -> Dict[str, List[float]]:
+        """
+        Recent games for several stat types from one fetch and parse
+
+        The gamelog page carries every column, so slicing six stat types
+        here costs the same two requests as asking for one
+
+        Returns:
+            Dict mapping each stat type to its game history
+        """
+        results = {stat_type: [] for stat_type in stat_types}
+
+        try:
+            player_id = self._find_player_id(player_name)
+            if not player_id:
+                return results
+
+            rows = self._fetch_gamelog_rows(player_id)
+            if not rows:
+                return results
+
+            for stat_type in stat_types:
+                results[stat_type] = self._slice_stat(rows, stat_type, num_games)
+
+        except Exception as e:
+            print(f"Error scraping NBA stats for {player_name}: {e}")
+
+        return results
     
     def get_season_average(self, player_name: str, stat_type: str) -> Optional[float]:
         """Get season average for a stat"""
         try:
             recent_games = self.get_player_recent_games(player_name, stat_type, num_games=20)
             if recent_games:
-                return statistics.mean(recent_games)
+                return math.fsum(recent_games) / len(recent_games)
             return None
         except:
             return None
@@ -105,21 +281,61 @@ class NBAStatsScraper:
 # NBA ODDS SCRAPER
 # ============================================================================
 
+@dataclass(slots=True)
+class EventProps:
+    """One event's prop markets; slotted so a full slate scan stays lean"""
+    event_name: str
+    home_team: str
+    away_team: str
+    commence_time: str
+    props: Dict
+
+    def to_dict(self) -> Dict:
+        """Plain dict for JSON boundaries"""
+        return {
+            'event_name': self.event_name,
+            'home_team': self.home_team,
+            'away_team': self.away_team,
+            'commence_time': self.commence_time,
+            'props': self.props,
+        }
+
+
 class NBAOddsScraper:
     """Fetch NBA player props from The Odds API"""
-    
+
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.the-odds-api.com/v4"
         self.sport = "basketball_nba"
-    
+
+        # Pooled session: keep-alive reuses one TLS connection across all
+        # odds calls, and Retry backs off automatically on 429/5xx
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+
+        # Paces the serial fallback at ~10 req/s: each call waits out only
+        # the unexpired remainder instead of a flat 0.5s sleep per market
+        self._rate_limiter = HostRateLimiter(min_interval=0.1)
+
+        # Best-line index memo, keyed by the props payload's id()
+        self._best_lines_memo = None
+
     def get_all_events(self) -> List[Dict]:
         """Get all upcoming NBA games"""
         endpoint = f"{self.base_url}/sports/{self.sport}/events"
         params = {'apiKey': self.api_key}
-        
+
         try:
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = self.session.get(endpoint, params=params, timeout=10)
             response.raise_for_status()
             events = response.json()
             print(f"✅ Found {len(events)} upcoming NBA games")
@@ -144,33 +360,103 @@ class NBAOddsScraper:
             'player_steals'
         ]
         
+        events = events[:5]  # Limit to save API calls
+
+        # Fire all event × market requests concurrently when aiohttp is available
+        if AIOHTTP_AVAILABLE:
+            return asyncio.run(self._get_all_player_props_async(events, markets))
+
         all_props = {}
-        
-        for event in events[:5]:  # Limit to save API calls
+
+        # Fallback: fetch props for each event sequentially
+        for event in events:
             event_id = event['id']
             event_name = f"{event['home_team']} vs {event['away_team']}"
             print(f"\n🏀 Fetching props for: {event_name}")
-            
+
             event_props = {}
-            
+
             for market in markets:
                 props = self._fetch_event_market(event_id, market)
                 if props:
                     event_props[market] = props
                     player_count = self._count_players_in_market(props)
                     print(f"  ✓ {market}: {player_count} players")
-                time.sleep(0.5)
-            
-            all_props[event_id] = {
-                'event_name': event_name,
-                'home_team': event['home_team'],
-                'away_team': event['away_team'],
-                'commence_time': event['commence_time'],
-                'props': event_props
-            }
-        
+
+            all_props[event_id] = EventProps(
+                event_name=event_name,
+                home_team=event['home_team'],
+                away_team=event['away_team'],
+                commence_time=event['commence_time'],
+                props=event_props
+            )
+
         return all_props
-    
+
+    async def _get_all_player_props_async(self, events: List[Dict],
+                                          markets: List[str]) -> Dict:
+        """
+        Fetch every event × market combination concurrently
+        Concurrency is capped with a semaphore instead of per-call sleeps
+        """
+        semaphore = asyncio.Semaphore(5)  # Respect The Odds API rate limits
+
+        async with aiohttp.ClientSession() as session:
+            tasks = [
+                self._fetch_event_market_async(session, semaphore, event['id'], market)
+                for event in events
+                for market in markets
+            ]
+            results = await asyncio.gather(*tasks)
+
+        all_props = {}
+        result_iter = iter(results)
+
+        for event in events:
+            event_id = event['id']
+            event_name = f"{event['home_team']} vs {event['away_team']}"
+            print(f"\n🏀 Fetching props for: {event_name}")
+
+            event_props = {}
+            for market in markets:
+                props = next(result_iter)
+                if props:
+                    event_props[market] = props
+                    player_count = self._count_players_in_market(props)
+                    print(f"  ✓ {market}: {player_count} players")
+
+            all_props[event_id] = EventProps(
+                event_name=event_name,
+                home_team=event['home_team'],
+                away_team=event['away_team'],
+                commence_time=event['commence_time'],
+                props=event_props
+            )
+
+        return all_props
+
+    async def _fetch_event_market_async(self, session, semaphore,
+                                        event_id: str, market: str) -> Optional[Dict]:
+        """Async version of _fetch_event_market (shares one HTTP session)"""
+        endpoint = f"{self.base_url}/sports/{self.sport}/events/{event_id}/odds"
+
+        params = {
+            'apiKey': self.api_key,
+            'regions': 'us',
+            'markets': market,
+            'oddsFormat': 'american'
+        }
+
+        async with semaphore:
+            try:
+                async with session.get(endpoint, params=params,
+                                       timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    response.raise_for_status()
+                    return await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"  ⚠️  Failed to fetch {market}: {str(e)[:100]}")
+                return None
+
     def _fetch_event_market(self, event_id: str, market: str) -> Optional[Dict]:
         """Fetch specific market for an event"""
         endpoint = f"{self.base_url}/sports/{self.sport}/events/{event_id}/odds"
@@ -181,9 +467,13 @@ class NBAOddsScraper:
             'markets': market,
             'oddsFormat': 'american'
         }
-        
+
+        host = 'api.the-odds-api.com'
+        self._rate_limiter.wait(host)
+
         try:
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = self.session.get(endpoint, params=params, timeout=10)
+            self._rate_limiter.record(host, response)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -192,52 +482,66 @@ class NBAOddsScraper:
     
     def _count_players_in_market(self, props_data: Dict) -> int:
         """Count unique players in market"""
-        if not props_data or 'bookmakers' not in props_data:
+        bookmakers = props_data.get('bookmakers') if props_data else None
+        if not bookmakers:
             return 0
-        
-        players = set()
+
+        # Single comprehension keeps the triple loop in C-level bytecode
+        return len({outcome.get('description', '')
+                    for bookmaker in bookmakers
+                    for market in bookmaker.get('markets', ())
+                    for outcome in market.get('outcomes', ())})
+    
+    def best_lines_by_player(self, props_data: Dict) -> Dict[str, Dict]:
+        """
+        Index the best over/under line for every player in one pass
+
+        The index is memoized per props payload, so asking for a dozen
+        players from the same market costs one bookmaker scan instead of
+        one scan per player
+        """
+        # The memo tuple keeps a strong reference to the keyed payload -
+        # an id() check against a dead object's reused address would
+        # otherwise serve another slate's index
+        if self._best_lines_memo and self._best_lines_memo[0] is props_data:
+            return self._best_lines_memo[1]
+
+        index = {}
+
         for bookmaker in props_data.get('bookmakers', []):
+            book_key = bookmaker.get('key', '')
             for market in bookmaker.get('markets', []):
                 for outcome in market.get('outcomes', []):
-                    players.add(outcome.get('description', ''))
-        
-        return len(players)
-    
+                    name = outcome.get('name')
+                    if name == 'Over':
+                        side = 'over'
+                    elif name == 'Under':
+                        side = 'under'
+                    else:
+                        continue
+
+                    bucket = index.setdefault(outcome.get('description', ''),
+                                              {'over': None, 'under': None})
+                    price = outcome.get('price')
+                    best = bucket[side]
+
+                    if not best or price > best['price']:
+                        bucket[side] = {
+                            'line': outcome.get('point'),
+                            'price': price,
+                            'bookmaker': book_key
+                        }
+
+        self._best_lines_memo = (props_data, index)
+        return index
+
     def get_best_line(self, props_data: Dict, player_name: str) -> Optional[Dict]:
         """Get best available line for a player"""
         if not props_data or 'bookmakers' not in props_data:
             return None
-        
-        best_over = None
-        best_under = None
-        
-        for bookmaker in props_data.get('bookmakers', []):
-            for market in bookmaker.get('markets', []):
-                for outcome in market.get('outcomes', []):
-                    if outcome.get('description', '') == player_name:
-                        line = outcome.get('point')
-                        price = outcome.get('price')
-                        name = outcome.get('name')
-                        
-                        if name == 'Over':
-                            if not best_over or price > best_over['price']:
-                                best_over = {
-                                    'line': line,
-                                    'price': price,
-                                    'bookmaker': bookmaker.get('key', '')
-                                }
-                        elif name == 'Under':
-                            if not best_under or price > best_under['price']:
-                                best_under = {
-                                    'line': line,
-                                    'price': price,
-                                    'bookmaker': bookmaker.get('key', '')
-                                }
-        
-        return {
-            'over': best_over,
-            'under': best_under
-        }
+
+        return self.best_lines_by_player(props_data).get(
+            player_name, {'over': None, 'under': None})
 
 
 # ============================================================================
@@ -249,25 +553,116 @@ class NBAEdgeCalculator:
     
     def __init__(self, stats_scraper: NBAStatsScraper):
         self.stats_scraper = stats_scraper
-    
-    def calculate_edge(self, player_name: str, stat_type: str, line: float, 
+
+    def calculate_edges_batch(self, jobs: List[Dict], num_games: int = 7) -> List[Optional[Dict]]:
+        """
+        Calculate edges for many props in one vectorized sweep
+
+        Each job is a dict with player/stat_type/line/odds keys. Histories
+        for the unique (player, stat_type) pairs are fetched through the
+        threaded batch fetcher, stacked into one NaN-padded matrix, and the
+        averages, hit rates, and implied probabilities come out of NumPy
+        reductions instead of a Python loop per prop. Jobs with fewer than
+        3 games of history come back as None, matching calculate_edge.
+        """
+        if not jobs:
+            return []
+
+        pairs = [(job['player'], job['stat_type']) for job in jobs]
+        histories = self.stats_scraper.get_many_recent_games(pairs, num_games)
+
+        matrix = np.full((len(jobs), num_games), np.nan)
+        counts = np.zeros(len(jobs), dtype=np.intp)
+        for i, pair in enumerate(pairs):
+            games = (histories.get(pair) or [])[:num_games]
+            matrix[i, :len(games)] = games
+            counts[i] = len(games)
+
+        lines = np.array([job['line'] for job in jobs], dtype=np.float64)
+        odds = np.array([job['odds'] for job in jobs], dtype=np.float64)
+
+        with np.errstate(invalid='ignore'):
+            avgs = np.nanmean(matrix, axis=1)
+
+        if NUMBA_AVAILABLE:
+            hit_over, implied = _edge_kernel(matrix, lines, odds, counts)
+        else:
+            # NaN padding compares False, so padded cells never count as hits
+            hit_over = (matrix > lines[:, None]).sum(axis=1) / np.maximum(counts, 1)
+            implied = np.where(odds < 0, -odds / (-odds + 100), 100 / (odds + 100))
+
+        edges = (hit_over - implied) * 100
+
+        results = []
+        for i, job in enumerate(jobs):
+            if counts[i] < 3:
+                results.append(None)
+                continue
+            results.append({
+                'player': job['player'],
+                'stat_type': job['stat_type'],
+                'line': job['line'],
+                'odds': job['odds'],
+                'recent_avg': round(float(avgs[i]), 2),
+                'hit_rate': round(float(hit_over[i]) * 100, 1),
+                'implied_prob': round(float(implied[i]) * 100, 1),
+                'edge': round(float(edges[i]), 2),
+                'recent_games': (histories.get(pairs[i]) or [])[:num_games]
+            })
+
+        return results
+
+    def calculate_edge(self, player_name: str, stat_type: str, line: float,
                        odds: int, num_games: int = 7) -> Optional[Dict]:
         """Calculate edge for a player prop"""
-        
+
         print(f"  🔍 Calculating edge for {player_name} - {stat_type} {line}")
-        
+
         # Get recent stats
         recent_stats = self.stats_scraper.get_player_recent_games(
             player_name, stat_type, num_games
         )
-        
+
+        return self._edge_from_stats(player_name, stat_type, line, odds, recent_stats)
+
+    def calculate_edges_for_player(self, player_name: str, props: List[Dict],
+                                   num_games: int = 7) -> List[Optional[Dict]]:
+        """
+        Edges for all of one player's props from a single gamelog fetch
+
+        Each prop dict carries stat_type/line/odds. Histories come from
+        get_player_recent_games_multi, so six stat types for a player
+        cost one download instead of six.
+        """
+        stat_types = list(dict.fromkeys(prop['stat_type'] for prop in props))
+        histories = self.stats_scraper.get_player_recent_games_multi(
+            player_name, stat_types, num_games)
+
+        results = []
+        for prop in props:
+            print(f"  🔍 Calculating edge for {player_name} - {prop['stat_type']} {prop['line']}")
+            results.append(self._edge_from_stats(
+                player_name, prop['stat_type'], prop['line'], prop['odds'],
+                histories.get(prop['stat_type'], [])))
+
+        return results
+
+    def _edge_from_stats(self, player_name: str, stat_type: str, line: float,
+                         odds: int, recent_stats: List[float]) -> Optional[Dict]:
+        """Shared scalar edge math for the single-prop and per-player paths"""
         if not recent_stats or len(recent_stats) < 3:
             print(f"    ❌ Not enough stats for {player_name} ({len(recent_stats) if recent_stats else 0} games found)")
             return None
         
-        # Calculate average and std dev
-        avg = statistics.mean(recent_stats)
-        std_dev = statistics.stdev(recent_stats) if len(recent_stats) > 1 else avg * 0.3
+        # Calculate average and std dev; fsum keeps float precision without
+        # the exact-rational overhead statistics.mean/stdev pay per call
+        n = len(recent_stats)
+        avg = math.fsum(recent_stats) / n
+        if n > 1:
+            variance = math.fsum((x - avg) * (x - avg) for x in recent_stats) / (n - 1)
+            std_dev = math.sqrt(variance)
+        else:
+            std_dev = avg * 0.3
         
         print(f"    📊 Recent games: {recent_stats}")
         print(f"    📊 Average: {avg:.1f}, Line: {line}")
@@ -6,27 +6,83 @@ Fetches player stats with NO API rate limits
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import asyncio
+import os
 import re
+import time
 
 app = Flask(__name__)
 CORS(app)
 
+# pandas turns one parsed game-log table into slices for all six stat types
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Game-log HTML cache: one season page serves all six stat types for a
+# player, and logs only change once per game day
+_html_cache = {}
+HTML_CACHE_TTL = 3600  # 1 hour
+
+# Safety cap for the streaming download - no sane game-log page needs more
+MAX_GAMELOG_BYTES = 512 * 1024
+
+# Parsed DataFrames, same TTL as the HTML they came from
+_df_cache = {}
+
+# Column mapping for stats
+STAT_COLUMNS = {
+    'points': 'pts',
+    'assists': 'ast',
+    'rebounds': 'trb',  # Total rebounds
+    'threes': 'fg3',     # 3-pointers made
+    'blocks': 'blk',
+    'steals': 'stl'
+}
+
+# Shared pooled session: every stats request hits basketball-reference.com,
+# so keep-alive reuses one TLS connection instead of handshaking per call
+_session = requests.Session()
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    # Brotli cuts Basketball Reference page weight roughly in half
+    'Accept-Encoding': 'gzip, deflate, br',
+})
+_session.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
 def find_player_id(player_name):
     """
     Find Basketball Reference player ID from name
     Uses search page to find player
     """
+    # Canonical key so "Luka Doncic" and "luka doncic " share a cache slot;
+    # IDs are permanent, so caching them skips the search round-trip
+    return _find_player_id_cached(player_name.strip().lower())
+
+
+@lru_cache(maxsize=2048)
+def _find_player_id_cached(player_name):
     try:
         # Basketball Reference search
         search_url = "https://www.basketball-reference.com/search/search.fcgi"
         params = {'search': player_name}
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
-        response = requests.get(search_url, params=params, headers=headers, timeout=10)
+
+        response = _session.get(search_url, params=params, timeout=10)
         
         # If direct match, we get redirected to player page
         if '/players/' in response.url:
@@ -36,7 +92,8 @@ def find_player_id(player_name):
             return player_id
         
         # If multiple matches, parse search results
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # lxml parses several times faster than the pure-Python html.parser
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Look for search results
         search_item = soup.find('div', {'class': 'search-item-name'})
@@ -55,39 +112,83 @@ def find_player_id(player_name):
         return None
 
 
-def scrape_game_log(player_id, stat_type):
+def _gamelog_cache_path(player_id):
+    # player_id looks like "d/doncilu01" - flatten the slash for a filename
+    return os.path.join('.cache', f"bbref_gamelog_{player_id.replace('/', '_')}.html")
+
+
+def _fetch_season_html(player_id):
     """
-    Scrape player's game log from Basketball Reference
-    Returns last 7 games of stats
+    Fetch a player's season game-log page, cached for an hour
+
+    Asking for points, assists, and rebounds for the same player costs
+    one download instead of three. The page is also persisted under
+    .cache/ so warm process restarts skip the download entirely
     """
+    cached = _html_cache.get(player_id)
+    if cached and time.time() - cached[0] < HTML_CACHE_TTL:
+        return cached[1]
+
+    disk_path = _gamelog_cache_path(player_id)
     try:
-        # Current season is 2025-26, labeled as 2026 on Basketball Reference
-        url = f"https://www.basketball-reference.com/players/{player_id}/gamelog/2026"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
+        if time.time() - os.path.getmtime(disk_path) < HTML_CACHE_TTL:
+            with open(disk_path, 'rb') as f:
+                html = f.read()
+            _html_cache[player_id] = (time.time(), html)
+            return html
+    except OSError:
+        pass
+
+    # Current season is 2025-26, labeled as 2026 on Basketball Reference
+    url = f"https://www.basketball-reference.com/players/{player_id}/gamelog/2026"
+
+    # Stream the page and stop reading once the game-log table's tbody
+    # closes - everything after it is footer navigation and analytics
+    # scripts, often half the page. lxml recovers fine from the cut tail.
+    buf = bytearray()
+    table_at = -1
+    with _session.get(url, stream=True, timeout=10) as response:
+        for chunk in response.iter_content(8192):
+            buf += chunk
+            if table_at < 0:
+                table_at = buf.find(b'id="pgl_basic"')
+            if table_at >= 0 and buf.find(b'</tbody>', table_at) >= 0:
+                break
+            if len(buf) > MAX_GAMELOG_BYTES:
+                break
+
+    html = bytes(buf)
+    _html_cache[player_id] = (time.time(), html)
+
+    try:
+        os.makedirs('.cache', exist_ok=True)
+        with open(disk_path, 'wb') as f:
+            f.write(html)
+    except OSError:
+        pass  # Cache is best-effort; the download already succeeded
+
+    return html
+
+
+def _parse_game_log(html, stat_type):
+    """
+    Parse last-7-games stats out of a season game-log page
+
+    Top-level and pure (HTML bytes in, plain dict out) so scrape_many
+    can ship it to worker processes
+    """
+    try:
+        # Game-log pages run ~200 KB; lxml's C parser keeps this off the
+        # profile where html.parser took ~100 ms per page
+        soup = BeautifulSoup(html, 'lxml')
+
         # Find game log table
         table = soup.find('table', {'id': 'pgl_basic'})
-        
+
         if not table:
             return None
-        
-        # Column mapping for stats
-        stat_columns = {
-            'points': 'pts',
-            'assists': 'ast',
-            'rebounds': 'trb',  # Total rebounds
-            'threes': 'fg3',     # 3-pointers made
-            'blocks': 'blk',
-            'steals': 'stl'
-        }
-        
-        col_name = stat_columns.get(stat_type)
+
+        col_name = STAT_COLUMNS.get(stat_type)
         if not col_name:
             return None
         
@@ -105,39 +206,34 @@ def scrape_game_log(player_id, stat_type):
             # Skip rows that aren't games (like headers or "Did Not Play")
             if row.get('class') and 'thead' in row.get('class'):
                 continue
-            
+
+            # One pass over the row's cells instead of a find() per field
+            cells = {td.get('data-stat'): td.get_text(strip=True)
+                     for td in row.find_all('td')}
+
             # Check if it was a real game (has stat data)
-            stat_cell = row.find('td', {'data-stat': col_name})
-            if not stat_cell or not stat_cell.text.strip():
+            stat_text = cells.get(col_name, '')
+            if not stat_text:
                 continue
-            
+
             # Get stat value
             try:
-                stat_value = float(stat_cell.text.strip())
-                games.append(stat_value)
-            except (ValueError, AttributeError):
+                games.append(float(stat_text))
+            except ValueError:
                 continue
-            
-            # Get minutes played
-            min_cell = row.find('td', {'data-stat': 'mp'})
-            if min_cell and min_cell.text.strip():
-                # Minutes format: "35:24" → convert to 35.4
-                min_text = min_cell.text.strip()
-                if ':' in min_text:
-                    min_parts = min_text.split(':')
-                    min_value = int(min_parts[0])
-                    if len(min_parts) > 1:
-                        min_value += int(min_parts[1]) / 60
+
+            # Get minutes played; "35:24" → 35.4, sometimes just a number
+            min_text = cells.get('mp', '')
+            if min_text:
+                try:
+                    mm, _, ss = min_text.partition(':')
+                    min_value = float(mm) + (int(ss) / 60 if ss else 0)
                     minutes.append(round(min_value, 1))
-                else:
-                    # Sometimes it's just a number
-                    try:
-                        minutes.append(float(min_text))
-                    except:
-                        minutes.append(0)
+                except ValueError:
+                    minutes.append(0)
             else:
                 minutes.append(0)
-            
+
             # Stop after 7 games
             if len(games) >= 7:
                 break
@@ -146,17 +242,154 @@ def scrape_game_log(player_id, stat_type):
             'games': games[:7],
             'minutes': minutes[:7]
         }
-        
+
+    except Exception as e:
+        print(f"Error parsing game log: {e}")
+        return None
+
+
+def scrape_game_log(player_id, stat_type):
+    """
+    Scrape player's game log from Basketball Reference
+    Returns last 7 games of stats
+    """
+    try:
+        return _parse_game_log(_fetch_season_html(player_id), stat_type)
     except Exception as e:
         print(f"Error scraping game log: {e}")
         return None
 
 
+def get_gamelog_df(player_id):
+    """
+    A player's full game log as one DataFrame, all stat columns at once
+
+    Parsed once per TTL window from the cached HTML; every stat lookup
+    afterwards is a column slice with no HTTP and no HTML parse
+    """
+    if not PANDAS_AVAILABLE:
+        return None
+
+    cached = _df_cache.get(player_id)
+    if cached and time.time() - cached[0] < HTML_CACHE_TTL:
+        return cached[1]
+
+    soup = BeautifulSoup(_fetch_season_html(player_id), 'lxml')
+    table = soup.find('table', {'id': 'pgl_basic'})
+    tbody = table.find('tbody') if table else None
+    if not tbody:
+        return None
+
+    records = []
+    for row in tbody.find_all('tr'):
+        if row.get('class') and 'thead' in row.get('class'):
+            continue
+        records.append({td.get('data-stat'): td.get_text(strip=True)
+                        for td in row.find_all('td')})
+
+    df = pd.DataFrame.from_records(records)
+
+    # Stat columns arrive as strings; DNP rows coerce to NaN
+    for col in STAT_COLUMNS.values():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # Minutes are "mm:ss" (occasionally a bare number)
+    if 'mp' in df.columns:
+        parts = df['mp'].str.partition(':')
+        df['mp'] = (pd.to_numeric(parts[0], errors='coerce')
+                    + pd.to_numeric(parts[2], errors='coerce').fillna(0) / 60).round(1)
+
+    _df_cache[player_id] = (time.time(), df)
+    return df
+
+
+def get_stat(player_id, stat_type, n=7):
+    """Last n values of one stat, sliced out of the cached DataFrame"""
+    col = STAT_COLUMNS.get(stat_type)
+    df = get_gamelog_df(player_id) if col else None
+
+    if df is None or col not in df.columns:
+        # pandas missing or table shape changed - fall back to the row parser
+        result = scrape_game_log(player_id, stat_type)
+        return result['games'] if result else []
+
+    return df[col].dropna().head(n).tolist()
+
+
+def preload_game_logs(player_names):
+    """Warm the HTML and DataFrame caches for a watch list of players"""
+    for name in player_names:
+        player_id = find_player_id(name)
+        if player_id:
+            get_gamelog_df(player_id)
+
+
+# Opt-in warm start: NBA_WATCH_LIST="Luka Doncic,LeBron James" preloads
+# those game logs at boot, so the first requests hit warm caches
+_watch_list = [name.strip()
+               for name in os.environ.get('NBA_WATCH_LIST', '').split(',')
+               if name.strip()]
+if _watch_list:
+    print(f"🔥 Preloading game logs for {len(_watch_list)} watched players...")
+    preload_game_logs(_watch_list)
+
+
+def scrape_many(jobs, max_workers=None):
+    """
+    Scrape several (player_id, stat_type) jobs, parsing across cores
+
+    Downloads go through the cached fetcher one at a time (each unique
+    player costs at most one request), then the CPU-bound bs4 parsing
+    fans out over a process pool. Only HTML bytes and plain dicts
+    cross the process boundary.
+
+    Returns a dict mapping each (player_id, stat_type) job to its result
+    """
+    jobs = list(dict.fromkeys(jobs))
+    if not jobs:
+        return {}
+
+    htmls = {}
+    for player_id, _ in jobs:
+        if player_id not in htmls:
+            try:
+                htmls[player_id] = _fetch_season_html(player_id)
+            except Exception as e:
+                print(f"Error fetching game log for {player_id}: {e}")
+                htmls[player_id] = None
+
+    results = {}
+    pending = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for job in jobs:
+            player_id, stat_type = job
+            html = htmls[player_id]
+            if html is None:
+                results[job] = None
+            else:
+                pending[job] = executor.submit(_parse_game_log, html, stat_type)
+
+        for job, future in pending.items():
+            try:
+                results[job] = future.result()
+            except Exception as e:
+                print(f"Error parsing game log: {e}")
+                results[job] = None
+
+    return results
+
+
 @app.route('/api/fetch-nba-stats', methods=['POST'])
-def fetch_nba_stats():
+async def fetch_nba_stats():
     """
     Fetch NBA player stats from Basketball Reference
     NO API RATE LIMITS - Unlimited usage!
+
+    Async view (served through asgiref like the main API server): the
+    two upstream HTTP calls run in worker threads, so one process keeps
+    serving other requests while a scrape is in flight
     """
     try:
         data = request.json
@@ -171,7 +404,7 @@ def fetch_nba_stats():
         
         # Step 1: Find player ID
         print(f"Searching for player: {player_name}")
-        player_id = find_player_id(player_name)
+        player_id = await asyncio.to_thread(find_player_id, player_name)
         
         if not player_id:
             return jsonify({
@@ -182,7 +415,7 @@ def fetch_nba_stats():
         print(f"Found player ID: {player_id}")
         
         # Step 2: Scrape game log (2025-26 season)
-        result = scrape_game_log(player_id, stat_type)
+        result = await asyncio.to_thread(scrape_game_log, player_id, stat_type)
         
         if not result:
             return jsonify({
@@ -5,31 +5,112 @@ Scrapes player game logs from NFL.com
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import time
 import re
 
+# Compiled once: normalize_name runs for every prop in a scan, and per-call
+# re.sub pays a cache lookup plus argument parsing each time
+_STRIP_RE = re.compile(r'[^\w\s-]')
+_DASH_RE = re.compile(r'-+')
+
+# Player tiers for smart estimates - frozensets make membership O(1)
+ELITE_QBS = frozenset({'lamar jackson', 'josh allen', 'jalen hurts'})
+POCKET_QBS = frozenset({'patrick mahomes', 'joe burrow', 'brock purdy', 'baker mayfield',
+                        'jared goff', 'justin herbert', 'dak prescott', 'tua tagovailoa',
+                        'kirk cousins', 'geno smith', 'matthew stafford', 'derek carr'})
+ELITE_RBS = frozenset({'christian mccaffrey', 'saquon barkley', 'derrick henry', 'jonathan taylor'})
+ELITE_WRS = frozenset({'tyreek hill', 'justin jefferson', 'ja\'marr chase', 'ceedee lamb',
+                       'amon-ra st brown', 'aj brown', 'stefon diggs', 'davante adams',
+                       'drake london', 'puka nacua', 'garrett wilson', 'chris olave'})
+ELITE_TES = frozenset({'travis kelce', 'mark andrews', 'george kittle', 'tj hockenson'})
+
+PLAYER_TIER = {name: tier
+               for tier, names in (('elite_qb', ELITE_QBS),
+                                   ('pocket_qb', POCKET_QBS),
+                                   ('elite_rb', ELITE_RBS),
+                                   ('elite_wr', ELITE_WRS),
+                                   ('elite_te', ELITE_TES))
+               for name in names}
+
+# Odds-API style stat names map onto the PFR-style keys used below
+STAT_ALIASES = {
+    'passing_yards': 'pass_yds',
+    'passing_tds': 'pass_tds',
+    'rushing_yards': 'rush_yds',
+    'rushing_tds': 'rush_tds',
+    'receiving_yards': 'reception_yds',
+    'receiving_tds': 'rec_tds',
+}
+
+# (stat, tier) -> recent-game estimates; tuples are shared, not rebuilt per call
+_ESTIMATES = {
+    ('pass_yds', 'elite_qb'): (245, 258, 235, 267, 241, 252, 238),
+    ('pass_yds', 'pocket_qb'): (245, 258, 235, 267, 241, 252, 238),
+    ('pass_yds', 'generic'): (215, 228, 205, 237, 221, 232, 218),
+    ('pass_tds', 'elite_qb'): (2, 1, 2, 2, 1, 2, 2),
+    ('pass_tds', 'pocket_qb'): (2, 1, 2, 2, 1, 2, 2),
+    ('pass_tds', 'generic'): (1, 1, 2, 1, 0, 1, 1),
+    ('rush_yds', 'elite_rb'): (128, 145, 112, 138, 155, 119, 142),
+    ('rush_yds', 'elite_qb'): (45, 38, 62, 41, 55, 48, 52),
+    ('rush_yds', 'pocket_qb'): (8, 12, 5, 15, 3, 11, 7),
+    ('rush_yds', 'generic'): (75, 82, 68, 79, 71, 85, 73),
+    ('rush_tds', 'elite_rb'): (1, 2, 1, 1, 2, 1, 1),
+    ('rush_tds', 'elite_qb'): (1, 0, 1, 0, 1, 0, 1),
+    ('rush_tds', 'pocket_qb'): (0, 0, 0, 0, 0, 0, 0),
+    ('rush_tds', 'generic'): (0, 1, 0, 1, 0, 0, 1),
+    ('receptions', 'elite_wr'): (8, 9, 7, 10, 8, 9, 8),
+    ('receptions', 'elite_te'): (6, 7, 5, 8, 6, 7, 6),
+    ('receptions', 'generic'): (5, 6, 4, 6, 5, 5, 6),
+    ('reception_yds', 'elite_wr'): (105, 118, 95, 128, 112, 122, 108),
+    ('reception_yds', 'elite_te'): (78, 85, 68, 92, 81, 88, 75),
+    ('reception_yds', 'elite_rb'): (45, 52, 38, 48, 42, 55, 41),
+    ('reception_yds', 'generic'): (65, 72, 58, 68, 61, 75, 64),
+    ('rec_tds', 'elite_wr'): (1, 0, 1, 1, 0, 1, 0),
+    ('rec_tds', 'elite_te'): (1, 0, 1, 1, 0, 1, 0),
+    ('rec_tds', 'generic'): (0, 0, 1, 0, 0, 0, 1),
+}
+
+_DEFAULT_ESTIMATE = (100, 95, 105, 92, 98, 103, 96)
+
 
 class NFLStatsScraper:
     """Scrape real player statistics from NFL.com"""
-    
+
     def __init__(self):
         self.base_url = "https://www.nfl.com"
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            # NFL.com serves brotli when advertised - ~20% smaller than gzip
+            'Accept-Encoding': 'gzip, deflate, br',
         }
         self.player_cache = {}
+
+        # Pooled session: keep-alive reuses one TLS connection to NFL.com
+        # and retries back off automatically on 429/5xx
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
     
     def normalize_name(self, player_name: str) -> str:
         """Convert player name to NFL.com URL format"""
         # NFL.com uses: firstname-lastname format
         # Convert "Drake London" -> "drake-london"
         name = player_name.lower().strip()
-        name = re.sub(r'[^\w\s-]', '', name)  # Remove special chars except dash
+        name = _STRIP_RE.sub('', name)  # Remove special chars except dash
         name = name.replace(' ', '-')
-        name = re.sub(r'-+', '-', name)  # Multiple dashes to single
-        return name
+        return _DASH_RE.sub('-', name)  # Multiple dashes to single
     
     def get_player_gamelog(self, player_name: str, season: int = 2025) -> List[Dict]:
         """
@@ -42,14 +123,15 @@ class NFLStatsScraper:
             
             print(f"  📡 Fetching from: {url}")
             
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             
             if response.status_code == 404:
                 print(f"  ⚠️  Player page not found (404)")
                 return []
             
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # lxml parses several times faster than the pure-Python html.parser
+            soup = BeautifulSoup(response.content, 'lxml')
             
             # Find stats tables
             tables = soup.find_all('table')
@@ -125,89 +207,14 @@ class NFLStatsScraper:
         Smart estimates based on player name and position
         Better than generic mock data
         """
-        
-        # Elite QBs
-        elite_qbs = ['lamar jackson', 'josh allen', 'jalen hurts']
-        pocket_qbs = ['patrick mahomes', 'joe burrow', 'brock purdy', 'baker mayfield', 
-                      'jared goff', 'justin herbert', 'dak prescott', 'tua tagovailoa',
-                      'kirk cousins', 'geno smith', 'matthew stafford', 'derek carr']
-        
-        # Elite RBs  
-        elite_rbs = ['christian mccaffrey', 'saquon barkley', 'derrick henry', 'jonathan taylor']
-        # Elite WRs
-        elite_wrs = ['tyreek hill', 'justin jefferson', 'ja\'marr chase', 'ceedee lamb', 
-                     'amon-ra st brown', 'aj brown', 'stefon diggs', 'davante adams',
-                     'drake london', 'puka nacua', 'garrett wilson', 'chris olave']
-        # Elite TEs
-        elite_tes = ['travis kelce', 'mark andrews', 'george kittle', 'tj hockenson']
-        
-        name_lower = player_name.lower()
-        
-        # Passing yards
-        if stat_type in ['pass_yds', 'passing_yards']:
-            if name_lower in elite_qbs or name_lower in pocket_qbs:
-                return [245, 258, 235, 267, 241, 252, 238][:num_games]
-            else:
-                return [215, 228, 205, 237, 221, 232, 218][:num_games]
-        
-        # Passing TDs
-        elif stat_type in ['pass_tds', 'passing_tds']:
-            if name_lower in elite_qbs or name_lower in pocket_qbs:
-                return [2, 1, 2, 2, 1, 2, 2][:num_games]
-            else:
-                return [1, 1, 2, 1, 0, 1, 1][:num_games]
-        
-        # Rushing yards
-        elif stat_type in ['rush_yds', 'rushing_yards']:
-            if name_lower in elite_rbs:
-                return [128, 145, 112, 138, 155, 119, 142][:num_games]
-            elif name_lower in elite_qbs:
-                return [45, 38, 62, 41, 55, 48, 52][:num_games]
-            elif name_lower in pocket_qbs:
-                return [8, 12, 5, 15, 3, 11, 7][:num_games]
-            else:
-                return [75, 82, 68, 79, 71, 85, 73][:num_games]
-        
-        # Rushing TDs
-        elif stat_type in ['rush_tds', 'rushing_tds']:
-            if name_lower in elite_rbs:
-                return [1, 2, 1, 1, 2, 1, 1][:num_games]
-            elif name_lower in elite_qbs:
-                return [1, 0, 1, 0, 1, 0, 1][:num_games]
-            elif name_lower in pocket_qbs:
-                return [0, 0, 0, 0, 0, 0, 0][:num_games]
-            else:
-                return [0, 1, 0, 1, 0, 0, 1][:num_games]
-        
-        # Receptions
-        elif stat_type in ['receptions']:
-            if name_lower in elite_wrs:
-                return [8, 9, 7, 10, 8, 9, 8][:num_games]
-            elif name_lower in elite_tes:
-                return [6, 7, 5, 8, 6, 7, 6][:num_games]
-            else:
-                return [5, 6, 4, 6, 5, 5, 6][:num_games]
-        
-        # Receiving yards
-        elif stat_type in ['reception_yds', 'receiving_yards']:
-            if name_lower in elite_wrs:
-                return [105, 118, 95, 128, 112, 122, 108][:num_games]
-            elif name_lower in elite_tes:
-                return [78, 85, 68, 92, 81, 88, 75][:num_games]
-            elif name_lower in elite_rbs:
-                return [45, 52, 38, 48, 42, 55, 41][:num_games]
-            else:
-                return [65, 72, 58, 68, 61, 75, 64][:num_games]
-        
-        # Receiving TDs
-        elif stat_type in ['rec_tds', 'receiving_tds']:
-            if name_lower in elite_wrs or name_lower in elite_tes:
-                return [1, 0, 1, 1, 0, 1, 0][:num_games]
-            else:
-                return [0, 0, 1, 0, 0, 0, 1][:num_games]
-        
-        # Default
-        return [100, 95, 105, 92, 98, 103, 96][:num_games]
+        tier = PLAYER_TIER.get(player_name.lower(), 'generic')
+        stat = STAT_ALIASES.get(stat_type, stat_type)
+
+        # Fall back to the stat's generic tier (e.g. a QB asking for
+        # receptions), then to the all-purpose default for unknown stats
+        estimates = (_ESTIMATES.get((stat, tier))
+                     or _ESTIMATES.get((stat, 'generic'), _DEFAULT_ESTIMATE))
+        return list(estimates[:num_games])
 
 
 if __name__ == "__main__":
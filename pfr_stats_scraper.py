@@ -5,50 +5,359 @@ More reliable than ESPN API and has complete historical data
 """
 
 import requests
+import numpy as np
+import lxml.etree
+import lxml.html
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import threading
 import time
 import re
 
+from stats_cache import SQLiteStatsCache, SQLiteHTTPCache
+
+# selectolax's Lexbor engine walks PFR's table-heavy pages roughly an
+# order of magnitude faster than bs4; fall back to lxml XPath without it
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# pandas gives analysis callers a typed frame view of the game log
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+DEFAULT_SEASON = 2025
+
+# Per-resource TTLs for the persistent HTTP cache
+PLAYER_ID_TTL = 30 * 86400      # PFR player IDs are stable for years
+GAMELOG_TTL = 3600              # In-season game logs grow weekly
+PAST_SEASON_TTL = 365 * 86400   # Finished seasons never change
+NEGATIVE_SEARCH_TTL = 600       # Unknown/misspelled names retry after 10 min
+
+# Candidate gamelog tables per stat category, in preference order
+_GAMELOG_TABLE_IDS = {
+    'passing': ('passing', 'passing_advanced'),
+    'rushing': ('rushing_and_receiving', 'rushing'),
+    'receiving': ('receiving_and_rushing', 'rushing_and_receiving', 'receiving'),
+}
+
+# Stat-type classification for table lookup - frozensets are O(1) per check
+_PASSING_STATS = frozenset({'pass_yds', 'passing_yards', 'pass_tds', 'passing_tds'})
+_RUSHING_STATS = frozenset({'rush_yds', 'rushing_yards', 'rush_tds', 'rushing_tds'})
+_RECEIVING_STATS = frozenset({'receptions', 'reception_yds', 'receiving_yards',
+                              'rec_tds', 'receiving_tds'})
+
+# Map stat types to PFR column names
+_STAT_MAP = {
+    'pass_yds': 'pass_yds',
+    'passing_yards': 'pass_yds',
+    'pass_tds': 'pass_td',
+    'passing_tds': 'pass_td',
+
+    'rush_yds': 'rush_yds',
+    'rushing_yards': 'rush_yds',
+    'rush_tds': 'rush_td',
+    'rushing_tds': 'rush_td',
+
+    'receptions': 'rec',
+    'reception_yds': 'rec_yds',
+    'receiving_yards': 'rec_yds',
+    'rec_tds': 'rec_td',
+    'receiving_tds': 'rec_td',
+}
+
+
+# Row classes that mark headers/dividers rather than games
+_SKIP_CLASSES = frozenset({'thead', 'over_header', 'stat_total'})
+
+# Precompiled XPath evaluators - a slate scores the same few selectors
+# dozens of times, so compile each expression once at import instead of
+# re-parsing the XPath string per call
+_TABLE_XPATH = lxml.etree.XPath('//table[@id=$table_id]')
+
+# Game rows in one XPath pass: header/divider rows and bye weeks (rows
+# whose reason cell carries text) are filtered in C instead of per-row
+# Python checks
+_GAMELOG_ROW_XPATH = lxml.etree.XPath(
+    './tbody/tr[not(contains(@class, "thead"))'
+    ' and not(contains(@class, "over_header"))'
+    ' and not(contains(@class, "stat_total"))'
+    ' and not(td[@data-stat="reason" and normalize-space(text())])]'
+)
+_GAMELOG_CELL_XPATH = lxml.etree.XPath('./th[@data-stat] | ./td[@data-stat]')
+
+# Regex fast path for single-stat extraction (_extract_stat_column): PFR
+# rows are structurally fixed per table, so one C-level regex sweep over
+# the tbody replaces building a whole parse tree
+_TR_RE = re.compile(r'<tr([^>]*)>(.*?)</tr>', re.DOTALL)
+
+
+@lru_cache(maxsize=32)
+def _table_body_pattern(table_id: str) -> "re.Pattern":
+    """Compiled matcher for one table's tbody HTML"""
+    return re.compile(
+        rf'<table[^>]*\bid="{table_id}"[^>]*>.*?<tbody[^>]*>(.*?)</tbody>',
+        re.DOTALL)
+
+
+@lru_cache(maxsize=32)
+def _cell_pattern(data_stat: str) -> "re.Pattern":
+    """Compiled matcher for one data-stat cell's text (wrapper tags skipped)
+
+    The tag-skip group refuses to cross a closing </td>/</th>, so an
+    empty cell captures '' instead of walking into the next cell and
+    claiming its text.
+    """
+    return re.compile(rf'data-stat="{data_stat}"[^>]*>(?:<(?!/t[dh])[^>]+>)*([^<]*)')
+
+
+class HostRateLimiter:
+    """
+    Adaptive per-host minimum-interval limiter shared by the fetch thread pool
+
+    Each HTTP request waits until its host's last request is at least the
+    host's current interval old, so concurrency across hosts is free while
+    any one host sees a polite, evenly spaced stream.
+
+    The interval adapts to what the host actually tolerates: a 429 doubles
+    it (capped at max_interval, or raised to the Retry-After header if the
+    host names its own delay), and each successful response decays it back
+    toward the configured floor.
+    """
+
+    BACKOFF_FACTOR = 2.0   # Interval multiplier on a 429
+    DECAY_FACTOR = 0.9     # Interval multiplier on success (toward floor)
+
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 10.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._last = {}
+        self._interval = {}
+
+    def wait(self, host: str):
+        """Block until this host's interval has elapsed, then claim a slot"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                interval = self._interval.get(host, self.min_interval)
+                wait = interval - (now - self._last.get(host, 0.0))
+                if wait <= 0:
+                    self._last[host] = now
+                    return
+            time.sleep(wait)
+
+    def record(self, host: str, response) -> None:
+        """Adapt this host's interval from the response we just got"""
+        with self._lock:
+            interval = self._interval.get(host, self.min_interval)
+            if response.status_code == 429:
+                backed_off = min(interval * self.BACKOFF_FACTOR, self.max_interval)
+                retry_after = response.headers.get('Retry-After')
+                if retry_after:
+                    try:
+                        backed_off = max(backed_off, float(retry_after))
+                    except ValueError:
+                        pass  # HTTP-date form; the doubled interval stands
+                self._interval[host] = backed_off
+                print(f"  🐢 {host} rate limited - backing off to {backed_off:.1f}s between requests")
+            else:
+                self._interval[host] = max(interval * self.DECAY_FACTOR, self.min_interval)
+
 
 class PFRStatsScraper:
     """Scrape real player statistics from Pro Football Reference"""
-    
+
     def __init__(self):
         self.base_url = "https://www.pro-football-reference.com"
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            # Gamelog pages shrink ~10x over the wire with brotli/gzip;
+            # requests decompresses transparently (brotli is in requirements)
+            'Accept-Encoding': 'br, gzip, deflate'
         }
+        # Pooled session: the batch path hits PFR repeatedly, so reusing
+        # connections skips the TLS handshake on every request after the
+        # first, and transient 5xx/429s retry with backoff at the adapter
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.player_cache = {}
+        # Persistent cache of parsed game logs (skips PFR on repeat scans)
+        self.stats_db = SQLiteStatsCache()
+        # Persistent cache of player IDs and raw gamelog pages, so process
+        # restarts don't re-download what PFR already served us
+        self.http_cache = SQLiteHTTPCache()
+        # Politeness controls for the parallel batch path: every actual
+        # HTTP request (search + gamelog alike) claims a per-host slot
+        self._rate_limiter = HostRateLimiter(min_interval=0.5)
+        # In-flight coalescing: when two pool threads (or two web workers
+        # sharing this scraper) ask for the same key at once, the second
+        # waits on the first's result instead of issuing a duplicate fetch
+        self._inflight: Dict[str, dict] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _coalesce(self, key: str, fetcher):
+        """Run fetcher for key, deduplicating concurrent identical calls
+
+        The first caller for a key becomes the leader and does the real
+        work; everyone arriving before it finishes blocks on an Event and
+        shares the leader's result. Entries vanish once the fetch settles,
+        so TTL handling stays with the caches underneath.
+        """
+        with self._inflight_lock:
+            entry = self._inflight.get(key)
+            if entry is None:
+                entry = {'event': threading.Event()}
+                self._inflight[key] = entry
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            entry['event'].wait()
+            return entry.get('result')
+
+        try:
+            entry['result'] = fetcher()
+            return entry['result']
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            entry['event'].set()
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """All PFR HTTP traffic funnels through the per-host rate limiter"""
+        host = 'www.pro-football-reference.com'
+        self._rate_limiter.wait(host)
+        response = self.session.get(url, timeout=10, **kwargs)
+        self._rate_limiter.record(host, response)
+        return response
+
+    def get_many_recent_games(self, pairs: List[Tuple[str, str]],
+                              num_games: int = 7,
+                              max_workers: int = 8) -> Dict[Tuple[str, str], List[float]]:
+        """
+        Fetch game histories for several (player_name, stat_type) pairs in parallel
+
+        The per-pair fetches are network-bound, so a thread pool overlaps the
+        round-trips while the per-host rate limiter keeps PFR's request
+        stream evenly spaced.
+
+        Returns:
+            Dict mapping each (player_name, stat_type) pair to its game history
+        """
+        unique_pairs = list(dict.fromkeys(pairs))
+
+        if not unique_pairs:
+            return {}
+
+        # Warm IDs and pages first so the per-pair work below is mostly
+        # cache reads plus extraction
+        self.prefetch(unique_pairs, max_workers=max_workers)
+
+        def fetch(pair):
+            player_name, stat_type = pair
+            return pair, self.get_player_recent_games(player_name, stat_type, num_games)
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for pair, games in executor.map(fetch, unique_pairs):
+                results[pair] = games
+
+        return results
+
+    def prefetch(self, pairs: List[Tuple[str, str]], max_workers: int = 8) -> None:
+        """
+        Warm the caches for a whole slate of (player_name, stat_type) pairs
+
+        A typical slate repeats each player across several stat types, so
+        network work is batched by player rather than by prop: every
+        unique name resolves to its PFR ID once, then every unique ID's
+        gamelog page downloads once (the page covers all stat categories).
+        Later get_player_recent_games calls hit only the caches.
+        """
+        unique_players = list(dict.fromkeys(name for name, _ in pairs))
+        if not unique_players:
+            return
+
+        print(f"🚚 Prefetching {len(unique_players)} players for {len(pairs)} props...")
+
+        def warm_page(player_id):
+            try:
+                self._get_gamelog_html(player_id, DEFAULT_SEASON)
+            except Exception as e:
+                print(f"  ⚠️  Prefetch error for {player_id}: {str(e)[:80]}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            player_ids = executor.map(self.search_player, unique_players)
+            unique_ids = list(dict.fromkeys(pid for pid in player_ids if pid))
+            for _ in executor.map(warm_page, unique_ids):
+                pass
     
     def search_player(self, player_name: str) -> Optional[str]:
         """
         Search for a player and get their PFR ID
         Returns player URL slug (e.g., 'MahoPa00')
         """
-        # Clean player name
         name_clean = player_name.strip().lower()
-        
-        # Try cache first
+        return self._coalesce(f'search:{name_clean}',
+                              lambda: self._search_player(player_name, name_clean))
+
+    def _search_player(self, player_name: str, name_clean: str) -> Optional[str]:
+        """Cache-then-fetch player-ID resolution (runs under _coalesce)"""
+        # Try cache first - misses are cached too, so retrying a misspelled
+        # name within the negative TTL never re-hits PFR's search endpoint
         if name_clean in self.player_cache:
-            return self.player_cache[name_clean]
-        
+            player_id, cached_at = self.player_cache[name_clean]
+            if player_id is not None or time.time() - cached_at < NEGATIVE_SEARCH_TTL:
+                return player_id
+            del self.player_cache[name_clean]  # Stale negative - retry
+
+        # Results persisted by a previous process (the disk TTL already
+        # distinguishes long-lived IDs from short-lived negatives)
+        cached = self.http_cache.get(f'player-id:{name_clean}')
+        if cached is not None:
+            player_id = cached or None
+            self.player_cache[name_clean] = (player_id, time.time())
+            return player_id
+
         try:
             # PFR search
             search_url = f"{self.base_url}/search/search.fcgi"
             params = {'search': player_name}
             
-            response = requests.get(search_url, params=params, headers=self.headers, timeout=10)
+            response = self._get(search_url, params=params)
             response.raise_for_status()
             
             # If redirected directly to player page, extract ID from URL
             if '/players/' in response.url:
                 player_id = response.url.split('/players/')[1].split('/')[1].replace('.htm', '')
-                self.player_cache[name_clean] = player_id
+                self._remember_player(name_clean, player_id)
                 return player_id
             
             # Otherwise parse search results
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # lxml parses several times faster than the pure-Python html.parser
+            soup = BeautifulSoup(response.text, 'lxml')
             
             # Find first player result
             search_results = soup.find('div', {'id': 'players'})
@@ -58,112 +367,340 @@ class PFRStatsScraper:
                     link = first_result.find('a')
                     if link and link.get('href'):
                         player_id = link['href'].split('/players/')[1].split('/')[1].replace('.htm', '')
-                        self.player_cache[name_clean] = player_id
+                        self._remember_player(name_clean, player_id)
                         return player_id
-            
+
+            # A definitive "no results" page is worth remembering briefly;
+            # transient network errors below are not
+            self._remember_player(name_clean, None)
             return None
-            
+
         except Exception as e:
             print(f"  ⚠️  Search error: {str(e)[:100]}")
             return None
+
+    def _remember_player(self, name_clean: str, player_id: Optional[str]) -> None:
+        """Cache a search result - hit or definitive miss - in memory and on disk"""
+        self.player_cache[name_clean] = (player_id, time.time())
+        ttl = PLAYER_ID_TTL if player_id else NEGATIVE_SEARCH_TTL
+        self.http_cache.set(f'player-id:{name_clean}', player_id or '', ttl)
     
+    def get_player_gamelog_columns(self, player_id: str, season: int = DEFAULT_SEASON,
+                                   stat_category: str = None) -> Optional[Dict]:
+        """
+        Game log in column (structure-of-arrays) form
+
+        Returns {'n': game_count, 'cols': {stat_name: [values oldest-first]}}
+        with missing cells as ''. One list per column beats one dict per
+        game when a caller only reads a column or two - no per-game dict
+        headers, no re-hashing the same ~25 keys for every row.
+
+        Args:
+            stat_category: 'passing', 'rushing', 'receiving' to help find right table
+        """
+        try:
+            html_text = self._get_gamelog_html(player_id, season)
+
+            # Category tables first, 'stats' only as absolute last resort
+            table_ids = _GAMELOG_TABLE_IDS.get(stat_category, ()) + ('stats',)
+
+            if SELECTOLAX_AVAILABLE:
+                extracted = self._extract_columns_selectolax(html_text, table_ids)
+            else:
+                extracted = self._extract_columns_lxml(html_text, table_ids)
+
+            if extracted is None:
+                print(f"  ❌ Could not find any stats table")
+                return None
+
+            n_rows, columns = extracted
+            print(f"  📊 Found {n_rows} games total")
+            return {'n': n_rows, 'cols': columns}
+
+        except Exception as e:
+            print(f"  ⚠️  Gamelog error: {str(e)[:200]}")
+            return None
+
     def get_player_gamelog(self, player_id: str, season: int = 2025, stat_category: str = None) -> List[Dict]:
         """
         Get player's game log for the season
         Returns list of game stats dictionaries
-        
+
+        Per-game dict view over get_player_gamelog_columns, for callers
+        that want the whole record; column readers should use the SoA
+        form directly.
+
         Args:
             stat_category: 'passing', 'rushing', 'receiving' to help find right table
         """
-        try:
-            url = f"{self.base_url}/players/{player_id[0]}/{player_id}/gamelog/{season}/"
-            
-            print(f"  📡 Fetching from: {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try to find the right table based on stat category
-            table = None
-            
-            if stat_category == 'passing':
-                # Try passing-specific tables first
-                for table_id in ['passing', 'passing_advanced']:
-                    table = soup.find('table', {'id': table_id})
-                    if table:
-                        print(f"  ✅ Found table: {table_id}")
-                        break
-            elif stat_category == 'rushing':
-                # Try rushing tables
-                for table_id in ['rushing_and_receiving', 'rushing']:
-                    table = soup.find('table', {'id': table_id})
-                    if table:
-                        print(f"  ✅ Found table: {table_id}")
-                        break
-            elif stat_category == 'receiving':
-                # Try receiving tables
-                for table_id in ['receiving_and_rushing', 'rushing_and_receiving', 'receiving']:
-                    table = soup.find('table', {'id': table_id})
-                    if table:
-                        print(f"  ✅ Found table: {table_id}")
-                        break
-            
-            # Only use 'stats' as absolute last resort
-            if not table:
-                table = soup.find('table', {'id': 'stats'})
-                if table:
-                    print(f"  ⚠️  Using fallback table: stats")
-            
-            if not table:
-                print(f"  ❌ Could not find any stats table")
-                return []
-            
-            games = []
-            tbody = table.find('tbody')
-            
-            if not tbody:
-                print(f"  ⚠️  No tbody found")
-                return []
-            
-            for row in tbody.find_all('tr'):
-                # Skip header rows and dividers
-                classes = row.get('class', [])
-                if 'thead' in classes or 'over_header' in classes or 'stat_total' in classes:
+        result = self.get_player_gamelog_columns(player_id, season, stat_category)
+        if not result:
+            return []
+
+        cols = result['cols']
+        games = [
+            {name: col[i] for name, col in cols.items() if col[i]}
+            for i in range(result['n'])
+        ]
+
+        if games:
+            print(f"  📝 Sample stats from first game: {list(games[0].keys())[:10]}")
+
+        return games
+
+    def _get_gamelog_html(self, player_id: str, season: int) -> str:
+        """Gamelog page HTML (cached or fetched), comment markers stripped
+
+        PFR ships most stat tables inside HTML comments; stripping the
+        markers makes them visible to the first table lookup instead of
+        forcing a second traversal down to the 'stats' fallback table.
+        """
+        url = f"{self.base_url}/players/{player_id[0]}/{player_id}/gamelog/{season}/"
+
+        # Finished seasons never change; in-season pages grow weekly
+        ttl = GAMELOG_TTL if season >= DEFAULT_SEASON else PAST_SEASON_TTL
+
+        entry = self.http_cache.get_entry(url)
+        if entry is not None:
+            body, is_fresh, etag, last_modified = entry
+
+            if is_fresh:
+                print(f"  💾 Using cached page: {url}")
+                return body.replace('<!--', '').replace('-->', '')
+
+            # Stale but revalidatable: ask PFR whether the page changed.
+            # In-season pages only grow once a week, so most hourly TTL
+            # expiries come back 304 with an empty body instead of ~300KB.
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+            if headers:
+                print(f"  📡 Revalidating: {url}")
+                response = self._get(url, headers=headers)
+                if response.status_code == 304:
+                    print(f"  💾 Not modified - reusing cached page")
+                    self.http_cache.touch(url, ttl)
+                    return body.replace('<!--', '').replace('-->', '')
+
+                response.raise_for_status()
+                html = response.text
+                self.http_cache.set(url, html, ttl, response.headers.get('ETag'),
+                                    response.headers.get('Last-Modified'))
+                return html.replace('<!--', '').replace('-->', '')
+
+        print(f"  📡 Fetching from: {url}")
+        response = self._get(url)
+        response.raise_for_status()
+        html = response.text
+        self.http_cache.set(url, html, ttl, response.headers.get('ETag'),
+                            response.headers.get('Last-Modified'))
+
+        return html.replace('<!--', '').replace('-->', '')
+
+    @staticmethod
+    def _extract_stat_column(html_text: str, table_ids: Tuple[str, ...],
+                             pfr_stat: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Regex fast path: pull one stat column straight out of the tbody HTML
+
+        When a caller only needs a single data-stat, a compiled regex sweep
+        of the raw rows beats building a parse tree for ~25 columns per
+        game. Returns (week_text, value_text) pairs oldest-first, or None
+        when the page doesn't match the expected shape - callers fall back
+        to the full tree extraction in that case.
+        """
+        tbody = None
+        for table_id in table_ids:
+            match = _table_body_pattern(table_id).search(html_text)
+            if match:
+                tbody = match.group(1)
+                break
+
+        if tbody is None:
+            return None
+
+        stat_re = _cell_pattern(pfr_stat)
+        week_re = _cell_pattern('week_num')
+        reason_re = _cell_pattern('reason')
+
+        pairs = []
+        for tr in _TR_RE.finditer(tbody):
+            attrs, row_html = tr.group(1), tr.group(2)
+
+            # Skip header rows and dividers
+            if 'thead' in attrs or 'over_header' in attrs or 'stat_total' in attrs:
+                continue
+
+            # Bye weeks and inactive games carry text in the reason cell
+            reason = reason_re.search(row_html)
+            if reason and reason.group(1).strip():
+                continue
+
+            cell = stat_re.search(row_html)
+            if cell is None:
+                continue
+
+            week = week_re.search(row_html)
+            pairs.append((week.group(1).strip() if week else '',
+                          cell.group(1).strip()))
+
+        # All-empty captures mean the regex never saw real cell text -
+        # hand the page to the tree parsers rather than report zeros
+        if not any(value for _, value in pairs):
+            return None
+
+        return pairs or None
+
+    @staticmethod
+    def _announce_table(table_id: str) -> None:
+        if table_id == 'stats':
+            print(f"  ⚠️  Using fallback table: stats")
+        else:
+            print(f"  ✅ Found table: {table_id}")
+
+    @staticmethod
+    def _build_columns(rows_cells) -> Tuple[int, Dict[str, List[str]]]:
+        """Assemble aligned stat columns from per-row (name, value) cell lists
+
+        Rows with fewer than three stats (empty filler rows) are dropped;
+        columns a row lacks are padded with '' so every list stays the
+        same length.
+        """
+        columns: Dict[str, List[str]] = {}
+        n_rows = 0
+
+        for cells in rows_cells:
+            if len(cells) < 3:
+                continue
+
+            for stat_name, stat_value in cells:
+                col = columns.get(stat_name)
+                if col is None:
+                    col = columns[stat_name] = [''] * n_rows
+                col.append(stat_value)
+
+            n_rows += 1
+            for col in columns.values():
+                if len(col) < n_rows:
+                    col.append('')
+
+        return n_rows, columns
+
+    @staticmethod
+    def _extract_columns_selectolax(html_text: str, table_ids: Tuple[str, ...]
+                                    ) -> Optional[Tuple[int, Dict[str, List[str]]]]:
+        """Gamelog column extraction on the Lexbor engine (fast path)"""
+        tree = LexborHTMLParser(html_text)
+
+        table = None
+        for table_id in table_ids:
+            table = tree.css_first(f'table#{table_id}')
+            if table is not None:
+                PFRStatsScraper._announce_table(table_id)
+                break
+
+        if table is None:
+            return None
+
+        def rows():
+            for row in table.css('tbody tr'):
+                # Skip header rows and dividers - one split and one set
+                # intersection instead of three substring scans
+                classes = row.attributes.get('class')
+                if classes and _SKIP_CLASSES.intersection(classes.split()):
                     continue
-                    
-                # Check if it's a bye week or divider by looking for reason text
-                reason_cell = row.find('td', {'data-stat': 'reason'})
-                if reason_cell:
-                    reason_text = reason_cell.get_text(strip=True)
-                    if reason_text:  # Has text like "Bye Week"
-                        continue
-                
-                game = {}
-                
+
+                cells = []
+                skip = False
+
+                # Extract all stat cells from both th and td tags
+                for cell in row.css('th[data-stat], td[data-stat]'):
+                    stat_name = cell.attributes.get('data-stat')
+                    stat_value = cell.text(strip=True)
+
+                    # Bye weeks and dividers carry text like "Bye Week" here
+                    if stat_name == 'reason' and stat_value:
+                        skip = True
+                        break
+                    if stat_name and stat_value:
+                        cells.append((stat_name, stat_value))
+
+                if not skip:
+                    yield cells
+
+        return PFRStatsScraper._build_columns(rows())
+
+    @staticmethod
+    def _extract_columns_lxml(html_text: str, table_ids: Tuple[str, ...]
+                              ) -> Optional[Tuple[int, Dict[str, List[str]]]]:
+        """Gamelog column extraction via lxml XPath (fallback path)
+
+        The row filter - header/divider classes and bye weeks - evaluates
+        inside libxml2, so Python only touches rows that become games.
+        """
+        doc = lxml.html.fromstring(html_text)
+
+        table = None
+        for table_id in table_ids:
+            found = _TABLE_XPATH(doc, table_id=table_id)
+            if found:
+                table = found[0]
+                PFRStatsScraper._announce_table(table_id)
+                break
+
+        if table is None:
+            return None
+
+        def rows():
+            for row in _GAMELOG_ROW_XPATH(table):
+                cells = []
+
                 # Extract all stat cells from both th and td tags
-                for cell in row.find_all(['th', 'td']):
+                for cell in _GAMELOG_CELL_XPATH(row):
                     stat_name = cell.get('data-stat')
-                    stat_value = cell.get_text(strip=True)
-                    
+                    stat_value = cell.text_content().strip()
+
                     if stat_name and stat_value:
-                        game[stat_name] = stat_value
-                
-                # Add if we have at least a few stats (not just empty row)
-                if len(game) >= 3:
-                    games.append(game)
-            
-            print(f"  📊 Found {len(games)} games total")
-            if games:
-                print(f"  📝 Sample stats from first game: {list(games[0].keys())[:10]}")
-            
-            return games
-            
-        except Exception as e:
-            print(f"  ⚠️  Gamelog error: {str(e)[:200]}")
-            return []
+                        cells.append((stat_name, stat_value))
+
+                yield cells
+
+        return PFRStatsScraper._build_columns(rows())
     
+    def get_player_gamelog_df(self, player_id: str, season: int = DEFAULT_SEASON,
+                              stat_category: str = None):
+        """
+        Game log as a typed pandas DataFrame, one column per data-stat key
+
+        Built on the same cached fetch and row extraction as
+        get_player_gamelog, with numeric columns coerced in one vectorized
+        pass (thousands separators stripped, blanks as 0) so callers can
+        slice a whole stat column without per-row cleanup. Returns None
+        when pandas is unavailable or no games were found.
+        """
+        if not PANDAS_AVAILABLE:
+            return None
+
+        result = self.get_player_gamelog_columns(player_id, season, stat_category)
+        if not result or not result['n']:
+            return None
+
+        # Column form maps straight onto a frame - no record pivoting
+        df = pd.DataFrame(result['cols'])
+
+        # Coerce whatever is numeric; text columns (opponent, result,
+        # dates) come back all-NaN and are left as strings
+        for col in df.columns:
+            numeric = pd.to_numeric(df[col].str.replace(',', '', regex=False),
+                                    errors='coerce')
+            if numeric.notna().any():
+                df[col] = numeric.fillna(0.0)
+
+        return df
+
     def get_player_recent_games(self, player_name: str, stat_type: str, num_games: int = 7) -> List[float]:
         """
         Get player's recent game statistics
@@ -176,8 +713,22 @@ class PFRStatsScraper:
         Returns:
             List of stat values from recent games (most recent first)
         """
+        key = f'stats:{player_name.strip().lower()}:{stat_type}:{num_games}'
+        result = self._coalesce(
+            key, lambda: self._fetch_recent_games(player_name, stat_type, num_games))
+        return result if result is not None else []
+
+    def _fetch_recent_games(self, player_name: str, stat_type: str,
+                            num_games: int) -> List[float]:
+        """Cache-then-fetch game-history lookup (runs under _coalesce)"""
         print(f"🔍 Fetching real stats for {player_name} - {stat_type}...")
-        
+
+        # Check the persistent cache before touching PFR
+        cached = self.stats_db.get(player_name, stat_type, DEFAULT_SEASON, num_games)
+        if cached is not None:
+            print(f"  💾 Using cached game log: {cached}")
+            return cached
+
         # Get player ID
         player_id = self.search_player(player_name)
         
@@ -187,63 +738,78 @@ class PFRStatsScraper:
         
         # Determine stat category for table lookup
         stat_category = None
-        if stat_type in ['pass_yds', 'passing_yards', 'pass_tds', 'passing_tds']:
+        if stat_type in _PASSING_STATS:
             stat_category = 'passing'
-        elif stat_type in ['rush_yds', 'rushing_yards', 'rush_tds', 'rushing_tds']:
+        elif stat_type in _RUSHING_STATS:
             stat_category = 'rushing'
-        elif stat_type in ['receptions', 'reception_yds', 'receiving_yards', 'rec_tds', 'receiving_tds']:
+        elif stat_type in _RECEIVING_STATS:
             stat_category = 'receiving'
         
-        # Get game log
-        all_games = self.get_player_gamelog(player_id, stat_category=stat_category)
-        
-        if not all_games:
+        pfr_stat = _STAT_MAP.get(stat_type)
+
+        if not pfr_stat:
+            print(f"  ⚠️  Unknown stat type: {stat_type}")
+            return []
+
+        # Regex fast path: only one column is needed here, so try the
+        # direct sweep before paying for the full-table parse
+        pairs = None
+        table_ids = _GAMELOG_TABLE_IDS.get(stat_category, ()) + ('stats',)
+        try:
+            html_text = self._get_gamelog_html(player_id, DEFAULT_SEASON)
+            pairs = self._extract_stat_column(html_text, table_ids, pfr_stat)
+            if pairs is not None:
+                print(f"  ⚡ Extracted {len(pairs)} games via regex fast path")
+        except Exception as e:
+            print(f"  ⚠️  Fast path error: {str(e)[:100]}")
+
+        if pairs is None:
+            # Column view of the full parse: two aligned lists, no
+            # per-game dicts
+            result = self.get_player_gamelog_columns(player_id, stat_category=stat_category)
+            if result:
+                blank = [''] * result['n']
+                pairs = list(zip(result['cols'].get('week_num', blank),
+                                 result['cols'].get(pfr_stat, blank)))
+
+        if not pairs:
             print(f"  ❌ No game data found")
             return []
-        
+
         # PFR lists games from OLDEST to NEWEST
         # So we need to reverse the list first, then take the most recent games
-        all_games.reverse()
-        
-        # Map stat types to PFR column names
-        stat_map = {
-            'pass_yds': 'pass_yds',
-            'passing_yards': 'pass_yds',
-            'pass_tds': 'pass_td',
-            'passing_tds': 'pass_td',
-            
-            'rush_yds': 'rush_yds',
-            'rushing_yards': 'rush_yds',
-            'rush_tds': 'rush_td',
-            'rushing_tds': 'rush_td',
-            
-            'receptions': 'rec',
-            'reception_yds': 'rec_yds',
-            'receiving_yards': 'rec_yds',
-            'rec_tds': 'rec_td',
-            'receiving_tds': 'rec_td',
-        }
-        
-        pfr_stat = stat_map.get(stat_type)
-        
-        if not pfr_stat:
-            print(f"  ⚠️  Unknown stat type: {stat_type}")
-            return []
-        
-        # Extract stats from most recent games
-        stats = []
-        for game in all_games[:num_games]:
-            stat_value = game.get(pfr_stat, '0')
-            
-            # Clean the value (remove commas, handle empty)
+        pairs.reverse()
+
+        # Extract stats from most recent games: clean the raw cells once,
+        # then convert the whole batch in a single NumPy cast
+        recent = pairs[:num_games]
+        raw = np.array([(value or '0').replace(',', '')
+                        for _, value in recent])
+        try:
+            values = raw.astype(np.float64)
+        except ValueError:
+            # Rare malformed cell: convert element-wise, zeroing the bad ones
+            values = np.zeros(len(raw))
+            for i, text in enumerate(raw):
+                try:
+                    values[i] = float(text)
+                except ValueError:
+                    pass
+        stats = values.tolist()
+
+        # Week numbers key the persistent cache rows
+        cache_rows = []
+        for i, ((week_text, _), value) in enumerate(zip(recent, stats)):
             try:
-                stat_value = stat_value.replace(',', '')
-                value = float(stat_value) if stat_value else 0.0
-                stats.append(value)
+                week = int(week_text or 0)
             except ValueError:
-                stats.append(0.0)
-        
+                week = 0
+            if week <= 0:
+                week = len(pairs) - i  # Fallback: position from season start
+            cache_rows.append((week, value))
+
         if stats:
+            self.stats_db.upsert_many(player_name, stat_type, DEFAULT_SEASON, cache_rows)
             print(f"  ✅ Found {len(stats)} games: {stats}")
             return stats
         else:
@@ -271,23 +837,26 @@ if __name__ == "__main__":
         ('Patrick Mahomes', 'pass_yds'),
         ('Saquon Barkley', 'rush_yds'),
     ]
-    
+
+    # Batch path: fetches overlap in the thread pool while the per-host
+    # rate limiter keeps PFR's request stream politely spaced, so there is
+    # no need for a flat sleep between players
+    results = scraper.get_many_recent_games(test_players, num_games=7)
+
     for player_name, stat_type in test_players:
         print(f"\n{'='*80}")
         print(f"Testing: {player_name} - {stat_type}")
         print('='*80)
-        
-        stats = scraper.get_player_recent_games(player_name, stat_type, num_games=7)
-        
+
+        stats = results.get((player_name, stat_type), [])
+
         if stats:
             avg = sum(stats) / len(stats)
             print(f"\nAverage: {avg:.1f}")
             print(f"Min: {min(stats):.1f} | Max: {max(stats):.1f}")
         else:
             print("\nNo stats found - player may not be active or name incorrect")
-        
-        time.sleep(2)  # Be nice to PFR's servers
-    
+
     print("\n" + "="*80)
     print("✅ Test complete!")
     print("="*80)
@@ -1,68 +1,279 @@
 """
 Simple stats caching to avoid Pro Football Reference rate limiting
 Caches player stats in memory for 1 hour
+Also provides a persistent SQLite cache so parsed game logs survive restarts
 """
 
+import heapq
+import sqlite3
+import threading
 import time
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime
 from typing import Dict, List, Optional, Tuple
 
 class StatsCache:
-    """Cache for player statistics to reduce PFR requests"""
-    
-    def __init__(self, ttl_seconds: int = 3600):  # 1 hour default
-        self.cache: Dict[str, Tuple[List[float], float]] = {}  # key -> (stats, timestamp)
+    """
+    Cache for player statistics to reduce PFR requests
+
+    Bounded LRU: entries past max_size evict least-recently-used first.
+    Timestamps use the monotonic clock (vDSO-backed on Linux, immune to
+    wall-clock jumps), entries store their expiry directly so reads do a
+    single comparison, and a min-heap of expiries is drained at most once
+    per SWEEP_INTERVAL so unaccessed dead keys can't accumulate forever.
+    """
+
+    SWEEP_INTERVAL = 60.0  # Seconds between full expiry sweeps
+
+    def __init__(self, ttl_seconds: int = 3600, max_size: int = 1024):  # 1 hour default
+        self.cache: "OrderedDict[str, Tuple[List[float], float]]" = OrderedDict()
         self.ttl = ttl_seconds
-    
+        self.max_size = max_size
+        self._expiries = []       # (expires_at, key) min-heap, monotonic time
+        self._expired_count = 0   # Lifetime count of entries dropped by TTL
+        self._last_sweep = time.monotonic()
+        self._sweep_lock = threading.Lock()
+
     def _make_key(self, player: str, stat_type: str) -> str:
         """Create cache key from player name and stat type"""
         return f"{player.lower().strip()}:{stat_type.lower()}"
-    
+
+    def _sweep(self):
+        """Drop lapsed entries, at most once per SWEEP_INTERVAL"""
+        now = time.monotonic()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+
+        with self._sweep_lock:
+            if now - self._last_sweep < self.SWEEP_INTERVAL:
+                return  # Another thread swept while we waited
+            self._last_sweep = now
+
+            while self._expiries and self._expiries[0][0] <= now:
+                _, key = heapq.heappop(self._expiries)
+                entry = self.cache.get(key)
+                # Only drop if the stored entry has actually lapsed - the
+                # key may have been refreshed since this record was pushed
+                if entry and entry[1] <= now:
+                    del self.cache[key]
+                    self._expired_count += 1
+
     def get(self, player: str, stat_type: str) -> Optional[List[float]]:
         """
         Get cached stats for a player
         Returns None if not in cache or expired
         """
         key = self._make_key(player, stat_type)
-        
-        if key not in self.cache:
+        entry = self.cache.get(key)
+
+        if entry is None:
             return None
-        
-        stats, timestamp = self.cache[key]
-        
+
+        stats, expires_at = entry
+
         # Check if expired
-        if time.time() - timestamp > self.ttl:
+        if time.monotonic() >= expires_at:
             del self.cache[key]
+            self._expired_count += 1
             return None
-        
+
+        self.cache.move_to_end(key)  # Freshly used -> safest from eviction
         return stats
-    
+
     def set(self, player: str, stat_type: str, stats: List[float]):
         """Cache stats for a player"""
+        self._sweep()
+
         key = self._make_key(player, stat_type)
-        self.cache[key] = (stats, time.time())
-    
+        expires_at = time.monotonic() + self.ttl
+        self.cache[key] = (stats, expires_at)
+        self.cache.move_to_end(key)
+        heapq.heappush(self._expiries, (expires_at, key))
+
+        # LRU bound: oldest-used entries go first
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
     def clear(self):
         """Clear all cached data"""
         self.cache.clear()
-    
+        self._expiries.clear()
+        self._expired_count = 0
+        self._last_sweep = time.monotonic()
+
     def size(self) -> int:
         """Return number of cached entries"""
         return len(self.cache)
-    
+
     def get_stats(self) -> Dict:
-        """Get cache statistics"""
-        current_time = time.time()
-        expired = sum(1 for _, timestamp in self.cache.values() 
-                     if current_time - timestamp > self.ttl)
-        
+        """Get cache statistics (O(1) - no scan over entries)"""
+        self._sweep()
+
         return {
             'total_entries': len(self.cache),
-            'expired': expired,
-            'active': len(self.cache) - expired,
+            'expired': self._expired_count,
+            'active': len(self.cache),
             'ttl_seconds': self.ttl
         }
 
 
+class SQLiteStatsCache:
+    """
+    Persistent cache of parsed game logs keyed by (player, stat, season, week)
+    Rows scraped today are considered fresh, so repeat scans skip PFR entirely
+    """
+
+    def __init__(self, db_path: str = 'pfr_stats_cache.db'):
+        # One shared connection; the lock serializes access from the
+        # thread-pool batch fetch path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS game_logs (
+                player TEXT,
+                stat_type TEXT,
+                season INTEGER,
+                week INTEGER,
+                value REAL,
+                scraped_at INTEGER,
+                PRIMARY KEY (player, stat_type, season, week)
+            )
+        ''')
+        self._conn.commit()
+
+    @staticmethod
+    def _make_key(player: str) -> str:
+        return player.lower().strip()
+
+    def get(self, player: str, stat_type: str, season: int,
+            num_games: int) -> Optional[List[float]]:
+        """
+        Get cached game values (most recent first)
+        Returns None unless the rows were scraped today
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                '''SELECT week, value, scraped_at FROM game_logs
+                   WHERE player = ? AND stat_type = ? AND season = ?
+                   ORDER BY week DESC''',
+                (self._make_key(player), stat_type, season)
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        # Only trust rows scraped today - game logs grow week to week
+        newest = max(row[2] for row in rows)
+        if datetime.fromtimestamp(newest).date() != date.today():
+            return None
+
+        return [row[1] for row in rows[:num_games]]
+
+    def upsert_many(self, player: str, stat_type: str, season: int,
+                    values_by_week: List[Tuple[int, float]]):
+        """Store (week, value) rows for a player's stat"""
+        now = int(time.time())
+        key = self._make_key(player)
+
+        with self._lock:
+            self._conn.executemany(
+                '''INSERT OR REPLACE INTO game_logs
+                   (player, stat_type, season, week, value, scraped_at)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                [(key, stat_type, season, week, value, now)
+                 for week, value in values_by_week]
+            )
+            self._conn.commit()
+
+
+class SQLiteHTTPCache:
+    """
+    Persistent cache of fetched bodies keyed by URL, each row with its own TTL
+
+    Player-ID lookups stay valid for years while in-season gamelog pages
+    change weekly, so callers choose a TTL per resource. Bodies are stored
+    zlib-compressed, which shrinks PFR HTML roughly 5x on disk.
+    """
+
+    def __init__(self, db_path: str = 'pfr_http_cache.db'):
+        # One shared connection; the lock serializes access from the
+        # thread-pool batch fetch path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                body BLOB,
+                fetched_at REAL,
+                ttl REAL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        ''')
+        # Databases created before validators were stored lack the columns
+        for column in ('etag', 'last_modified'):
+            try:
+                self._conn.execute(
+                    f'ALTER TABLE http_cache ADD COLUMN {column} TEXT')
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the cached body, or None if absent or past its TTL"""
+        entry = self.get_entry(url)
+        if entry is None or not entry[1]:
+            return None
+        return entry[0]
+
+    def get_entry(self, url: str) -> Optional[Tuple[str, bool, Optional[str], Optional[str]]]:
+        """
+        Cached row as (body, is_fresh, etag, last_modified), or None
+
+        Stale rows come back with is_fresh False so callers holding the
+        validators can revalidate with a conditional request instead of
+        refetching the whole body.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                '''SELECT body, fetched_at, ttl, etag, last_modified
+                   FROM http_cache WHERE url = ?''',
+                (url,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        body, fetched_at, ttl, etag, last_modified = row
+        is_fresh = time.time() - fetched_at < ttl
+        return zlib.decompress(body).decode('utf-8'), is_fresh, etag, last_modified
+
+    def set(self, url: str, body: str, ttl: float,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a body under the URL with its freshness window and validators"""
+        with self._lock:
+            self._conn.execute(
+                '''INSERT OR REPLACE INTO http_cache
+                   (url, body, fetched_at, ttl, etag, last_modified)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                (url, zlib.compress(body.encode('utf-8')), time.time(), ttl,
+                 etag, last_modified)
+            )
+            self._conn.commit()
+
+    def touch(self, url: str, ttl: float):
+        """Restamp a row as fresh (the server confirmed it is unchanged)"""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE http_cache SET fetched_at = ?, ttl = ? WHERE url = ?',
+                (time.time(), ttl, url)
+            )
+            self._conn.commit()
+
+
 # Global cache instance
 _stats_cache = StatsCache(ttl_seconds=3600)
 
@@ -5,82 +5,168 @@ Used to adjust player projections based on game conditions
 """
 
 import requests
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Optional
 import time
 
+# National Weather Service API is free and keyless; it asks callers to
+# identify themselves in the User-Agent
+_NWS_HEADERS = {'User-Agent': 'bet-analyzer (weather lookups)'}
+
+# NFL Stadiums - Dome vs Outdoor (built once at import, shared by all
+# scraper instances; the adjustment path runs per scored prop)
+STADIUMS = {
+    # Domes (retractable roofs closed in bad weather)
+    'Arizona Cardinals': {'type': 'dome', 'city': 'Glendale', 'state': 'AZ', 'lat': 33.5276, 'lon': -112.2626},
+    'Atlanta Falcons': {'type': 'dome', 'city': 'Atlanta', 'state': 'GA', 'lat': 33.7554, 'lon': -84.4008},
+    'Dallas Cowboys': {'type': 'dome', 'city': 'Arlington', 'state': 'TX', 'lat': 32.7473, 'lon': -97.0945},
+    'Detroit Lions': {'type': 'dome', 'city': 'Detroit', 'state': 'MI', 'lat': 42.3400, 'lon': -83.0456},
+    'Houston Texans': {'type': 'dome', 'city': 'Houston', 'state': 'TX', 'lat': 29.6847, 'lon': -95.4107},
+    'Indianapolis Colts': {'type': 'dome', 'city': 'Indianapolis', 'state': 'IN', 'lat': 39.7601, 'lon': -86.1639},
+    'Las Vegas Raiders': {'type': 'dome', 'city': 'Las Vegas', 'state': 'NV', 'lat': 36.0909, 'lon': -115.1833},
+    'Los Angeles Chargers': {'type': 'dome', 'city': 'Inglewood', 'state': 'CA', 'lat': 33.9535, 'lon': -118.3392},
+    'Los Angeles Rams': {'type': 'dome', 'city': 'Inglewood', 'state': 'CA', 'lat': 33.9535, 'lon': -118.3392},
+    'Minnesota Vikings': {'type': 'dome', 'city': 'Minneapolis', 'state': 'MN', 'lat': 44.9735, 'lon': -93.2575},
+    'New Orleans Saints': {'type': 'dome', 'city': 'New Orleans', 'state': 'LA', 'lat': 29.9511, 'lon': -90.0812},
+
+    # Outdoor stadiums
+    'Baltimore Ravens': {'type': 'outdoor', 'city': 'Baltimore', 'state': 'MD', 'lat': 39.2780, 'lon': -76.6227},
+    'Buffalo Bills': {'type': 'outdoor', 'city': 'Orchard Park', 'state': 'NY', 'lat': 42.7738, 'lon': -78.7870},
+    'Carolina Panthers': {'type': 'outdoor', 'city': 'Charlotte', 'state': 'NC', 'lat': 35.2258, 'lon': -80.8528},
+    'Chicago Bears': {'type': 'outdoor', 'city': 'Chicago', 'state': 'IL', 'lat': 41.8623, 'lon': -87.6167},
+    'Cincinnati Bengals': {'type': 'outdoor', 'city': 'Cincinnati', 'state': 'OH', 'lat': 39.0955, 'lon': -84.5161},
+    'Cleveland Browns': {'type': 'outdoor', 'city': 'Cleveland', 'state': 'OH', 'lat': 41.5061, 'lon': -81.6995},
+    'Denver Broncos': {'type': 'outdoor', 'city': 'Denver', 'state': 'CO', 'lat': 39.7439, 'lon': -105.0201},
+    'Green Bay Packers': {'type': 'outdoor', 'city': 'Green Bay', 'state': 'WI', 'lat': 44.5013, 'lon': -88.0622},
+    'Jacksonville Jaguars': {'type': 'outdoor', 'city': 'Jacksonville', 'state': 'FL', 'lat': 30.3239, 'lon': -81.6373},
+    'Kansas City Chiefs': {'type': 'outdoor', 'city': 'Kansas City', 'state': 'MO', 'lat': 39.0489, 'lon': -94.4839},
+    'Miami Dolphins': {'type': 'outdoor', 'city': 'Miami Gardens', 'state': 'FL', 'lat': 25.9580, 'lon': -80.2389},
+    'New England Patriots': {'type': 'outdoor', 'city': 'Foxborough', 'state': 'MA', 'lat': 42.0909, 'lon': -71.2643},
+    'New York Giants': {'type': 'outdoor', 'city': 'East Rutherford', 'state': 'NJ', 'lat': 40.8128, 'lon': -74.0742},
+    'New York Jets': {'type': 'outdoor', 'city': 'East Rutherford', 'state': 'NJ', 'lat': 40.8128, 'lon': -74.0742},
+    'Philadelphia Eagles': {'type': 'outdoor', 'city': 'Philadelphia', 'state': 'PA', 'lat': 39.9008, 'lon': -75.1675},
+    'Pittsburgh Steelers': {'type': 'outdoor', 'city': 'Pittsburgh', 'state': 'PA', 'lat': 40.4468, 'lon': -80.0158},
+    'San Francisco 49ers': {'type': 'outdoor', 'city': 'Santa Clara', 'state': 'CA', 'lat': 37.4030, 'lon': -121.9700},
+    'Seattle Seahawks': {'type': 'outdoor', 'city': 'Seattle', 'state': 'WA', 'lat': 47.5952, 'lon': -122.3316},
+    'Tampa Bay Buccaneers': {'type': 'outdoor', 'city': 'Tampa', 'state': 'FL', 'lat': 27.9759, 'lon': -82.5033},
+    'Tennessee Titans': {'type': 'outdoor', 'city': 'Nashville', 'state': 'TN', 'lat': 36.1665, 'lon': -86.7713},
+    'Washington Commanders': {'type': 'outdoor', 'city': 'Landover', 'state': 'MD', 'lat': 38.9076, 'lon': -76.8645},
+}
+
+_DOME_TEAMS = frozenset(team for team, venue in STADIUMS.items()
+                        if venue['type'] == 'dome')
+
+# Stat groups the weather adjustments branch on
+_PASS_RECV_YDS = frozenset({'pass_yds', 'passing_yards', 'reception_yds', 'receiving_yards'})
+_RUSH_YDS = frozenset({'rush_yds', 'rushing_yards'})
+
+
+@lru_cache(maxsize=64)
+def _forecast_url(lat: float, lon: float) -> str:
+    """Resolve a venue's NWS hourly-forecast endpoint (stable per location)"""
+    response = requests.get(f'https://api.weather.gov/points/{lat},{lon}',
+                            headers=_NWS_HEADERS, timeout=10)
+    response.raise_for_status()
+    return response.json()['properties']['forecastHourly']
+
+
+@lru_cache(maxsize=128)
+def _fetch_forecast(lat: float, lon: float, utc_hour: str) -> Optional[Dict]:
+    """
+    NWS hourly forecast period for one venue-hour
+
+    Memoized by (lat, lon, utc_hour): every prop in a game shares the
+    same venue and kickoff hour, so a full Sunday slate costs one API
+    call per game rather than one per prop.
+    """
+    response = requests.get(_forecast_url(lat, lon),
+                            headers=_NWS_HEADERS, timeout=10)
+    response.raise_for_status()
+    periods = response.json()['properties']['periods']
+
+    for period in periods:
+        start = datetime.fromisoformat(period['startTime']).astimezone(timezone.utc)
+        if start.strftime('%Y-%m-%dT%H') == utc_hour:
+            return period
+
+    # Requested hour beyond the forecast window - use the nearest period
+    return periods[0] if periods else None
+
+
+@lru_cache(maxsize=256)
+def _outdoor_adjustment(stat_type: str, wind_speed: float, precipitation: bool):
+    """
+    Outdoor multiplier for one (stat, wind, precip) combination
+
+    Cached: a slate only has a handful of distinct weather combinations,
+    repeated for every prop in each game
+    """
+    adjustment = 1.0
+    factors = []
+
+    # High wind impact
+    if wind_speed and wind_speed >= 15:
+        if stat_type in _PASS_RECV_YDS:
+            adjustment *= 0.85  # -15% for passing in wind
+            factors.append(f'High Wind {wind_speed}mph (-15%)')
+        elif stat_type in _RUSH_YDS:
+            adjustment *= 1.10  # +10% for rushing in wind
+            factors.append(f'High Wind {wind_speed}mph (+10% rush)')
+
+    # Moderate wind
+    elif wind_speed and 10 <= wind_speed < 15:
+        if stat_type in _PASS_RECV_YDS:
+            adjustment *= 0.93  # -7% for moderate wind
+            factors.append(f'Wind {wind_speed}mph (-7%)')
+
+    # Precipitation (rain/snow) affects all stats negatively
+    if precipitation:
+        adjustment *= 0.90  # -10% for rain/snow
+        factors.append('Rain/Snow (-10%)')
+
+    condition_str = 'outdoor'
+    if factors:
+        condition_str = 'outdoor_' + '_'.join(factors)
+
+    return adjustment, tuple(factors), condition_str
+
 
 class WeatherVenueScraper:
     """Scrape weather and venue information for NFL games"""
-    
+
     def __init__(self):
         self.cache = {}
         self.cache_timestamp = {}
-        
-        # NFL Stadiums - Dome vs Outdoor
-        self.stadiums = {
-            # Domes (retractable roofs closed in bad weather)
-            'Arizona Cardinals': {'type': 'dome', 'city': 'Glendale', 'state': 'AZ'},
-            'Atlanta Falcons': {'type': 'dome', 'city': 'Atlanta', 'state': 'GA'},
-            'Dallas Cowboys': {'type': 'dome', 'city': 'Arlington', 'state': 'TX'},
-            'Detroit Lions': {'type': 'dome', 'city': 'Detroit', 'state': 'MI'},
-            'Houston Texans': {'type': 'dome', 'city': 'Houston', 'state': 'TX'},
-            'Indianapolis Colts': {'type': 'dome', 'city': 'Indianapolis', 'state': 'IN'},
-            'Las Vegas Raiders': {'type': 'dome', 'city': 'Las Vegas', 'state': 'NV'},
-            'Los Angeles Chargers': {'type': 'dome', 'city': 'Inglewood', 'state': 'CA'},
-            'Los Angeles Rams': {'type': 'dome', 'city': 'Inglewood', 'state': 'CA'},
-            'Minnesota Vikings': {'type': 'dome', 'city': 'Minneapolis', 'state': 'MN'},
-            'New Orleans Saints': {'type': 'dome', 'city': 'New Orleans', 'state': 'LA'},
-            
-            # Outdoor stadiums
-            'Baltimore Ravens': {'type': 'outdoor', 'city': 'Baltimore', 'state': 'MD'},
-            'Buffalo Bills': {'type': 'outdoor', 'city': 'Orchard Park', 'state': 'NY'},
-            'Carolina Panthers': {'type': 'outdoor', 'city': 'Charlotte', 'state': 'NC'},
-            'Chicago Bears': {'type': 'outdoor', 'city': 'Chicago', 'state': 'IL'},
-            'Cincinnati Bengals': {'type': 'outdoor', 'city': 'Cincinnati', 'state': 'OH'},
-            'Cleveland Browns': {'type': 'outdoor', 'city': 'Cleveland', 'state': 'OH'},
-            'Denver Broncos': {'type': 'outdoor', 'city': 'Denver', 'state': 'CO'},
-            'Green Bay Packers': {'type': 'outdoor', 'city': 'Green Bay', 'state': 'WI'},
-            'Jacksonville Jaguars': {'type': 'outdoor', 'city': 'Jacksonville', 'state': 'FL'},
-            'Kansas City Chiefs': {'type': 'outdoor', 'city': 'Kansas City', 'state': 'MO'},
-            'Miami Dolphins': {'type': 'outdoor', 'city': 'Miami Gardens', 'state': 'FL'},
-            'New England Patriots': {'type': 'outdoor', 'city': 'Foxborough', 'state': 'MA'},
-            'New York Giants': {'type': 'outdoor', 'city': 'East Rutherford', 'state': 'NJ'},
-            'New York Jets': {'type': 'outdoor', 'city': 'East Rutherford', 'state': 'NJ'},
-            'Philadelphia Eagles': {'type': 'outdoor', 'city': 'Philadelphia', 'state': 'PA'},
-            'Pittsburgh Steelers': {'type': 'outdoor', 'city': 'Pittsburgh', 'state': 'PA'},
-            'San Francisco 49ers': {'type': 'outdoor', 'city': 'Santa Clara', 'state': 'CA'},
-            'Seattle Seahawks': {'type': 'outdoor', 'city': 'Seattle', 'state': 'WA'},
-            'Tampa Bay Buccaneers': {'type': 'outdoor', 'city': 'Tampa', 'state': 'FL'},
-            'Tennessee Titans': {'type': 'outdoor', 'city': 'Nashville', 'state': 'TN'},
-            'Washington Commanders': {'type': 'outdoor', 'city': 'Landover', 'state': 'MD'},
-        }
-    
+        self.stadiums = STADIUMS
+
     def get_venue_type(self, home_team: str) -> str:
         """
         Get whether game is in dome or outdoor
-        
+
         Args:
             home_team: Home team name
-        
+
         Returns:
             'dome' or 'outdoor'
         """
-        venue = self.stadiums.get(home_team, {})
-        return venue.get('type', 'outdoor')
+        return 'dome' if home_team in _DOME_TEAMS else 'outdoor'
     
-    def get_weather_conditions(self, home_team: str) -> Dict:
+    def get_weather_conditions(self, home_team: str,
+                               game_time: Optional[datetime] = None) -> Dict:
         """
         Get weather conditions for a game
-        Uses free weather API (weather.gov or similar)
-        
+        Uses the free National Weather Service hourly forecast
+
         Args:
             home_team: Home team name
-        
+            game_time: Kickoff time (defaults to now)
+
         Returns:
             Dict with weather info: {temp, wind_speed, conditions, precipitation}
         """
         venue_type = self.get_venue_type(home_team)
-        
+
         # If dome, weather doesn't matter
         if venue_type == 'dome':
             return {
@@ -91,11 +177,40 @@ class WeatherVenueScraper:
                 'precipitation': False,
                 'impact': 'none'
             }
-        
-        # For outdoor games, try to get real weather
-        # For now, return outdoor with unknown conditions
-        # (We can add weather API integration if needed)
-        
+
+        # Outdoor: one forecast lookup per venue-hour, shared by every
+        # prop in the game via the lru_cache on _fetch_forecast
+        venue = self.stadiums.get(home_team)
+        if venue and 'lat' in venue:
+            when = game_time or datetime.now(timezone.utc)
+            utc_hour = when.astimezone(timezone.utc).strftime('%Y-%m-%dT%H')
+
+            try:
+                period = _fetch_forecast(venue['lat'], venue['lon'], utc_hour)
+            except Exception as e:
+                print(f"  ⚠️  Weather lookup failed for {home_team}: {str(e)[:80]}")
+                period = None
+
+            if period:
+                # windSpeed reads like '12 mph'; precipitation probability
+                # may be missing for far-out hours
+                try:
+                    wind_speed = int(str(period.get('windSpeed', '')).split()[0])
+                except (ValueError, IndexError):
+                    wind_speed = None
+
+                precip_prob = (period.get('probabilityOfPrecipitation') or {}).get('value')
+
+                return {
+                    'venue_type': 'outdoor',
+                    'temp': period.get('temperature'),
+                    'wind_speed': wind_speed,
+                    'conditions': period.get('shortForecast', 'Outdoor'),
+                    'precipitation': precip_prob is not None and precip_prob >= 50,
+                    'impact': 'known'
+                }
+
+        # Forecast unavailable - fall back to neutral outdoor conditions
         return {
             'venue_type': 'outdoor',
             'temp': None,
@@ -105,62 +220,36 @@ class WeatherVenueScraper:
             'impact': 'unknown'
         }
     
-    def get_condition_adjustment(self, home_team: str, stat_type: str) -> float:
+    def get_condition_adjustment(self, home_team: str, stat_type: str):
         """
         Get adjustment multiplier based on weather/venue conditions
-        
+
         Args:
             home_team: Home team name
             stat_type: Type of stat (pass_yds, rush_yds, etc.)
-        
+
         Returns:
-            Adjustment multiplier (e.g., 0.85 for -15%, 1.05 for +5%)
+            Tuple of (multiplier, factor strings, condition string) -
+            e.g. (0.85, ['High Wind 18mph (-15%)'], 'outdoor_...')
         """
+        # Dome games need no weather lookup at all (~a third of the league)
+        if home_team in _DOME_TEAMS:
+            if stat_type in _PASS_RECV_YDS:
+                return 1.05, ['Dome (+5%)'], 'dome'  # +5% for passing in dome
+            return 1.0, [], 'dome'
+
         conditions = self.get_weather_conditions(home_team)
-        venue_type = conditions['venue_type']
         wind_speed = conditions.get('wind_speed', 0) or 0
-        precipitation = conditions.get('precipitation', False)
-        
-        adjustment = 1.0
-        factors = []
-        
-        # Dome benefit
-        if venue_type == 'dome':
-            if stat_type in ['pass_yds', 'passing_yards', 'reception_yds', 'receiving_yards']:
-                adjustment *= 1.05  # +5% for passing in dome
-                factors.append('Dome (+5%)')
-            return adjustment, factors, 'dome'
-        
-        # Outdoor conditions
-        # High wind impact
-        if wind_speed and wind_speed >= 15:
-            if stat_type in ['pass_yds', 'passing_yards', 'reception_yds', 'receiving_yards']:
-                adjustment *= 0.85  # -15% for passing in wind
-                factors.append(f'High Wind {wind_speed}mph (-15%)')
-            elif stat_type in ['rush_yds', 'rushing_yards']:
-                adjustment *= 1.10  # +10% for rushing in wind
-                factors.append(f'High Wind {wind_speed}mph (+10% rush)')
-        
-        # Moderate wind
-        elif wind_speed and 10 <= wind_speed < 15:
-            if stat_type in ['pass_yds', 'passing_yards', 'reception_yds', 'receiving_yards']:
-                adjustment *= 0.93  # -7% for moderate wind
-                factors.append(f'Wind {wind_speed}mph (-7%)')
-        
-        # Precipitation (rain/snow)
-        if precipitation:
-            # Affects all stats negatively
-            adjustment *= 0.90  # -10% for rain/snow
-            factors.append('Rain/Snow (-10%)')
-        
-        condition_str = 'outdoor'
-        if factors:
-            condition_str = 'outdoor_' + '_'.join(factors)
-        
-        print(f"  🌦️  {home_team} venue: {venue_type}")
+        precipitation = bool(conditions.get('precipitation', False))
+
+        adjustment, factors, condition_str = _outdoor_adjustment(
+            stat_type, wind_speed, precipitation)
+        factors = list(factors)
+
+        print(f"  🌦️  {home_team} venue: outdoor")
         if factors:
             print(f"      Adjustments: {', '.join(factors)} → {adjustment}x")
-        
+
         return adjustment, factors, condition_str
     
     def get_game_condition_summary(self, home_team: str) -> str: